@@ -0,0 +1,48 @@
+import json
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+from typing import Protocol
+
+# Model loads can take minutes on CPU before the first token arrives
+READ_TIMEOUT = 600
+RETRIES = 3
+
+
+@dataclass
+class GenerationStats:
+    prompt_chars: int = 0
+    time_to_first_token: float | None = None
+    total_seconds: float = 0
+    load_seconds: float | None = None
+    eval_count: int = 0
+    tokens_per_second: float | None = None
+
+
+class LLMError(Exception):
+    pass
+
+
+class LLMBackend(Protocol):
+    """A local inference server that can stream completions"""
+
+    def generate(
+        self,
+        model: str,
+        prompt: str | Iterable[str],
+        on_token: Callable[[str], None] | None = None,
+        options: dict | None = None,
+    ) -> tuple[str, GenerationStats]: ...
+
+    def preload(self, model: str, options: dict | None = None) -> None: ...
+
+    def get_context_length(self, model: str) -> int | None: ...
+
+
+def iter_json_string(
+    prompt: str | Iterable[str],
+    stats: GenerationStats,
+) -> Iterator[bytes]:
+    """JSON-escape the prompt chunk by chunk, without its surrounding quotes"""
+    for chunk in [prompt] if isinstance(prompt, str) else prompt:
+        stats.prompt_chars += len(chunk)
+        yield json.dumps(chunk)[1:-1].encode()
@@ -0,0 +1,211 @@
+import logging
+import os
+import platform
+from dataclasses import dataclass
+from itertools import cycle, islice
+from pathlib import Path
+
+from standupbrain.commits import Commit, FileDiff, RepoCommits
+from standupbrain.llm import create_standup_summary_llm_prompt
+from standupbrain.ollama import OllamaClient
+from standupbrain.shared import DEFAULT_OLLAMA_NUM_CTX
+
+log = logging.getLogger(__name__)
+
+# (repo, subject, body, path, changed code) for realistic, repeatable prompts
+SAMPLE_COMMITS = (
+    (
+        'acme/billing',
+        'Retry failed invoice webhooks with backoff',
+        'Stripe occasionally times out, so queue a retry instead of dropping it.',
+        'billing/webhooks.py',
+        (
+            'def handle_invoice_failed(event):\n'
+            '    attempt = event.metadata.get("attempt", 0)\n'
+            '    if attempt < MAX_ATTEMPTS:\n'
+            '        schedule_retry(event, delay=2 ** attempt)\n'
+        ),
+    ),
+    (
+        'acme/billing',
+        'Fix rounding of prorated refunds',
+        '',
+        'billing/refunds.py',
+        (
+            'def prorate(amount, days_used, days_total):\n'
+            '    share = Decimal(days_total - days_used) / Decimal(days_total)\n'
+            '    return (amount * share).quantize(CENT, rounding=ROUND_HALF_UP)\n'
+        ),
+    ),
+    (
+        'acme/web',
+        'Add empty state to the invoices table',
+        'Shows a call to action instead of a blank table for new accounts.',
+        'src/components/InvoicesTable.tsx',
+        (
+            'if (invoices.length === 0) {\n'
+            '  return <EmptyState title="No invoices yet" action={<NewInvoice />} />;\n'
+            '}\n'
+        ),
+    ),
+    (
+        'acme/web',
+        'Debounce customer search input',
+        '',
+        'src/hooks/useCustomerSearch.ts',
+        (
+            'const debounced = useDebounce(query, 250);\n'
+            'const { data } = useQuery(["customers", debounced], () =>\n'
+            '  searchCustomers(debounced),\n'
+            ');\n'
+        ),
+    ),
+    (
+        'acme/infra',
+        'Raise worker memory limit for PDF rendering',
+        'Large statements were getting OOM killed at 512Mi.',
+        'k8s/workers/deployment.yaml',
+        'resources:\n  limits:\n    memory: 1Gi\n  requests:\n    memory: 768Mi\n',
+    ),
+    (
+        'acme/infra',
+        'Alert on webhook retry queue depth',
+        '',
+        'monitoring/alerts/billing.yaml',
+        (
+            '- alert: WebhookRetryBacklog\n'
+            '  expr: billing_webhook_retry_queue_depth > 500\n'
+            '  for: 10m\n'
+        ),
+    ),
+)
+
+SAMPLE_ISSUES = (
+    ('BILL-412', 'Invoice webhooks silently dropped', 'In Review'),
+    ('BILL-398', 'Refund amounts off by a cent', 'Done'),
+    ('WEB-1203', 'New accounts see a blank invoices page', 'In Progress'),
+    ('OPS-77', 'Statement rendering workers OOM', 'Done'),
+)
+
+# Prompt size -> (commits, Jira issues, times each diff is repeated)
+BENCH_SIZES = {
+    'small': (2, 1, 1),
+    'medium': (8, 3, 3),
+    'large': (24, 4, 6),
+}
+
+
+@dataclass
+class BenchResult:
+    model: str
+    size: str
+    prompt_chars: int
+    load_seconds: float | None
+    time_to_first_token: float | None
+    tokens_per_second: float | None
+    total_seconds: float
+    peak_rss_bytes: int | None
+
+
+def make_bench_prompt(size: str) -> str:
+    """A standup prompt built from the bundled sample activity"""
+    commit_count, issue_count, repeat = BENCH_SIZES[size]
+    by_repo: dict[str, RepoCommits] = {}
+    samples = islice(cycle(SAMPLE_COMMITS), commit_count)
+    for idx, (repo, subject, body, path, code) in enumerate(samples):
+        hunk = '\n'.join(f'+{line}' for line in (code * repeat).splitlines())
+        lines = hunk.count('\n') + 1
+        hunks = f'@@ -0,0 +1,{lines} @@\n{hunk}'
+        file = FileDiff(path=path, additions=lines, hunks=hunks)
+        commit = Commit(f'{idx:040x}', subject, body=body, files=[file])
+        by_repo.setdefault(repo, RepoCommits(repo)).commits.append(commit)
+
+    jira_summary = '\n\n'.join(
+        f'[{key}] {summary}\nStatus: {status}\nComments:\n  - Fix is up for review'
+        for key, summary, status in SAMPLE_ISSUES[:issue_count]
+    )
+    return create_standup_summary_llm_prompt(jira_summary, list(by_repo.values()))
+
+
+def run_bench(
+    client: OllamaClient,
+    models: list[str],
+    sizes: list[str],
+) -> list[BenchResult]:
+    """Time each prompt size against each model, starting every model cold"""
+    results = []
+    prompts = {size: make_bench_prompt(size) for size in sizes}
+    options = {'num_ctx': DEFAULT_OLLAMA_NUM_CTX}
+    for model in models:
+        log.info('Benchmarking %s...', model)
+        client.unload(model)
+        for size, prompt in prompts.items():
+            _, stats = client.generate(model, prompt, options=options)
+            results.append(
+                BenchResult(
+                    model=model,
+                    size=size,
+                    prompt_chars=stats.prompt_chars,
+                    load_seconds=stats.load_seconds,
+                    time_to_first_token=stats.time_to_first_token,
+                    tokens_per_second=stats.tokens_per_second,
+                    total_seconds=stats.total_seconds,
+                    peak_rss_bytes=get_ollama_peak_rss(),
+                ),
+            )
+        client.unload(model)
+    return results
+
+
+def get_ollama_peak_rss(proc: Path = Path('/proc')) -> int | None:
+    """Peak resident memory (VmHWM) of the largest running Ollama process, if any
+
+    The model runs in its own `ollama` subprocess, which is replaced when another
+    model loads, so this is the peak of the model currently loaded.
+    """
+    peak = None
+    for status_path in proc.glob('[0-9]*/status'):
+        try:
+            status = status_path.read_text()
+        except OSError:
+            continue
+        fields = dict(line.split(':', 1) for line in status.splitlines() if ':' in line)
+        if not fields.get('Name', '').strip().startswith('ollama'):
+            continue
+        if 'VmHWM' in fields:
+            kb = int(fields['VmHWM'].split()[0])
+            peak = max(peak or 0, kb * 1024)
+    return peak
+
+
+def format_bench_table(results: list[BenchResult]) -> str:
+    def number(value: float | None, fmt: str) -> str:
+        return '-' if value is None else format(value, fmt)
+
+    rows = [('model', 'size', 'load s', 'ttft s', 'tok/s', 'total s', 'peak rss')]
+    for result in results:
+        peak_mb = result.peak_rss_bytes and result.peak_rss_bytes / 1024**2
+        rows.append(
+            (
+                result.model,
+                result.size,
+                number(result.load_seconds, '.2f'),
+                number(result.time_to_first_token, '.2f'),
+                number(result.tokens_per_second, '.1f'),
+                number(result.total_seconds, '.2f'),
+                '-' if peak_mb is None else f'{peak_mb:.0f} MB',
+            ),
+        )
+    widths = [max(len(row[idx]) for row in rows) for idx in range(len(rows[0]))]
+    return '\n'.join(
+        '  '.join(cell.ljust(width) for cell, width in zip(row, widths, strict=True))
+        for row in rows
+    )
+
+
+def get_machine_info() -> dict:
+    return {
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+    }
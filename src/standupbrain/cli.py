@@ -1,24 +1,41 @@
+import json
 import logging
 import sys
+from collections.abc import Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import asdict
 from datetime import datetime
 
 import click
+import requests
 
-from standupbrain.git import get_git_commits
+from standupbrain.backends import LLMError
+from standupbrain.bench import (
+    BENCH_SIZES,
+    format_bench_table,
+    get_machine_info,
+    run_bench,
+)
+from standupbrain.commits import RepoCommits, split_commits_by_day
+from standupbrain.git import get_git_commits, get_team_git_commits
 from standupbrain.git_init import (
     ensure_gh_authenticated,
     get_local_git_email,
-    get_remote_gh_username,
     init_git,
+    require_remote_gh_username,
 )
-from standupbrain.jira import make_jira_activity_summary
+from standupbrain.jira import make_jira_activity_summaries
 from standupbrain.jira_init import init_jira
-from standupbrain.llm import (
-    create_standup_summary_llm_prompt,
-    prompt_local_llm,
-)
+from standupbrain.llm import iter_standup_summary_llm_prompt, warm_up_local_llm
 from standupbrain.llm_init import init_llm
-from standupbrain.shared import get_previous_workday
+from standupbrain.ollama import get_ollama_client
+from standupbrain.shared import get_days_between, get_previous_workday
+from standupbrain.summarize import (
+    estimate_tokens,
+    summarize_activity,
+    summarize_period,
+)
 
 logging.basicConfig(level=logging.INFO, format='%(message)s')
 logging.getLogger('requests').setLevel(logging.INFO)
@@ -63,6 +80,28 @@ def init() -> None:
     '-u',
     help='GitHub account username for searching remotes in GitHub',
 )
+@click.option(
+    '--jobs',
+    '-j',
+    type=click.IntRange(min=1),
+    help='Max concurrent git processes when scanning local repos (default: CPU based)',
+)
+@click.option(
+    '--no-cache',
+    is_flag=True,
+    default=False,
+    help='Always prompt the LLM, ignoring summaries cached by earlier runs',
+)
+@click.option(
+    '--since',
+    type=click.DateTime(formats=['%Y-%m-%d']),
+    help='Start of a date range to recap, summarized per day and combined',
+)
+@click.option(
+    '--until',
+    type=click.DateTime(formats=['%Y-%m-%d']),
+    help='End of the --since date range (YYYY-MM-DD, default: today)',
+)
 @click.option(
     '--verbose',
     '-v',
@@ -71,45 +110,382 @@ def init() -> None:
     help='High verbosity for debugging',
 )
 def recall(
+    *,
     author_email: str | None,
     date: datetime | None,
     dry_run: bool,
     github_username: str,
+    jobs: int | None,
+    no_cache: bool,
+    since: datetime | None,
+    until: datetime | None,
     verbose: bool,
 ) -> None:
     """Generate a summary of what you did yesterday via GitHub/Jira -> LLM"""
     if verbose or dry_run:
         logging.getLogger().setLevel(logging.DEBUG)
 
-    if not date:
-        log.debug('No date provided, using previous workday')
-        date = get_previous_workday()
-        log.debug('Using date: %s', date)
+    date, until = resolve_recall_dates(date, since, until)
+    if not dry_run:
+        # Overlap the model's cold load with gathering activity
+        warm_up_local_llm()
 
     if not ensure_gh_authenticated():
         click.echo('gh CLI must be authorized, please try again.')
         sys.exit(1)
 
     if not github_username:
-        github_username = get_remote_gh_username()
+        github_username = require_remote_gh_username()
         click.echo(f'No GitHub username, using local GitHub username {github_username}')
 
     if not author_email:
         author_email = get_local_git_email()
         click.echo(f'No Git author email, using local Git author email {author_email}')
 
-    commits = get_git_commits(date, github_username, author_email)
+    commits, jira_summaries = gather_activity(
+        date,
+        github_username,
+        author_email,
+        max_workers=jobs,
+        until=until,
+    )
+    if until:
+        with exit_on_llm_error():
+            recall_range(
+                date,
+                until,
+                commits,
+                jira_summaries,
+                dry_run,
+                use_cache=not no_cache,
+            )
+        return
 
-    jira_summary = make_jira_activity_summary(date)
+    jira_summary = jira_summaries.get(date.strftime('%Y-%m-%d'), '')
     if not commits and not jira_summary:
         click.echo(f'No commits or Jira found for {date}')
         return
 
-    prompt = create_standup_summary_llm_prompt(jira_summary, commits)
     if dry_run:
-        log.debug('Prompt size in chars: %s', len(prompt))
+        log_prompt_size(jira_summary, commits)
         click.echo('Exiting early, not prompting LLM')
         return
 
-    summary = prompt_local_llm(prompt)
-    click.echo(summary)
+    with exit_on_llm_error():
+        summarize_activity(
+            jira_summary,
+            commits,
+            on_token=echo_token,
+            use_cache=not no_cache,
+        )
+    click.echo()
+
+
+@main.command('recall-team')
+@click.option(
+    '--member',
+    '-m',
+    'members',
+    multiple=True,
+    required=True,
+    metavar='EMAIL=USERNAME',
+    callback=lambda _ctx, _param, value: parse_team_members(value),
+    help='Teammate as Git author email and GitHub username, may be repeated',
+)
+@click.option(
+    '--date',
+    '-d',
+    type=click.DateTime(formats=['%Y-%m-%d']),
+    help='Specific date to generate updates for (YYYY-MM-DD)',
+)
+@click.option(
+    '--dry-run',
+    '--dry_run',
+    is_flag=True,
+    default=False,
+    help='Do not actually prompt the LLM, just query the APIs and log prompt sizes',
+)
+@click.option(
+    '--jobs',
+    '-j',
+    type=click.IntRange(min=1),
+    help='Max concurrent git processes when scanning local repos (default: CPU based)',
+)
+@click.option(
+    '--no-cache',
+    is_flag=True,
+    default=False,
+    help='Always prompt the LLM, ignoring summaries cached by earlier runs',
+)
+@click.option(
+    '--parallel',
+    '-p',
+    type=click.IntRange(1, 4),
+    default=2,
+    show_default=True,
+    help='Max summaries the model generates at once',
+)
+@click.option(
+    '--verbose',
+    '-v',
+    is_flag=True,
+    default=False,
+    help='High verbosity for debugging',
+)
+def recall_team(
+    *,
+    members: list[tuple[str, str]],
+    date: datetime | None,
+    dry_run: bool,
+    jobs: int | None,
+    no_cache: bool,
+    parallel: int,
+    verbose: bool,
+) -> None:
+    """Generate standups for several teammates, scanning each repo only once
+
+    Jira activity is only available for your own account, so summaries are
+    based on commits alone.
+    """
+    if verbose or dry_run:
+        logging.getLogger().setLevel(logging.DEBUG)
+    if not dry_run:
+        warm_up_local_llm()
+
+    if not ensure_gh_authenticated():
+        click.echo('gh CLI must be authorized, please try again.')
+        sys.exit(1)
+
+    date = date or get_previous_workday()
+    commits_by_author = get_team_git_commits(date, members, max_workers=jobs)
+    if dry_run:
+        for email, commits in commits_by_author.items():
+            log_prompt_size('', commits, label=email)
+        click.echo('Exiting early, not prompting LLM')
+        return
+
+    with ThreadPoolExecutor(max_workers=parallel) as executor:
+        futures = {
+            email: executor.submit(
+                summarize_activity,
+                '',
+                commits,
+                use_cache=not no_cache,
+            )
+            for email, commits in commits_by_author.items()
+            if commits
+        }
+        for email, username in members:
+            click.echo(f'\n{username} ({email}):')
+            if email in futures:
+                click.echo(get_member_summary(futures[email], username))
+            else:
+                click.echo(f'No commits found for {date:%Y-%m-%d}')
+
+
+def parse_team_members(values: tuple[str, ...]) -> list[tuple[str, str]]:
+    members = []
+    for value in values:
+        email, _, username = value.partition('=')
+        if not email or not username:
+            msg = f'{value!r} is not in EMAIL=USERNAME form'
+            raise click.BadParameter(msg)
+        members.append((email, username))
+    return members
+
+
+@main.command()
+@click.option(
+    '--model',
+    '-m',
+    'models',
+    multiple=True,
+    help='Model to benchmark, may be repeated (default: every installed model)',
+)
+@click.option(
+    '--size',
+    'sizes',
+    type=click.Choice(list(BENCH_SIZES)),
+    multiple=True,
+    help='Prompt size to run, may be repeated (default: all)',
+)
+@click.option(
+    '--json',
+    'as_json',
+    is_flag=True,
+    default=False,
+    help='Print results as JSON for comparing machines',
+)
+def bench(models: tuple[str, ...], sizes: tuple[str, ...], as_json: bool) -> None:
+    """Measure load time, latency and throughput of local models on standup prompts"""
+    client = get_ollama_client()
+    models = list(models) or client.list_models()
+    if not models:
+        click.echo('No models installed, run `standupbrain init` first')
+        sys.exit(1)
+
+    results = run_bench(client, models, list(sizes) or list(BENCH_SIZES))
+    if as_json:
+        report = {
+            'machine': get_machine_info(),
+            'results': [asdict(result) for result in results],
+        }
+        click.echo(json.dumps(report, indent=2))
+    else:
+        click.echo(format_bench_table(results))
+
+
+def resolve_recall_dates(
+    date: datetime | None,
+    since: datetime | None,
+    until: datetime | None,
+) -> tuple[datetime, datetime | None]:
+    """Validate the date options, returning the start date and end of any range"""
+    if date and (since or until):
+        msg = '--date cannot be combined with --since/--until'
+        raise click.UsageError(msg)
+    if until and not since:
+        msg = '--until requires --since'
+        raise click.UsageError(msg)
+
+    if since:
+        until = until or datetime.now()
+        if until < since:
+            msg = '--until must not be before --since'
+            raise click.UsageError(msg)
+        return since, until
+
+    if not date:
+        log.debug('No date provided, using previous workday')
+        date = get_previous_workday()
+        log.debug('Using date: %s', date)
+    return date, None
+
+
+def recall_range(
+    since: datetime,
+    until: datetime,
+    commits: list[RepoCommits],
+    jira_summaries: dict[str, str],
+    dry_run: bool,
+    *,
+    use_cache: bool = True,
+) -> None:
+    """Summarize each day of an already gathered range, then the range as a whole"""
+    commits_by_day = split_commits_by_day(commits)
+    period = f'{since:%Y-%m-%d} to {until:%Y-%m-%d}'
+    day_summaries = {}
+    for day in get_days_between(since, until):
+        day_str = day.strftime('%Y-%m-%d')
+        day_commits = commits_by_day.get(day_str, [])
+        jira_summary = jira_summaries.get(day_str, '')
+        if not day_commits and not jira_summary:
+            log.debug('No commits or Jira found for %s', day_str)
+            continue
+
+        if dry_run:
+            log_prompt_size(jira_summary, day_commits, label=day_str)
+            continue
+        click.echo(f'\n{day_str}:')
+        day_summaries[day_str] = summarize_activity(
+            jira_summary,
+            day_commits,
+            on_token=echo_token,
+            use_cache=use_cache,
+        )
+        click.echo()
+
+    if dry_run:
+        click.echo('Exiting early, not prompting LLM')
+        return
+    if not day_summaries:
+        click.echo(f'No commits or Jira found from {period}')
+        return
+    if len(day_summaries) > 1:
+        click.echo(f'\n{period}:')
+        summarize_period(day_summaries, on_token=echo_token, use_cache=use_cache)
+        click.echo()
+
+
+def gather_activity(
+    date: datetime,
+    github_username: str,
+    author_email: str,
+    max_workers: int | None = None,
+    until: datetime | None = None,
+) -> tuple[list[RepoCommits], dict[str, str]]:
+    """Fetch git and Jira activity concurrently, isolating failures per source
+
+    Each source is queried once for the whole `date` to `until` window; Jira
+    summaries come back keyed by day.
+    """
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        commits_future = executor.submit(
+            get_git_commits,
+            date,
+            github_username,
+            author_email,
+            max_workers=max_workers,
+            until=until,
+        )
+        jira_future = executor.submit(
+            make_jira_activity_summaries,
+            date,
+            until or date,
+        )
+        commits = get_source_result(commits_future, 'git', [])
+        jira_summaries = get_source_result(jira_future, 'Jira', {})
+    return commits, jira_summaries
+
+
+def echo_token(token: str) -> None:
+    click.echo(token, nl=False)
+
+
+def log_prompt_size(
+    jira_summary: str,
+    commits: list[RepoCommits],
+    label: str | None = None,
+) -> None:
+    """Log the size of the single, unchunked standup prompt for a dry run
+
+    `summarize_activity` splits it into several prompts when it doesn't fit the
+    model's context, which a dry run doesn't look up.
+    """
+    prompt = ''.join(iter_standup_summary_llm_prompt(jira_summary, commits))
+    log.debug(
+        'Unchunked prompt size%s: %s chars, ~%s tokens '
+        '(split into parts if over the context window)',
+        f' for {label}' if label else '',
+        len(prompt),
+        estimate_tokens(prompt),
+    )
+
+
+@contextmanager
+def exit_on_llm_error() -> Iterator[None]:
+    """Report a failed prompt in one line, with the server's reason, and exit"""
+    try:
+        yield
+    except (LLMError, requests.RequestException) as e:
+        log.debug('Prompting the LLM failed', exc_info=True)
+        click.echo(f'\n⚠ Could not summarize activity: {e}')
+        sys.exit(1)
+
+
+def get_member_summary(future: Future[str], username: str) -> str:
+    """A teammate's summary, or an error line so the others still print"""
+    try:
+        return future.result()
+    except Exception as e:
+        log.debug('Summarizing activity for %s failed', username, exc_info=True)
+        return f'⚠ Could not summarize activity for {username}: {e}'
+
+
+def get_source_result[T](future: Future[T], source: str, default: T) -> T:
+    try:
+        return future.result()
+    except Exception as e:
+        log.debug('Gathering %s activity failed', source, exc_info=True)
+        click.echo(f'⚠ Could not gather {source} activity, continuing without it: {e}')
+        return default
@@ -0,0 +1,257 @@
+import json
+import logging
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from fnmatch import fnmatch
+
+from standupbrain.shared import get_config_path
+
+log = logging.getLogger(__name__)
+
+# Separators for `git log --format`, chosen so subjects/bodies can't collide
+RECORD_SEP = '\x1e'
+FIELD_SEP = '\x1f'
+GIT_LOG_FORMAT = (
+    f'--format={RECORD_SEP}%H{FIELD_SEP}%cd{FIELD_SEP}%s{FIELD_SEP}%b{FIELD_SEP}'
+)
+# Commit dates in local time, matching how `--since`/`--until` are interpreted
+GIT_LOG_DATE_FORMAT = '--date=format-local:%Y-%m-%d'
+HEADER_FIELDS = 4
+
+DEFAULT_EXCLUDE_GLOBS = (
+    '*.lock',
+    'package-lock.json',
+    'pnpm-lock.yaml',
+    'go.sum',
+    '*.min.js',
+    '*.min.css',
+    '*.map',
+    '*.pb.go',
+    '*_pb2.py',
+    'vendor/*',
+    'dist/*',
+    '*.png',
+    '*.jpg',
+    '*.gif',
+    '*.pdf',
+    '*.zip',
+)
+
+
+@dataclass(frozen=True, slots=True)
+class DiffLimits:
+    """Caps applied while parsing `git log --patch` so prompt size stays bounded"""
+
+    max_file_bytes: int = 4_000
+    max_commit_bytes: int = 16_000
+    max_repo_bytes: int = 20_000_000
+    exclude_globs: tuple[str, ...] = DEFAULT_EXCLUDE_GLOBS
+
+    def is_excluded(self, path: str) -> bool:
+        name = path.rpartition('/')[2]
+        return any(
+            fnmatch(path, pattern) or fnmatch(name, pattern)
+            for pattern in self.exclude_globs
+        )
+
+
+@dataclass(slots=True)
+class FileDiff:
+    path: str
+    additions: int = 0
+    deletions: int = 0
+    hunks: str = ''
+    binary: bool = False
+    excluded: bool = False
+    truncated: bool = False
+    renamed_from: str = ''
+    note: str = ''
+
+
+@dataclass(slots=True)
+class Commit:
+    hash: str
+    subject: str
+    body: str = ''
+    date: str = ''
+    files: list[FileDiff] = field(default_factory=list)
+    truncated: bool = False
+
+    def render(self) -> str:
+        lines = [f'commit {self.hash[:10]}: {self.subject}']
+        if self.body:
+            lines.append(self.body)
+        for file in self.files:
+            path = file.path
+            if file.renamed_from:
+                path = f'{file.renamed_from} -> {file.path}'
+            stats = f'{path} (+{file.additions} -{file.deletions})'
+            if file.binary:
+                lines.append(f'{stats} [binary]')
+            elif file.excluded:
+                lines.append(f'{stats} [generated, diff omitted]')
+            elif file.note:
+                lines.append(f'{stats} [{file.note}]')
+            else:
+                lines.append(stats)
+                if file.hunks:
+                    lines.append(file.hunks)
+                if file.truncated:
+                    lines.append('[diff truncated]')
+        if self.truncated:
+            lines.append('[remaining diffs in commit truncated]')
+        return '\n'.join(lines)
+
+
+@dataclass(slots=True)
+class RepoCommits:
+    repo: str
+    commits: list[Commit] = field(default_factory=list)
+    truncated: bool = False
+
+    def render(self) -> str:
+        return ''.join(self.iter_render())
+
+    def iter_render(self) -> Iterator[str]:
+        """Render one commit at a time so large repos never build one big string"""
+        for idx, commit in enumerate(self.commits):
+            yield ('\n\n' if idx else '') + commit.render()
+        if self.truncated:
+            yield '\n[git log output truncated, later commits omitted]'
+
+
+def split_commits_by_day(
+    commits: list[RepoCommits],
+) -> dict[str, list[RepoCommits]]:
+    """Bucket each repo's commits by commit date, keeping repo order within a day"""
+    by_day: dict[str, dict[str, RepoCommits]] = {}
+    for repo_commits in commits:
+        for commit in repo_commits.commits:
+            day = by_day.setdefault(commit.date, {})
+            bucket = day.setdefault(
+                repo_commits.repo,
+                RepoCommits(repo=repo_commits.repo, truncated=repo_commits.truncated),
+            )
+            bucket.commits.append(commit)
+    return {date: list(repos.values()) for date, repos in sorted(by_day.items())}
+
+
+def get_diff_limits() -> DiffLimits:
+    """Diff limits from config (`diff_max_file_bytes`, etc), else defaults"""
+    config_path = get_config_path()
+    if not config_path.exists():
+        return DiffLimits()
+    data = json.loads(config_path.read_text())
+    defaults = DiffLimits()
+    return DiffLimits(
+        max_file_bytes=data.get('diff_max_file_bytes', defaults.max_file_bytes),
+        max_commit_bytes=data.get('diff_max_commit_bytes', defaults.max_commit_bytes),
+        max_repo_bytes=data.get('diff_max_repo_bytes', defaults.max_repo_bytes),
+        exclude_globs=tuple(data.get('diff_exclude_globs', defaults.exclude_globs)),
+    )
+
+
+def parse_git_log(output: str, limits: DiffLimits) -> list[Commit]:
+    """Parse `git log --patch` run with `GIT_LOG_FORMAT` into commit records"""
+    parser = GitLogParser(limits)
+    # Not splitlines(), which also breaks on the record/field separators
+    for line in output.split('\n'):
+        parser.feed(line)
+    return parser.close()
+
+
+class GitLogParser:
+    """Incremental, line-at-a-time parser for `git log --patch` output
+
+    Diff text past the limits is counted for stats but never stored, so memory
+    is bounded by the limits rather than by what was committed.
+    """
+
+    def __init__(self, limits: DiffLimits) -> None:
+        self.limits = limits
+        self.commits: list[Commit] = []
+        self.header: list[str] | None = None
+        self.file: FileDiff | None = None
+        self.in_hunks = False
+        self.hunk_lines: list[str] = []
+        self.file_bytes = 0
+        self.commit_bytes = 0
+
+    def feed(self, line: str) -> None:
+        line = line.rstrip('\n')
+        if line.startswith(RECORD_SEP):
+            self.finish_file()
+            self.header = []
+            line = line[1:]
+        if self.header is not None:
+            self.feed_header(line)
+        elif line.startswith('diff --git '):
+            self.finish_file()
+            self.file = FileDiff(path=line.rpartition(' b/')[2])
+        elif self.file is not None:
+            self.feed_file(line)
+
+    def feed_header(self, line: str) -> None:
+        self.header.append(line)
+        text = '\n'.join(self.header)
+        if text.count(FIELD_SEP) < HEADER_FIELDS:
+            return
+        commit_hash, date, subject, body, _ = text.split(FIELD_SEP, HEADER_FIELDS)
+        commit = Commit(
+            hash=commit_hash,
+            subject=subject,
+            body=body.strip(),
+            date=date,
+        )
+        self.commits.append(commit)
+        self.header = None
+        self.commit_bytes = 0
+
+    def feed_file(self, line: str) -> None:
+        file = self.file
+        if not self.in_hunks:
+            if line.startswith('+++ b/'):
+                file.path = line.removeprefix('+++ b/')
+            elif line.startswith('rename from '):
+                file.renamed_from = line.removeprefix('rename from ')
+            elif line.startswith('Binary files'):
+                file.binary = True
+            elif line.startswith('@@'):
+                self.in_hunks = True
+                file.excluded = self.limits.is_excluded(file.path)
+            if not self.in_hunks:
+                return
+
+        if line.startswith('+'):
+            file.additions += 1
+        elif line.startswith('-'):
+            file.deletions += 1
+        self.store_hunk_line(line)
+
+    def store_hunk_line(self, line: str) -> None:
+        file = self.file
+        commit = self.commits[-1]
+        if file.excluded or file.truncated or commit.truncated:
+            return
+        size = len(line) + 1
+        if self.file_bytes + size > self.limits.max_file_bytes:
+            file.truncated = True
+        elif self.commit_bytes + size > self.limits.max_commit_bytes:
+            commit.truncated = True
+        else:
+            self.hunk_lines.append(line)
+            self.file_bytes += size
+            self.commit_bytes += size
+
+    def finish_file(self) -> None:
+        if self.file is not None:
+            self.file.hunks = '\n'.join(self.hunk_lines)
+            self.commits[-1].files.append(self.file)
+        self.file = None
+        self.in_hunks = False
+        self.hunk_lines = []
+        self.file_bytes = 0
+
+    def close(self) -> list[Commit]:
+        self.finish_file()
+        return self.commits
@@ -0,0 +1,115 @@
+import logging
+import re
+
+from standupbrain.commits import FileDiff, RepoCommits
+
+log = logging.getLogger(__name__)
+
+# Hunks with more changed lines than this are reduced to what they touched
+LARGE_HUNK_LINES = 40
+HUNK_HEADER_RE = re.compile(r'^@@ [^@]* @@ ?(.*)$')
+DEFINITION_RE = re.compile(
+    r'^\s*(?:export\s+)?(?:pub\s+)?(?:async\s+)?'
+    r'(?:def|class|function|func|fn|interface|struct|enum|type)\s+([A-Za-z_]\w*)',
+)
+IMPORT_RE = re.compile(
+    r'^\s*(?:import\s|from\s+\S+\s+import\s|#include\s|use\s|require\(|'
+    r'const\s+\w+\s*=\s*require\()',
+)
+
+
+def condense_commits(commits: list[RepoCommits]) -> list[RepoCommits]:
+    """Strip diff content that costs tokens without informing a standup
+
+    Context lines are dropped, whitespace-only, rename-only and import-only
+    changes become one-line notes, and large hunks are reduced to the
+    functions/classes they touch. Files are condensed in place.
+    """
+    debug = log.isEnabledFor(logging.DEBUG)
+    before = sum(len(repo_commits.render()) for repo_commits in commits) if debug else 0
+    for repo_commits in commits:
+        for commit in repo_commits.commits:
+            for file in commit.files:
+                condense_file(file)
+    if debug and before:
+        after = sum(len(repo_commits.render()) for repo_commits in commits)
+        log.debug(
+            'Condensed diffs from %s to %s chars (%.0f%% smaller)',
+            before,
+            after,
+            100 * (before - after) / before,
+        )
+    return commits
+
+
+def condense_file(file: FileDiff) -> None:
+    if file.binary or file.excluded:
+        return
+    if file.renamed_from and not file.additions and not file.deletions:
+        file.note = 'renamed, no content changes'
+        return
+
+    hunks = split_hunks(file.hunks)
+    changed = [line for _, lines in hunks for line in lines]
+    if not changed:
+        file.hunks = ''
+        return
+    # A truncated diff may hide real changes past the cut, so don't label it
+    if not file.truncated:
+        note = classify_changes(changed)
+        if note:
+            file.note = note
+            file.hunks = ''
+            return
+    file.hunks = '\n'.join(condense_hunk(context, lines) for context, lines in hunks)
+
+
+def split_hunks(hunks: str) -> list[tuple[str, list[str]]]:
+    """Each hunk's header context (usually the enclosing function) and its
+    added/removed lines, with unchanged context lines dropped
+    """
+    result: list[tuple[str, list[str]]] = []
+    for line in hunks.split('\n'):
+        if match := HUNK_HEADER_RE.match(line):
+            result.append((match.group(1), []))
+        elif line[:1] in {'+', '-'} and result:
+            result[-1][1].append(line)
+    return result
+
+
+def classify_changes(changed: list[str]) -> str | None:
+    """A one-line note for changes not worth showing line by line, if any"""
+    removed = [line[1:] for line in changed if line.startswith('-')]
+    added = [line[1:] for line in changed if line.startswith('+')]
+    code = [line for line in removed + added if line.strip()]
+    if code and all(IMPORT_RE.match(line) for line in code):
+        if sorted(map(str.strip, removed)) == sorted(map(str.strip, added)):
+            return 'imports reordered'
+        return f'import changes only (+{len(added)} -{len(removed)})'
+    # Compared in order, so moved lines don't pass as whitespace changes
+    stripped_removed = [strip_whitespace(line) for line in removed]
+    stripped_added = [strip_whitespace(line) for line in added]
+    if removed != added and stripped_removed == stripped_added:
+        return 'whitespace-only changes'
+    return None
+
+
+def condense_hunk(context: str, lines: list[str]) -> str:
+    header = f'@@ {context}'.rstrip()
+    if len(lines) <= LARGE_HUNK_LINES:
+        return '\n'.join([header, *lines])
+
+    additions = sum(line.startswith('+') for line in lines)
+    names = dict.fromkeys(
+        match.group(1)
+        for line in [context, *(line[1:] for line in lines)]
+        if (match := DEFINITION_RE.match(line))
+    )
+    summary = f'+{additions} -{len(lines) - additions} lines'
+    if names:
+        summary += f' touching {", ".join(names)}'
+    return f'{header} [{summary}]'
+
+
+def strip_whitespace(line: str) -> str:
+    return ''.join(line.split())
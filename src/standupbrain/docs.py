@@ -47,5 +47,7 @@ if __name__ == '__main__':
             ['standupbrain'],
             ['standupbrain', 'init'],
             ['standupbrain', 'recall'],
+            ['standupbrain', 'recall-team'],
+            ['standupbrain', 'bench'],
         ],
     )
@@ -1,105 +1,454 @@
 import json
 import logging
+import os
 import shlex
 import subprocess
+import time
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from pprint import pformat
 
+import requests
+
+from standupbrain.commits import (
+    GIT_LOG_DATE_FORMAT,
+    GIT_LOG_FORMAT,
+    Commit,
+    DiffLimits,
+    GitLogParser,
+    RepoCommits,
+    get_diff_limits,
+)
+from standupbrain.condense import condense_commits
+from standupbrain.git_init import require_remote_gh_username
+from standupbrain.github import get_github_client
+from standupbrain.repo_index import RepoIndex, get_repo_index
+
 log = logging.getLogger(__name__)
 
+# GitHub only serves the most recent 300 events, 100 per page at most
+EVENTS_PER_PAGE = 100
+EVENTS_MAX_PAGES = 3
+
+STREAM_CHUNK_BYTES = 64 * 1024
+
 
 def get_git_commits(
     date: datetime,
     github_username: str,
     author_email: str,
-) -> list[dict]:
-    """Get commit diffs for a given date/GH username"""
+    max_workers: int | None = None,
+    until: datetime | None = None,
+) -> list[RepoCommits]:
+    """Get commit diffs for a given date (or `date` to `until`)/GH username
+
+    A range is fetched in a single pass per repo; each commit carries its date
+    so callers can bucket by day with `split_commits_by_day`.
+    """
     date_str = date.strftime('%Y-%m-%d')
-    log.debug('Getting commits for %s', date_str)
-    affected_repos = get_affected_repos(date_str, github_username)
-    log.debug('Affected repos: %s', affected_repos)
-    commits = get_git_commits_local(affected_repos, date_str, author_email)
-    log.debug(pformat(commits))
+    until_str = until.strftime('%Y-%m-%d') if until else date_str
+    log.debug('Getting commits for %s to %s', date_str, until_str)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        repo_index_future = executor.submit(get_repo_index)
+        affected_repos = get_affected_repos(
+            date_str,
+            github_username,
+            until_str=until_str,
+        )
+        log.debug('Affected repos: %s', affected_repos)
+        repo_index = repo_index_future.result()
+    commits = get_git_commits_local(
+        affected_repos,
+        date_str,
+        author_email,
+        max_workers=max_workers,
+        repo_index=repo_index,
+        until_str=until_str,
+    )
+    condense_commits(commits)
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug(pformat(commits))
     log.debug('Found %d commits', len(commits))
     return commits
 
 
-def get_affected_repos(date_str: str, github_username: str) -> set[str]:
-    if not github_username or '@' in github_username:
-        github_username = subprocess.run(
-            ['gh', 'api', '/user', '--jq', '.login'],
-            capture_output=True,
-            text=True,
-            check=True,
-        ).stdout.strip()
-        log.debug('Using current user: %s', github_username)
+def get_team_git_commits(
+    date: datetime,
+    members: list[tuple[str, str]],
+    max_workers: int | None = None,
+    until: datetime | None = None,
+) -> dict[str, list[RepoCommits]]:
+    """Get commit diffs for several `(author_email, github_username)` members
 
-    events_result = subprocess.run(
-        ['gh', 'api', f'/users/{github_username}/events', '--paginate'],
-        capture_output=True,
-        text=True,
-        check=True,
+    Every member's GitHub events are fetched concurrently, then each affected
+    local repo is scanned once for all authors and split per author email.
+    """
+    date_str = date.strftime('%Y-%m-%d')
+    until_str = until.strftime('%Y-%m-%d') if until else date_str
+    with ThreadPoolExecutor(max_workers=len(members) + 1) as executor:
+        repo_index_future = executor.submit(get_repo_index)
+        events_futures = [
+            executor.submit(get_affected_repos, date_str, username, until_str=until_str)
+            for _, username in members
+        ]
+        affected_repos = set().union(*(future.result() for future in events_futures))
+        log.debug('Affected repos: %s', affected_repos)
+        repo_index = repo_index_future.result()
+    commits_by_author = get_team_git_commits_local(
+        affected_repos,
+        date_str,
+        [email for email, _ in members],
+        max_workers=max_workers,
+        repo_index=repo_index,
+        until_str=until_str,
     )
+    for commits in commits_by_author.values():
+        condense_commits(commits)
+    return commits_by_author
+
+
+def get_affected_repos(
+    date_str: str,
+    github_username: str,
+    until_str: str | None = None,
+) -> set[str]:
+    until_str = until_str or date_str
+    if not github_username or '@' in github_username:
+        github_username = require_remote_gh_username()
+        log.debug('Using current user: %s', github_username)
 
     affected_repos = set()
-    decoder = json.JSONDecoder()
-    raw = events_result.stdout.strip()
-    idx = 0
-
-    while idx < len(raw):
-        try:
-            events, end_idx = decoder.raw_decode(raw, idx)
-            for event in events:
-                if (
-                    event['type'] in ('PushEvent', 'PullRequestEvent')
-                    and event['created_at'][:10] == date_str
-                ):
-                    repo_name = event['repo']['name'].split('/')[-1]
-                    affected_repos.add(repo_name)
-            idx = end_idx
-        except json.JSONDecodeError:
+    for events in iter_event_pages(github_username):
+        for event in events:
+            if (
+                event['type'] in ('PushEvent', 'PullRequestEvent')
+                and date_str <= event['created_at'][:10] <= until_str
+            ):
+                affected_repos.add(event['repo']['name'])
+
+        # The events feed is newest first, so once a page reaches back past the
+        # target date every later page is older still
+        if not events or events[-1]['created_at'][:10] < date_str:
             break
 
     return affected_repos
 
 
+def iter_event_pages(github_username: str) -> Iterator[list[dict]]:
+    """Yield pages of a user's GitHub events, newest first, one request at a time"""
+    client = get_github_client()
+    for page in range(1, EVENTS_MAX_PAGES + 1):
+        log.debug('Fetching GitHub events page %d for %s', page, github_username)
+        events = None
+        if client:
+            try:
+                events = client.get_user_events(github_username, page, EVENTS_PER_PAGE)
+            except requests.RequestException as e:
+                log.debug('GitHub API events fetch failed, falling back to gh: %s', e)
+                client = None
+        if events is None:
+            events = get_user_events_gh(github_username, page)
+        yield events
+        if len(events) < EVENTS_PER_PAGE:
+            return
+
+
+def get_user_events_gh(github_username: str, page: int) -> list[dict]:
+    endpoint = f'/users/{github_username}/events?per_page={EVENTS_PER_PAGE}'
+    result = subprocess.run(
+        ['gh', 'api', f'{endpoint}&page={page}'],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout or '[]')
+
+
 def get_git_commits_local(
     affected_repos: set[str],
     date_str: str,
     author_email: str,
-) -> list[dict]:
-    projects_dir = Path.home() / 'projects'
-    all_commits = []
+    *,
+    max_workers: int | None = None,
+    repo_index: RepoIndex | None = None,
+    limits: DiffLimits | None = None,
+    until_str: str | None = None,
+) -> list[RepoCommits]:
+    """Run `git log` for every affected local repo, fanned out over a thread pool
+
+    `affected_repos` are GitHub `owner/name`s, resolved to local checkouts via
+    the repo index. Results are returned in repo name order regardless of
+    completion order.
+    """
+    if repo_index is None:
+        repo_index = get_repo_index()
+    if limits is None:
+        limits = get_diff_limits()
+
+    repos = resolve_local_repos(affected_repos, repo_index)
+    results = map_repos(
+        repos,
+        lambda path: run_git_log(
+            path,
+            date_str,
+            author_email,
+            limits,
+            until_str=until_str,
+        ),
+        max_workers,
+    )
+    all_commits = [
+        RepoCommits(repo=label, commits=commits, truncated=truncated)
+        for (label, _), (commits, truncated) in zip(repos, results, strict=True)
+        if commits
+    ]
+
+    log.debug('Found %d commits', len(all_commits))
+    return all_commits
+
+
+def get_team_git_commits_local(
+    affected_repos: set[str],
+    date_str: str,
+    author_emails: list[str],
+    *,
+    max_workers: int | None = None,
+    repo_index: RepoIndex | None = None,
+    limits: DiffLimits | None = None,
+    until_str: str | None = None,
+) -> dict[str, list[RepoCommits]]:
+    """Like `get_git_commits_local` for several authors, with one `git log` per repo"""
+    if repo_index is None:
+        repo_index = get_repo_index()
+    if limits is None:
+        limits = get_diff_limits()
+
+    repos = resolve_local_repos(affected_repos, repo_index)
+    results = map_repos(
+        repos,
+        lambda path: run_git_log_by_author(
+            path,
+            date_str,
+            author_emails,
+            limits,
+            until_str=until_str,
+        ),
+        max_workers,
+    )
+    commits_by_author: dict[str, list[RepoCommits]] = {
+        email: [] for email in author_emails
+    }
+    for (label, _), (by_author, truncated) in zip(repos, results, strict=True):
+        for email, commits in by_author.items():
+            if commits:
+                commits_by_author[email].append(
+                    RepoCommits(repo=label, commits=commits, truncated=truncated),
+                )
+    return commits_by_author
 
+
+def resolve_local_repos(
+    affected_repos: set[str],
+    repo_index: RepoIndex,
+) -> list[tuple[str, Path]]:
+    """Local checkouts of GitHub `owner/name`s as `(label, path)`, in name order"""
     log.debug('Processing %d repos', len(affected_repos))
-    for repo in projects_dir.iterdir():
-        log.debug('Processing %s', repo.name)
-        if not (repo / '.git').exists() or repo.name not in affected_repos:
-            log.debug('Excluding %s', repo.name)
-            continue
-
-        command = [
-            'git',
-            '-C',
-            str(repo),
-            'log',
-            '--branches',
-            f'--since={date_str} 00:00',
-            f'--until={date_str} 23:59',
-            f'--author={author_email}',
-            '--format=%H|%s|%b',
-            '--patch',
+    repos = []
+    for full_name in sorted(affected_repos):
+        paths = repo_index.lookup(full_name)
+        if not paths:
+            log.debug('No local checkout for %s', full_name)
+        for path in paths:
+            label = full_name if len(paths) == 1 else f'{full_name} ({path})'
+            repos.append((label, path))
+    return repos
+
+
+def map_repos[T](
+    repos: list[tuple[str, Path]],
+    func: Callable[[Path], T],
+    max_workers: int | None = None,
+) -> list[T]:
+    """Run `func` on each repo path over a thread pool, keeping repo order"""
+    if max_workers is None:
+        max_workers = get_default_max_workers()
+    max_workers = max(1, min(max_workers, len(repos) or 1))
+    log.debug(
+        'Running git log across %d repos with %d workers',
+        len(repos),
+        max_workers,
+    )
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(lambda repo: func(repo[1]), repos))
+
+
+def get_default_max_workers() -> int:
+    """Git log is mostly I/O and subprocess wait, so oversubscribe the CPUs a bit"""
+    return min(32, (os.cpu_count() or 1) * 2)
+
+
+def run_git_log(
+    repo: Path,
+    date_str: str,
+    author_email: str,
+    limits: DiffLimits,
+    until_str: str | None = None,
+) -> tuple[list[Commit], bool]:
+    """Find the day's commits cheaply, then extract patches for only those commits
+
+    Listing hashes never touches blobs, so repos with nothing on the date cost a
+    few milliseconds instead of a full `git log --patch` walk. Returns the
+    commits and whether the output hit the per-repo byte ceiling.
+    """
+    start = time.perf_counter()
+    commit_hashes = list_commit_hashes(repo, date_str, author_email, until_str)
+    return log_commit_patches(repo, commit_hashes, limits, start)
+
+
+def run_git_log_by_author(
+    repo: Path,
+    date_str: str,
+    author_emails: list[str],
+    limits: DiffLimits,
+    until_str: str | None = None,
+) -> tuple[dict[str, list[Commit]], bool]:
+    """`run_git_log` for several authors at once, split by which author matched"""
+    start = time.perf_counter()
+    authors = list_commit_authors(repo, date_str, author_emails, until_str)
+    commits, truncated = log_commit_patches(repo, list(authors), limits, start)
+    by_author = {
+        email: [
+            commit
+            for commit in commits
+            if authors.get(commit.hash, '').lower() == email.lower()
         ]
-        log.debug('Running command: %s', ' '.join(shlex.quote(arg) for arg in command))
-        result = subprocess.run(
-            command,
-            capture_output=True,
-            text=True,
+        for email in author_emails
+    }
+    return by_author, truncated
+
+
+def log_commit_patches(
+    repo: Path,
+    commit_hashes: list[str],
+    limits: DiffLimits,
+    start: float,
+) -> tuple[list[Commit], bool]:
+    if not commit_hashes:
+        log.debug(
+            'No commits in %s, skipped patches after %.3fs',
+            repo.name,
+            time.perf_counter() - start,
         )
+        return [], False
 
-        if result.stdout:
-            all_commits.append({'repo': repo.name, 'output': result.stdout})
+    command = [
+        'git',
+        '-C',
+        str(repo),
+        'log',
+        '--no-walk=unsorted',
+        '--stdin',
+        GIT_LOG_FORMAT,
+        GIT_LOG_DATE_FORMAT,
+        '--patch',
+    ]
+    log.debug('Running command: %s', ' '.join(shlex.quote(arg) for arg in command))
+    commits, truncated = stream_git_log(command, commit_hashes, limits)
+    log.debug(
+        'git log of %d commits in %s took %.3fs%s',
+        len(commit_hashes),
+        repo.name,
+        time.perf_counter() - start,
+        ' (truncated)' if truncated else '',
+    )
+    return commits, truncated
 
-    log.debug('Found %d commits', len(all_commits))
-    return all_commits
+
+def stream_git_log(
+    command: list[str],
+    commit_hashes: list[str],
+    limits: DiffLimits,
+) -> tuple[list[Commit], bool]:
+    """Parse `git log` stdout as it arrives, killing git past `max_repo_bytes`
+
+    Lines are read in bounded chunks and only the start of an overlong diff line
+    (a minified bundle, say) is parsed, so memory stays flat whatever was
+    committed.
+    """
+    parser = GitLogParser(limits)
+    bytes_read = 0
+    truncated = False
+    at_line_start = True
+
+    process = subprocess.Popen(
+        command,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        process.stdin.write(('\n'.join(commit_hashes) + '\n').encode())
+        process.stdin.close()
+        while chunk := process.stdout.readline(STREAM_CHUNK_BYTES):
+            bytes_read += len(chunk)
+            if bytes_read > limits.max_repo_bytes:
+                truncated = True
+                process.kill()
+                break
+            # Commit headers must be seen whole to find where the body ends
+            if at_line_start or parser.header is not None:
+                parser.feed(chunk.decode(errors='replace'))
+            at_line_start = chunk.endswith(b'\n')
+    finally:
+        process.stdout.close()
+        process.wait()
+
+    return parser.close(), truncated
+
+
+def list_commit_hashes(
+    repo: Path,
+    date_str: str,
+    author_email: str,
+    until_str: str | None = None,
+) -> list[str]:
+    return list(list_commit_authors(repo, date_str, [author_email], until_str))
+
+
+def list_commit_authors(
+    repo: Path,
+    date_str: str,
+    author_emails: list[str],
+    until_str: str | None = None,
+) -> dict[str, str]:
+    """Hashes of commits by any of `author_emails`, mapped to the author email
+
+    git ORs repeated `--author` filters, so one walk covers every author. They
+    are regexes over `Name <email>` though, so `bob@co.com` also matches
+    `jbob@co.com`; callers match the returned email exactly.
+    """
+    command = [
+        'git',
+        '-C',
+        str(repo),
+        'log',
+        '--branches',
+        f'--since={date_str} 00:00',
+        f'--until={until_str or date_str} 23:59',
+        *(f'--author={email}' for email in author_emails),
+        '--format=%H %ae',
+    ]
+    log.debug('Running command: %s', ' '.join(shlex.quote(arg) for arg in command))
+    result = subprocess.run(
+        command,
+        capture_output=True,
+        text=True,
+    )
+    authors = {}
+    for line in result.stdout.splitlines():
+        commit_hash, _, email = line.strip().partition(' ')
+        if commit_hash:
+            authors[commit_hash] = email
+    return authors
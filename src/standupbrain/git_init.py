@@ -1,12 +1,17 @@
 import json
+import logging
 import platform
 import subprocess
 import sys
 
 import click
+import requests
 
+from standupbrain.github import get_github_client
 from standupbrain.shared import get_config_path
 
+log = logging.getLogger(__name__)
+
 
 def init_git() -> None:
     click.echo('Setting up Git/GitHub configuration...\n')
@@ -82,6 +87,13 @@ def get_local_git_email() -> str | None:
 
 
 def get_remote_gh_username() -> str | None:
+    client = get_github_client()
+    if client:
+        try:
+            return client.get_authenticated_username()
+        except requests.RequestException as e:
+            log.debug('GitHub API user lookup failed, falling back to gh: %s', e)
+
     try:
         result = subprocess.run(
             ['gh', 'api', 'user', '--jq', '.login'],
@@ -94,6 +106,19 @@ def get_remote_gh_username() -> str | None:
         return None
 
 
+def require_remote_gh_username() -> str:
+    """`get_remote_gh_username`, exiting if it can't be found rather than letting
+    requests go out for user `None`
+    """
+    username = get_remote_gh_username()
+    if not username:
+        log.error(
+            'Could not look up your GitHub username, run `standupbrain init` first',
+        )
+        sys.exit(1)
+    return username
+
+
 def is_gh_installed() -> bool:
     try:
         subprocess.run(['gh', '--version'], capture_output=True, check=True)
@@ -120,6 +145,10 @@ def install_gh() -> None:
 
 
 def ensure_gh_authenticated() -> bool:
+    client = get_github_client()
+    if client and client.is_authenticated():
+        return True
+
     try:
         result = subprocess.run(
             ['gh', 'auth', 'status'],
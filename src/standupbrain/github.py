@@ -0,0 +1,179 @@
+import hashlib
+import json
+import logging
+import os
+import subprocess
+import time
+from functools import cache
+from http import HTTPStatus
+from pathlib import Path
+
+import requests
+
+from standupbrain.shared import get_cache_dir, get_config_path, make_session
+
+log = logging.getLogger(__name__)
+
+GITHUB_API_URL = 'https://api.github.com'
+GITHUB_API_VERSION = '2022-11-28'
+GITHUB_RETRIES = 3
+
+
+class GitHubClient:
+    """Thin GitHub REST client
+
+    GETs are retried with exponential backoff on connection errors and gateway
+    errors, waiting as long as a `Retry-After` header asks.
+    """
+
+    def __init__(
+        self,
+        token: str,
+        base_url: str = GITHUB_API_URL,
+        timeout: float = 10,
+        pool_size: int = 10,
+        cache_dir: Path | None = None,
+    ) -> None:
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.cache_dir = cache_dir
+        # Keys cache entries to the account so one user's view never leaks to another
+        self.token_digest = hashlib.sha256(token.encode()).hexdigest()[:16]
+        self.session = make_session(
+            GITHUB_RETRIES,
+            respect_retry_after=True,
+            pool_maxsize=pool_size,
+        )
+        self.session.headers.update(
+            {
+                'Accept': 'application/vnd.github+json',
+                'Accept-Encoding': 'gzip',
+                'Authorization': f'Bearer {token}',
+                'X-GitHub-Api-Version': GITHUB_API_VERSION,
+            },
+        )
+
+    def get(self, path: str, params: dict | None = None) -> requests.Response:
+        response = self.session.get(
+            f'{self.base_url}{path}',
+            params=params,
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        return response
+
+    def get_json_cached(self, path: str, params: dict | None = None) -> dict | list:
+        """GET with an on-disk ETag/Last-Modified cache
+
+        Within GitHub's `X-Poll-Interval` the cached body is served without any
+        request; after it, a conditional request is made and a 304 (which does
+        not count against the rate limit) reuses the cached body.
+        """
+        if self.cache_dir is None:
+            return self.get(path, params=params).json()
+
+        cache_path = self.get_cache_path(path, params)
+        entry = read_cache_entry(cache_path)
+        now = time.time()
+        if entry and now - entry['fetched_at'] < entry['poll_interval']:
+            log.debug('Serving %s from cache within poll interval', path)
+            return entry['body']
+
+        headers = {}
+        if entry and entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry and entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+
+        response = self.session.get(
+            f'{self.base_url}{path}',
+            params=params,
+            headers=headers,
+            timeout=self.timeout,
+        )
+        poll_interval = int(response.headers.get('X-Poll-Interval', 0))
+        if entry and response.status_code == HTTPStatus.NOT_MODIFIED:
+            log.debug('%s not modified, using cached body', path)
+            entry.update(fetched_at=now, poll_interval=poll_interval)
+        else:
+            response.raise_for_status()
+            entry = {
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'fetched_at': now,
+                'poll_interval': poll_interval,
+                'body': response.json(),
+            }
+        write_cache_entry(cache_path, entry)
+        return entry['body']
+
+    def get_cache_path(self, path: str, params: dict | None) -> Path:
+        key = json.dumps([self.token_digest, path, params], sort_keys=True)
+        return self.cache_dir / f'{hashlib.sha256(key.encode()).hexdigest()}.json'
+
+    def is_authenticated(self) -> bool:
+        try:
+            self.get('/user')
+        except requests.RequestException as e:
+            log.debug('GitHub API authentication check failed: %s', e)
+            return False
+        return True
+
+    def get_authenticated_username(self) -> str:
+        return self.get('/user').json()['login']
+
+    def get_user_events(self, username: str, page: int, per_page: int) -> list[dict]:
+        return self.get_json_cached(
+            f'/users/{username}/events',
+            params={'per_page': per_page, 'page': page},
+        )
+
+
+@cache
+def get_github_client() -> GitHubClient | None:
+    """Shared client for the process, or None if no token is available (use `gh`)"""
+    token = get_gh_token()
+    if not token:
+        log.debug('No GitHub token found, falling back to gh CLI')
+        return None
+    cache_dir = get_cache_dir() / 'github'
+    cache_dir.mkdir(exist_ok=True)
+    return GitHubClient(token, cache_dir=cache_dir)
+
+
+def read_cache_entry(cache_path: Path) -> dict | None:
+    try:
+        return json.loads(cache_path.read_text())
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def write_cache_entry(cache_path: Path, entry: dict) -> None:
+    tmp_path = cache_path.with_suffix('.tmp')
+    tmp_path.write_text(json.dumps(entry))
+    tmp_path.chmod(0o600)
+    tmp_path.replace(cache_path)
+
+
+def get_gh_token() -> str | None:
+    """Look up a GitHub token from config, the environment, then `gh auth token`"""
+    config_path = get_config_path()
+    if config_path.exists():
+        token = json.loads(config_path.read_text()).get('gh_token')
+        if token:
+            return token
+
+    for var in ('GH_TOKEN', 'GITHUB_TOKEN'):
+        if os.environ.get(var):
+            return os.environ[var]
+
+    try:
+        result = subprocess.run(
+            ['gh', 'auth', 'token'],
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+    except FileNotFoundError:
+        return None
+    return result.stdout.strip() or None
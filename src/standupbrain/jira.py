@@ -1,48 +1,384 @@
 import logging
 import sys
-from datetime import datetime
-from urllib.parse import urljoin
+import threading
+import time
+from collections.abc import Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import UTC, datetime, timedelta, tzinfo
+from functools import cache
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 import requests
 from requests.auth import HTTPBasicAuth
 
 from standupbrain.jira_init import get_jira_credentials
+from standupbrain.jira_store import JiraStore, SyncState, get_jira_store, get_local_date
+from standupbrain.shared import (
+    CONNECT_TIMEOUT,
+    get_days_between,
+    get_jira_max_issues,
+    make_session,
+)
 
 log = logging.getLogger(__name__)
 
+# Most issues `/search/jql` returns per page when fields are requested
+JIRA_PAGE_SIZE = 100
+# Everything format_activity_for_llm reads, so nothing else is sent
+SEARCH_FIELDS = ('summary', 'status', 'description', 'comment')
+COMMENT_PAGE_SIZE = 100
+COMMENT_FETCH_WORKERS = 4
+JIRA_READ_TIMEOUT = 30
+JIRA_RETRIES = 4
+# Recalls this soon after a sync read the store without asking Jira
+JIRA_SYNC_INTERVAL_SECONDS = 60
 
-def make_jira_activity_summary(date: datetime) -> str:
-    """Entry point function for CLI to get Jira activity summary"""
-    response = get_my_jira_activity(date)
-    return format_activity_for_llm(response, date)
 
+class JiraClient:
+    """Jira Cloud REST client
 
-def get_my_jira_activity(date: datetime) -> dict:
-    """Query current user's Jira activity (requires env vars to be set)"""
+    GETs are retried with exponential backoff on connection errors, rate limits
+    and server errors, waiting as long as a `Retry-After` header asks.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        email: str,
+        api_token: str,
+        timeout: tuple[float, float] = (CONNECT_TIMEOUT, JIRA_READ_TIMEOUT),
+        pool_size: int = 10,
+    ) -> None:
+        self.base_url = base_url.rstrip('/')
+        self.email = email
+        self.timeout = timeout
+        self.request_count = 0
+        self.request_seconds = 0.0
+        self.lock = threading.Lock()
+        self.session = make_session(
+            JIRA_RETRIES,
+            status_forcelist=(429, 500, 502, 503, 504),
+            respect_retry_after=True,
+            pool_maxsize=pool_size,
+        )
+        self.session.auth = HTTPBasicAuth(email, api_token)
+        self.session.headers.update(
+            {
+                'Accept': 'application/json',
+                'Accept-Encoding': 'gzip',
+            },
+        )
+
+    def get(self, path: str, params: dict | None = None) -> requests.Response:
+        start = time.perf_counter()
+        try:
+            response = self.session.get(
+                f'{self.base_url}{path}',
+                params=params,
+                timeout=self.timeout,
+            )
+        finally:
+            elapsed = time.perf_counter() - start
+            with self.lock:
+                self.request_count += 1
+                self.request_seconds += elapsed
+        log.debug(
+            'Jira GET %s: %s in %.2fs, %s bytes',
+            path,
+            response.status_code,
+            elapsed,
+            len(response.content),
+        )
+        response.raise_for_status()
+        return response
+
+
+@cache
+def get_jira_client() -> JiraClient:
+    """Shared client for the process (requires `standupbrain init` first)"""
     credentials = get_jira_credentials()
     if not credentials:
         log.error('Run `standupbrain init` first')
         sys.exit(1)
+    return JiraClient(*credentials)
 
-    base_url, email, api_token = credentials
-    headers = {
-        'Accept': 'application/json',
-        'Content-Type': 'application/json',
+
+def make_jira_activity_summaries(start: datetime, end: datetime) -> dict[str, str]:
+    """Jira activity summaries for each day from `start` to `end`
+
+    The local store is synced first, fetching only what changed, then each day
+    is read from it with an indexed query.
+    """
+    store = get_jira_store()
+    assignee = get_jira_client().email
+    state = sync_jira_store(store, start)
+    timezone = get_timezone(state.timezone)
+    summaries = {
+        day.strftime('%Y-%m-%d'): format_activity_for_llm(
+            {'issues': store.get_issues_active_on(assignee, day.strftime('%Y-%m-%d'))},
+            day,
+            timezone,
+        )
+        for day in get_days_between(start, end)
     }
-    jql = f'assignee = currentUser() AND updated >= "{date.strftime("%Y-%m-%d")}"'
+    client = get_jira_client()
+    log.debug(
+        'Made %s Jira requests in %.2fs',
+        client.request_count,
+        client.request_seconds,
+    )
+    return summaries
+
+
+def sync_jira_store(store: JiraStore, start: datetime) -> SyncState:
+    """Bring the store up to date with activity from `start` until now
+
+    The first sync fetches everything updated since `start`. Later ones fetch
+    only issues updated since the last sync, plus the days before `start` the
+    store doesn't cover yet. Within `JIRA_SYNC_INTERVAL_SECONDS` of the last
+    sync, Jira isn't asked at all. A sync that stopped at `jira_max_issues` or
+    couldn't fetch a comment thread leaves the stored sync state as it was, so
+    the next one asks for the same window again.
+    """
+    assignee = get_jira_client().email
+    state = store.get_sync_state(assignee)
+    since = start.strftime('%Y-%m-%d')
+    now = datetime.now(UTC)
+    if (
+        state
+        and state.covered_from <= since
+        and (now - state.last_sync).total_seconds() < JIRA_SYNC_INTERVAL_SECONDS
+    ):
+        log.debug('Jira store synced at %s, not fetching', state.last_sync)
+        return state
+
+    myself = get_jira_myself()
+    timezone = get_timezone(myself.get('timeZone'))
+    today = now.astimezone(timezone) if timezone else now
+    # (JQL, first and last day to fetch truncated comment threads for)
+    queries = []
+    if state is None:
+        jql = f'assignee = currentUser() AND updated >= "{since}"'
+        queries.append((jql, start, today))
+    else:
+        if since < state.covered_from:
+            covered_from = datetime.strptime(state.covered_from, '%Y-%m-%d')
+            backfill_end = covered_from - timedelta(days=1)
+            jql = make_activity_jql(start, backfill_end, myself.get('accountId'))
+            queries.append((jql, start, backfill_end))
+        changed_since = format_jql_time(state.last_sync, timezone)
+        jql = f'assignee = currentUser() AND updated >= "{changed_since}"'
+        last_sync = (
+            state.last_sync.astimezone(timezone) if timezone else state.last_sync
+        )
+        queries.append((jql, last_sync, today))
+
+    complete = True
+    for jql, comments_start, comments_end in queries:
+        log.debug('Syncing Jira issues matching %s', jql)
+        for issues, capped in iter_jira_issue_pages(jql, get_jira_max_issues()):
+            complete &= complete_comment_threads(
+                issues,
+                comments_start,
+                comments_end,
+                timezone,
+            )
+            complete &= not capped
+            store.put_issues(issues, assignee, timezone)
+
+    if not complete:
+        # Advancing would hide what was missed from every later delta sync
+        log.warning('⚠ Jira sync was incomplete, it will be retried next time')
+        return SyncState(
+            covered_from=since,
+            last_sync=state.last_sync if state else now,
+            timezone=myself.get('timeZone'),
+        )
+    state = SyncState(
+        covered_from=min(since, state.covered_from) if state else since,
+        last_sync=now,
+        timezone=myself.get('timeZone'),
+    )
+    store.set_sync_state(assignee, state)
+    return state
+
+
+def format_jql_time(moment: datetime, timezone: tzinfo | None) -> str:
+    """A JQL time a little before `moment`, in the user's timezone if known
+
+    JQL times have minute precision and are read in the user's timezone, so
+    without it fall back to the whole previous day.
+    """
+    if timezone is None:
+        return (moment - timedelta(days=1)).strftime('%Y-%m-%d')
+    return (
+        (moment - timedelta(minutes=1))
+        .astimezone(timezone)
+        .strftime(
+            '%Y-%m-%d %H:%M',
+        )
+    )
+
+
+def make_activity_jql(start: datetime, end: datetime, account_id: str | None) -> str:
+    """JQL for the current user's issues with activity from `start` to `end`
+
+    Jira reads JQL dates in the user's own timezone. `updated` only holds the
+    latest change, so an issue worked on in the window and touched again since
+    is kept when `account_id` updated it within the window.
+    """
+    since = start.strftime('%Y-%m-%d')
+    until = (end + timedelta(days=1)).strftime('%Y-%m-%d')
+    window = f'updated < "{until}"'
+    if account_id:
+        window = (
+            f'({window} OR issue in updatedBy("{account_id}", "{since}", "{until}"))'
+        )
+    return f'assignee = currentUser() AND updated >= "{since}" AND {window}'
+
+
+@cache
+def get_jira_myself() -> dict:
+    """The authenticated Jira user, including `accountId` and `timeZone`"""
+    return get_jira_client().get('/rest/api/3/myself').json()
+
+
+def get_timezone(name: str | None) -> tzinfo | None:
+    if not name:
+        return None
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        log.debug('Unknown Jira timezone %s, using timestamps as given', name)
+        return None
+
+
+def iter_jira_issue_pages(
+    jql: str,
+    max_issues: int,
+) -> Iterator[tuple[list[dict], bool]]:
+    """Yield pages of the issues matching `jql`, each with whether paging stopped
+    there at `max_issues` with more matches left
+
+    Each page's `nextPageToken` is needed to request the next, so pages can't be
+    fetched in parallel; instead the next page is fetched in the background while
+    the caller stores the current one.
+    """
+    fetched = 0
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        future: Future[dict] | None = executor.submit(search_jira_issues, jql)
+        while future is not None:
+            page = future.result()
+            issues = page.get('issues', [])[: max_issues - fetched]
+            fetched += len(issues)
+            token = page.get('nextPageToken')
+            future = None
+            capped = False
+            if token and not page.get('isLast'):
+                if fetched < max_issues:
+                    future = executor.submit(search_jira_issues, jql, token)
+                else:
+                    capped = True
+                    log.warning(
+                        '⚠ Stopped after %s Jira issues, raise jira_max_issues to '
+                        'include older activity',
+                        max_issues,
+                    )
+            log.debug('Fetched %s Jira issues', fetched)
+            yield issues, capped
+
+
+def search_jira_issues(jql: str, next_page_token: str | None = None) -> dict:
+    """Query one page of issues, with only the fields the formatter reads and
+    their changelog for status transitions
+    """
     params = {
         'jql': jql,
-        'fields': 'summary,description,status,updated,comment',
-        'maxResults': 100,
+        'fields': ','.join(SEARCH_FIELDS),
+        'expand': 'changelog',
+        'maxResults': JIRA_PAGE_SIZE,
     }
-    response = requests.get(
-        urljoin(base_url, '/rest/api/3/search/jql'),
-        headers=headers,
-        params=params,
-        auth=HTTPBasicAuth(email, api_token),
-    )
-    response.raise_for_status()
-    return response.json()
+    if next_page_token:
+        params['nextPageToken'] = next_page_token
+    return get_jira_client().get('/rest/api/3/search/jql', params=params).json()
+
+
+def complete_comment_threads(
+    issues: list[dict],
+    start: datetime,
+    end: datetime,
+    timezone: tzinfo | None,
+) -> bool:
+    """Replace truncated comment threads with their comments from `start` to `end`
+
+    Search results only embed the first page of each issue's comments, so long
+    threads are fetched separately, a few issues at a time. Returns whether every
+    thread could be fetched.
+    """
+    truncated = [issue for issue in issues if is_comment_thread_truncated(issue)]
+    if not truncated:
+        return True
+    complete = True
+    log.debug('Fetching %s truncated Jira comment threads', len(truncated))
+    with ThreadPoolExecutor(max_workers=COMMENT_FETCH_WORKERS) as executor:
+        threads = executor.map(
+            lambda issue: get_issue_comments(issue['key'], start, end, timezone),
+            truncated,
+        )
+        for issue, comments in zip(truncated, threads, strict=True):
+            if comments is None:
+                complete = False
+                continue
+            issue['fields']['comment'] = {
+                'comments': comments,
+                'total': len(comments),
+            }
+    return complete
+
+
+def is_comment_thread_truncated(issue: dict) -> bool:
+    thread = issue['fields'].get('comment') or {}
+    return thread.get('total', 0) > len(thread.get('comments', []))
+
+
+def get_issue_comments(
+    key: str,
+    start: datetime,
+    end: datetime,
+    timezone: tzinfo | None,
+) -> list[dict] | None:
+    """An issue's comments from `start` to `end`, oldest first, or None on error
+
+    Pages are read newest first, stopping at the first comment before `start`.
+    """
+    since, until = start.strftime('%Y-%m-%d'), end.strftime('%Y-%m-%d')
+    comments: list[dict] = []
+    start_at = 0
+    while True:
+        params = {
+            'orderBy': '-created',
+            'startAt': start_at,
+            'maxResults': COMMENT_PAGE_SIZE,
+        }
+        try:
+            page = (
+                get_jira_client()
+                .get(f'/rest/api/3/issue/{key}/comment', params=params)
+                .json()
+            )
+        except requests.RequestException as e:
+            log.warning('⚠ Could not fetch all comments on %s: %s', key, e)
+            return None
+        page_comments = page.get('comments', [])
+        for comment in page_comments:
+            day = get_local_date(comment['created'], timezone)
+            if day < since:
+                return comments[::-1]
+            if day <= until:
+                comments.append(comment)
+        start_at += len(page_comments)
+        if not page_comments or start_at >= page.get('total', 0):
+            return comments[::-1]
 
 
 def extract_text_from_adf(content: list) -> str:
@@ -60,8 +396,17 @@ def extract_text_from_adf(content: list) -> str:
     return ''.join(text_parts)
 
 
-def format_activity_for_llm(data: dict, target_date: datetime) -> str:
-    """Format Jira activity for LLM prompt"""
+def format_activity_for_llm(
+    data: dict,
+    target_date: datetime,
+    timezone: tzinfo | None = None,
+) -> str:
+    """Format Jira activity for LLM prompt
+
+    Issues are included if they were commented on or changed status on
+    `target_date`, matched in `timezone`, the Jira user's, when given; otherwise
+    by the date in their timestamps.
+    """
     target_date = target_date.strftime('%Y-%m-%d')
     issues = data.get('issues', [])
     if not issues:
@@ -78,23 +423,32 @@ def format_activity_for_llm(data: dict, target_date: datetime) -> str:
         status = fields['status']['name']
 
         description = extract_text_from_adf(
-            fields.get('description', {}).get('content', []),
+            (fields.get('description') or {}).get('content', []),
         )
 
         comments_on_date = []
         for comment in fields.get('comment', {}).get('comments', []):
-            created = comment['created'][:10]
-            if created == target_date:
+            if get_local_date(comment['created'], timezone) == target_date:
                 text = extract_text_from_adf(comment['body'].get('content', []))
                 comments_on_date.append(f'  - {text}')
 
-        if comments_on_date:
+        status_changes = [
+            f'  - {item.get("fromString")} -> {item.get("toString")}'
+            for history in (issue.get('changelog') or {}).get('histories', [])
+            if get_local_date(history['created'], timezone) == target_date
+            for item in history.get('items', [])
+            if item.get('field') == 'status'
+        ]
+
+        if comments_on_date or status_changes:
             issue_summary = f'[{key}] {summary}\nStatus: {status}\n'
             if description:
                 issue_summary += f'Description: {description}\n'
+            if status_changes:
+                issue_summary += 'Status changes:\n' + '\n'.join(status_changes) + '\n'
             if comments_on_date:
                 issue_summary += 'Comments:\n' + '\n'.join(comments_on_date)
-            summaries.append(issue_summary)
+            summaries.append(issue_summary.rstrip('\n'))
 
     result = '\n\n'.join(summaries)
     log.debug('Jira summary:\n%s', result)
@@ -0,0 +1,239 @@
+import json
+import logging
+import sqlite3
+import threading
+from dataclasses import dataclass
+from datetime import datetime, tzinfo
+from functools import cache
+from pathlib import Path
+
+from standupbrain.shared import get_cache_dir
+
+log = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS issues (
+    key TEXT PRIMARY KEY,
+    assignee TEXT NOT NULL,
+    summary TEXT NOT NULL,
+    status TEXT NOT NULL,
+    description TEXT
+);
+CREATE INDEX IF NOT EXISTS issues_assignee ON issues (assignee);
+
+CREATE TABLE IF NOT EXISTS comments (
+    id TEXT PRIMARY KEY,
+    issue_key TEXT NOT NULL REFERENCES issues (key),
+    created TEXT NOT NULL,
+    day TEXT NOT NULL,
+    body TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS comments_day ON comments (day, issue_key);
+
+CREATE TABLE IF NOT EXISTS transitions (
+    id TEXT PRIMARY KEY,
+    issue_key TEXT NOT NULL REFERENCES issues (key),
+    created TEXT NOT NULL,
+    day TEXT NOT NULL,
+    from_status TEXT,
+    to_status TEXT
+);
+CREATE INDEX IF NOT EXISTS transitions_day ON transitions (day, issue_key);
+
+CREATE TABLE IF NOT EXISTS sync_state (
+    assignee TEXT PRIMARY KEY,
+    covered_from TEXT NOT NULL,
+    last_sync TEXT NOT NULL,
+    timezone TEXT
+);
+"""
+
+
+@dataclass
+class SyncState:
+    # First day whose activity is fully stored, as YYYY-MM-DD
+    covered_from: str
+    last_sync: datetime
+    timezone: str | None
+
+
+class JiraStore:
+    """SQLite store of Jira issues, their comments and status transitions
+
+    Comments and transitions are indexed by the day they happened in the Jira
+    user's timezone, so a day's activity is one indexed lookup. Issues are kept
+    in the shape the search API returns them, with raw ADF bodies, so they
+    format exactly like freshly fetched ones.
+
+    Syncs only see issues still assigned to the user, so an issue reassigned
+    since stays stored as theirs with its last synced status, and deleted
+    comments are never removed.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.lock = threading.Lock()
+        with self.lock, self.connection:
+            self.connection.executescript(SCHEMA)
+
+    def get_sync_state(self, assignee: str) -> SyncState | None:
+        with self.lock:
+            row = self.connection.execute(
+                'SELECT covered_from, last_sync, timezone FROM sync_state '
+                'WHERE assignee = ?',
+                (assignee,),
+            ).fetchone()
+        if row is None:
+            return None
+        covered_from, last_sync, timezone = row
+        return SyncState(covered_from, datetime.fromisoformat(last_sync), timezone)
+
+    def set_sync_state(self, assignee: str, state: SyncState) -> None:
+        with self.lock, self.connection:
+            self.connection.execute(
+                'INSERT OR REPLACE INTO sync_state VALUES (?, ?, ?, ?)',
+                (
+                    assignee,
+                    state.covered_from,
+                    state.last_sync.isoformat(),
+                    state.timezone,
+                ),
+            )
+
+    def put_issues(
+        self,
+        issues: list[dict],
+        assignee: str,
+        timezone: tzinfo | None,
+    ) -> None:
+        """Add or update issues with their comments and status transitions
+
+        Comments and transitions already stored are kept, since search results
+        may only include the most recent ones.
+        """
+        issue_rows, comment_rows, transition_rows = [], [], []
+        for issue in issues:
+            key, fields = issue['key'], issue['fields']
+            description = fields.get('description')
+            issue_rows.append(
+                (
+                    key,
+                    assignee,
+                    fields['summary'],
+                    fields['status']['name'],
+                    json.dumps(description) if description else None,
+                ),
+            )
+            for comment in (fields.get('comment') or {}).get('comments', []):
+                comment_rows.append(
+                    (
+                        comment['id'],
+                        key,
+                        comment['created'],
+                        get_local_date(comment['created'], timezone),
+                        json.dumps(comment['body']),
+                    ),
+                )
+            for history in (issue.get('changelog') or {}).get('histories', []):
+                transition_rows.extend(
+                    (
+                        f'{history["id"]}:{idx}',
+                        key,
+                        history['created'],
+                        get_local_date(history['created'], timezone),
+                        item.get('fromString'),
+                        item.get('toString'),
+                    )
+                    for idx, item in enumerate(history.get('items', []))
+                    if item.get('field') == 'status'
+                )
+
+        with self.lock, self.connection:
+            self.connection.executemany(
+                'INSERT OR REPLACE INTO issues VALUES (?, ?, ?, ?, ?)',
+                issue_rows,
+            )
+            self.connection.executemany(
+                'INSERT OR REPLACE INTO comments VALUES (?, ?, ?, ?, ?)',
+                comment_rows,
+            )
+            self.connection.executemany(
+                'INSERT OR REPLACE INTO transitions VALUES (?, ?, ?, ?, ?, ?)',
+                transition_rows,
+            )
+        log.debug(
+            'Stored %s Jira issues, %s comments, %s transitions',
+            len(issue_rows),
+            len(comment_rows),
+            len(transition_rows),
+        )
+
+    def get_issues_active_on(self, assignee: str, day: str) -> list[dict]:
+        """Issues with comments or status transitions on `day`, with only those"""
+        with self.lock:
+            issues = self.connection.execute(
+                'SELECT key, summary, status, description FROM issues '
+                'WHERE assignee = ? AND key IN ('
+                'SELECT issue_key FROM comments WHERE day = ? UNION '
+                'SELECT issue_key FROM transitions WHERE day = ?) '
+                'ORDER BY key',
+                (assignee, day, day),
+            ).fetchall()
+            comments = self.connection.execute(
+                'SELECT issue_key, id, created, body FROM comments '
+                'WHERE day = ? ORDER BY created',
+                (day,),
+            ).fetchall()
+            transitions = self.connection.execute(
+                'SELECT issue_key, id, created, from_status, to_status '
+                'FROM transitions WHERE day = ? ORDER BY created',
+                (day,),
+            ).fetchall()
+
+        by_key = {
+            key: {
+                'key': key,
+                'fields': {
+                    'summary': summary,
+                    'status': {'name': status},
+                    'description': json.loads(description) if description else None,
+                    'comment': {'comments': []},
+                },
+                'changelog': {'histories': []},
+            }
+            for key, summary, status, description in issues
+        }
+        for key, comment_id, created, body in comments:
+            if key in by_key:
+                by_key[key]['fields']['comment']['comments'].append(
+                    {'id': comment_id, 'created': created, 'body': json.loads(body)},
+                )
+        for key, transition_id, created, from_status, to_status in transitions:
+            if key in by_key:
+                by_key[key]['changelog']['histories'].append(
+                    {
+                        'id': transition_id,
+                        'created': created,
+                        'items': [
+                            {
+                                'field': 'status',
+                                'fromString': from_status,
+                                'toString': to_status,
+                            },
+                        ],
+                    },
+                )
+        return list(by_key.values())
+
+
+def get_local_date(timestamp: str, timezone: tzinfo | None) -> str:
+    """`YYYY-MM-DD` of a Jira timestamp such as `2025-11-25T10:00:00.000-0500`"""
+    if timezone is None:
+        return timestamp[:10]
+    moment = datetime.strptime(timestamp, '%Y-%m-%dT%H:%M:%S.%f%z')
+    return moment.astimezone(timezone).strftime('%Y-%m-%d')
+
+
+@cache
+def get_jira_store() -> JiraStore:
+    return JiraStore(get_cache_dir() / 'jira.sqlite3')
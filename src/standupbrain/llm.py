@@ -1,7 +1,24 @@
 import logging
-import subprocess
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator
+from functools import cache
 
-from standupbrain.shared import get_ollama_model
+import requests
+
+from standupbrain.backends import LLMBackend
+from standupbrain.commits import RepoCommits
+from standupbrain.ollama import OllamaClient
+from standupbrain.openai_compat import LlamaCppClient, OpenAICompatibleClient
+from standupbrain.shared import (
+    AUTO_MODEL,
+    DEFAULT_OLLAMA_NUM_CTX,
+    get_llm_backend_name,
+    get_llm_model,
+    get_llm_server_settings,
+    get_ollama_keep_alive,
+    get_ollama_num_ctx,
+)
 
 log = logging.getLogger(__name__)
 
@@ -15,20 +32,158 @@ Make each bullet point a high-level overview such as "Changed behavior of X",
 details, keep it broad, human-like, and appropriate for standup.
 """
 
+PARTIAL_PROMPT = """
+You are a helpful assistant that reminds me what I did the prior work
+day for standup purposes. My activity for the day is too long to read at once,
+so I'm including one part of it. List the notable work in this part as short
+notes, one per line. Don't write the standup summary yet, just capture what
+changed and why.
+"""
+
+MERGE_PROMPT = """
+You are a helpful assistant that reminds me what I did the prior work
+day for standup purposes. My activity was too long to read at once, so I'm
+including notes taken on each part of it. I need you to summarize in 3-5 bullet
+points what I did. Make each bullet point a high-level overview such as
+"Changed behavior of X", "tidied Y", "fixed Z", etc. Keep it broad, human-like,
+and appropriate for standup.
+"""
+
+COMBINED_PROMPT = """
+You are a helpful assistant that recaps my work over a stretch of days. I'm
+including a standup summary for each day. I need you to summarize the whole
+period in 3-5 bullet points, merging work that continued across days. Keep it
+broad, human-like, and appropriate for a weekly update.
+"""
+
+
+def create_standup_summary_llm_prompt(
+    jira_summary: str,
+    commits: list[RepoCommits],
+) -> str:
+    return ''.join(iter_standup_summary_llm_prompt(jira_summary, commits))
+
+
+def iter_standup_summary_llm_prompt(
+    jira_summary: str,
+    commits: list[RepoCommits],
+) -> Iterator[str]:
+    """Yield the prompt piece by piece so it can be streamed straight to the model"""
+    yield PROMPT
+    yield '\nHere is a summary of Jira activity:\n'
+    yield jira_summary
+    yield '\n\nHere are the commits for the day:\n'
+    for repo_commits in commits:
+        yield f'Repo: {repo_commits.repo}\n'
+        yield from repo_commits.iter_render()
+        yield '\n\n'
+
+
+def create_combined_summary_llm_prompt(day_summaries: dict[str, str]) -> str:
+    content = COMBINED_PROMPT + '\nHere are the daily summaries:\n'
+    for day, summary in day_summaries.items():
+        content += f'{day}:\n{summary}\n\n'
+    return content
+
+
+def create_partial_summary_llm_prompt(chunk: str) -> str:
+    return PARTIAL_PROMPT + '\nHere is this part of the activity:\n' + chunk
 
-def create_standup_summary_llm_prompt(jira_summary: str, commits: list[dict]) -> str:
-    content = PROMPT + '\nHere is a summary of Jira activity:\n' + jira_summary
-    content += '\n\nHere are the commits for the day:\n'
-    for commit_data in commits:
-        content += f'Repo: {commit_data["repo"]}\n{commit_data["output"]}\n\n'
+
+def create_merged_summary_llm_prompt(notes: list[str]) -> str:
+    content = MERGE_PROMPT + '\nHere are the notes on each part:\n'
+    for idx, note in enumerate(notes, 1):
+        content += f'Part {idx}:\n{note}\n\n'
     return content
 
 
-def prompt_local_llm(prompt: str) -> str:
-    log.debug('Prompting local LLM with string size: %s', len(prompt))
-    result = subprocess.run(
-        ['ollama', 'run', get_ollama_model(), prompt],
-        check=True,
-        capture_output=True,
+@cache
+def get_llm_backend() -> LLMBackend:
+    """The inference server chosen by config `llm_backend`"""
+    name = get_llm_backend_name()
+    base_url, api_key = get_llm_server_settings()
+    if name == 'ollama':
+        return OllamaClient(base_url=base_url, keep_alive=get_ollama_keep_alive())
+    if name == 'openai':
+        return OpenAICompatibleClient(base_url=base_url, api_key=api_key)
+    if name == 'llamacpp':
+        return LlamaCppClient(base_url=base_url, api_key=api_key)
+    msg = f'Unknown llm_backend {name!r}, expected ollama, openai or llamacpp'
+    raise ValueError(msg)
+
+
+@cache
+def get_context_window(model: str) -> int:
+    """Context tokens to budget for: config `ollama_num_ctx`, else the model's own
+    context length, capped at `DEFAULT_OLLAMA_NUM_CTX` for Ollama
+    """
+    if num_ctx := get_ollama_num_ctx():
+        return num_ctx
+    length = get_model_context_length(model)
+    if length and get_llm_backend_name() != 'ollama':
+        # Other servers fix their context when they start, so all of it is usable
+        return length
+    return min(length or DEFAULT_OLLAMA_NUM_CTX, DEFAULT_OLLAMA_NUM_CTX)
+
+
+@cache
+def get_model_context_length(model: str) -> int | None:
+    """The context length the model was trained for, uncapped, if the server says"""
+    try:
+        return get_llm_backend().get_context_length(model)
+    except requests.RequestException:
+        log.debug('Could not look up context length of %s', model, exc_info=True)
+        return None
+
+
+def prompt_local_llm(
+    prompt: str | Iterable[str],
+    on_token: Callable[[str], None] | None = None,
+    model: str | None = None,
+    num_ctx: int | None = None,
+) -> str:
+    """Prompt the local model, streaming tokens to `on_token` as they arrive
+
+    `prompt` may be an iterable of chunks, which is streamed in the request body
+    rather than assembled in memory first. `model` defaults to the configured one
+    and `num_ctx` to its context window.
+    """
+    model = model or get_llm_model()
+    text, stats = get_llm_backend().generate(
+        model,
+        prompt,
+        on_token,
+        options={'num_ctx': num_ctx or get_context_window(model)},
     )
-    return result.stdout.strip().decode()
+    log.debug(
+        'LLM prompt size: %s chars, time to first token: %.2fs, '
+        '%.1f tokens/s, total %.2fs',
+        stats.prompt_chars,
+        stats.time_to_first_token or 0,
+        stats.tokens_per_second or 0,
+        stats.total_seconds,
+    )
+    return text.strip()
+
+
+def warm_up_local_llm() -> threading.Thread:
+    """Start loading the model in the background so it's ready by the first prompt"""
+    thread = threading.Thread(target=preload_local_llm, daemon=True)
+    thread.start()
+    return thread
+
+
+def preload_local_llm() -> None:
+    # Same num_ctx as prompt_local_llm, or Ollama reloads the model to resize it
+    model = get_llm_model()
+    if model == AUTO_MODEL:
+        log.debug('Not preloading, the model is chosen once activity is gathered')
+        return
+    options = {'num_ctx': get_context_window(model)}
+    start = time.perf_counter()
+    try:
+        get_llm_backend().preload(model, options=options)
+    except requests.RequestException as e:
+        log.debug('Preloading %s failed: %s', model, e)
+        return
+    log.debug('Preloaded %s in %.2fs', model, time.perf_counter() - start)
@@ -12,6 +12,8 @@ from standupbrain.shared import get_config_path, get_ollama_model
 log = logging.getLogger(__name__)
 
 
+SIZE_UNITS = {'B': 1, 'KB': 10**3, 'MB': 10**6, 'GB': 10**9, 'TB': 10**12}
+
 POPULAR_MODELS = {
     'llama3.2:3b': 'Fast general-purpose model, great for quick tasks w/ low GBs (4GB)',
     'llama3.3:8b': 'Balanced performance for everyday use, good reasoning (8GB)',
@@ -136,6 +138,11 @@ def get_available_ollama_models() -> list[dict[str, str]]:
 
 
 def get_installed_models() -> set[str]:
+    return set(get_installed_model_sizes())
+
+
+def get_installed_model_sizes() -> dict[str, int]:
+    """Installed models and their size in bytes, from `ollama list`"""
     try:
         result = subprocess.run(
             ['ollama', 'list'],
@@ -143,14 +150,21 @@ def get_installed_models() -> set[str]:
             text=True,
             check=True,
         )
-        installed = set()
-        for line in result.stdout.strip().split('\n')[1:]:
-            parts = line.split()
-            if parts:
-                installed.add(parts[0])
-        return installed
     except subprocess.CalledProcessError:
-        return set()
+        return {}
+    sizes = {}
+    for line in result.stdout.strip().split('\n')[1:]:
+        parts = line.split()
+        if parts:
+            sizes[parts[0]] = parse_size(parts[2:4])
+    return sizes
+
+
+def parse_size(parts: list[str]) -> int:
+    """Bytes from an `ollama list` size such as `2.0 GB` (decimal units)"""
+    if len(parts) < 2 or parts[1] not in SIZE_UNITS:  # noqa: PLR2004
+        return 0
+    return int(float(parts[0]) * SIZE_UNITS[parts[1]])
 
 
 def init_model() -> bool:
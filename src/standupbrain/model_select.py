@@ -0,0 +1,107 @@
+import logging
+from functools import cache
+from pathlib import Path
+
+import requests
+
+from standupbrain.llm import get_llm_backend, get_model_context_length
+from standupbrain.llm_init import get_installed_model_sizes
+from standupbrain.shared import (
+    DEFAULT_OLLAMA_NUM_CTX,
+    get_llm_backend_name,
+    get_ollama_num_ctx,
+)
+
+log = logging.getLogger(__name__)
+
+# Memory needed on top of the weights for the runtime, besides the KV cache
+MEMORY_OVERHEAD = 1.2
+# KV cache per context token when the model's shape is unknown: an fp16 cache
+# for an 8B Llama, more than most small models need
+DEFAULT_KV_CACHE_BYTES_PER_TOKEN = 128 * 1024
+
+
+def choose_model(needed_tokens: int) -> tuple[str, int]:
+    """Smallest installed model that fits in free memory with a context big
+    enough for `needed_tokens`, else the one that fits the most context, with the
+    `num_ctx` to request from it
+
+    A model fits when its weights and the KV cache for at least the default
+    context do. Models are compared by their own context length, capped at what
+    free memory leaves for the KV cache, and the chosen one is asked for as much
+    of that as the prompt needs (config `ollama_num_ctx` still wins). Prompts too
+    big for every model are map-reduced, so a model that fits in memory is always
+    preferred to one that would swap.
+    """
+    if get_llm_backend_name() != 'ollama':
+        msg = 'Automatic model selection needs the ollama backend'
+        raise ValueError(msg)
+    sizes = get_installed_model_sizes()
+    if not sizes:
+        msg = 'No installed Ollama models to choose from, run `standupbrain init`'
+        raise ValueError(msg)
+
+    available = get_available_memory()
+    by_size = sorted(sizes, key=lambda model: (sizes[model], model))
+    contexts = {}
+    for model in by_size:
+        length = get_model_context_length(model) or DEFAULT_OLLAMA_NUM_CTX
+        affordable = get_affordable_context(model, sizes[model], available)
+        if affordable is None:
+            contexts[model] = length
+        elif affordable >= min(length, DEFAULT_OLLAMA_NUM_CTX):
+            contexts[model] = min(length, affordable)
+    if not contexts:
+        # Nothing fits, so the smallest model with a modest context swaps least
+        smallest = by_size[0]
+        length = get_model_context_length(smallest) or DEFAULT_OLLAMA_NUM_CTX
+        contexts[smallest] = min(length, DEFAULT_OLLAMA_NUM_CTX)
+    model = next(
+        (model for model in contexts if contexts[model] >= needed_tokens),
+        max(contexts, key=lambda model: contexts[model]),
+    )
+    num_ctx = get_ollama_num_ctx() or min(
+        contexts[model],
+        max(needed_tokens, DEFAULT_OLLAMA_NUM_CTX),
+    )
+    log.debug(
+        'Chose %s with num_ctx %s for ~%s tokens with %s bytes of memory available',
+        model,
+        num_ctx,
+        needed_tokens,
+        available,
+    )
+    return model, num_ctx
+
+
+def get_affordable_context(model: str, size: int, available: int | None) -> int | None:
+    """Context tokens whose KV cache fits in free memory beside the model's
+    weights, or None if free memory is unknown
+    """
+    if available is None:
+        return None
+    spare = available - size * MEMORY_OVERHEAD
+    return max(int(spare // get_model_kv_cache_bytes_per_token(model)), 0)
+
+
+@cache
+def get_model_kv_cache_bytes_per_token(model: str) -> int:
+    """KV cache each context token of `model` takes, per Ollama or a safe guess"""
+    try:
+        per_token = get_llm_backend().get_kv_cache_bytes_per_token(model)
+    except requests.RequestException:
+        log.debug('Could not look up the shape of %s', model, exc_info=True)
+        per_token = None
+    return per_token or DEFAULT_KV_CACHE_BYTES_PER_TOKEN
+
+
+def get_available_memory(meminfo: Path = Path('/proc/meminfo')) -> int | None:
+    """Memory available without swapping (`MemAvailable`), in bytes, if known"""
+    try:
+        lines = meminfo.read_text().splitlines()
+    except OSError:
+        return None
+    for line in lines:
+        if line.startswith('MemAvailable:'):
+            return int(line.split()[1]) * 1024
+    return None
@@ -0,0 +1,212 @@
+import json
+import logging
+import os
+import time
+from collections.abc import Callable, Iterable, Iterator
+from functools import cache
+
+import requests
+
+from standupbrain.backends import (
+    READ_TIMEOUT,
+    RETRIES,
+    GenerationStats,
+    LLMError,
+    iter_json_string,
+)
+from standupbrain.shared import (
+    CONNECT_TIMEOUT,
+    DEFAULT_OLLAMA_KEEP_ALIVE,
+    get_ollama_keep_alive,
+    make_session,
+)
+
+log = logging.getLogger(__name__)
+
+OLLAMA_URL = 'http://127.0.0.1:11434'
+
+
+class OllamaClient:
+    """Client for Ollama's local HTTP API over one pooled, keep-alive session"""
+
+    def __init__(
+        self,
+        base_url: str | None = None,
+        keep_alive: str = DEFAULT_OLLAMA_KEEP_ALIVE,
+    ) -> None:
+        self.base_url = (base_url or get_ollama_url()).rstrip('/')
+        self.keep_alive = keep_alive
+        self.session = make_session(RETRIES, pool_maxsize=4)
+
+    def generate(
+        self,
+        model: str,
+        prompt: str | Iterable[str],
+        on_token: Callable[[str], None] | None = None,
+        options: dict | None = None,
+    ) -> tuple[str, GenerationStats]:
+        """Stream a completion, calling `on_token` with each piece as it arrives
+
+        A prompt given as an iterable of chunks is JSON-encoded chunk by chunk
+        into a chunked request body, so it is never held in memory whole.
+        """
+        stats = GenerationStats()
+        tokens = []
+        start = time.perf_counter()
+        with self.session.post(
+            f'{self.base_url}/api/generate',
+            data=self.iter_generate_body(model, prompt, stats, options),
+            headers={'Content-Type': 'application/json'},
+            stream=True,
+            timeout=(CONNECT_TIMEOUT, READ_TIMEOUT),
+        ) as response:
+            raise_for_ollama_error(response)
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                chunk = json.loads(line)
+                if 'error' in chunk:
+                    raise OllamaError(chunk['error'])
+                token = chunk.get('response', '')
+                if token:
+                    if stats.time_to_first_token is None:
+                        stats.time_to_first_token = time.perf_counter() - start
+                    tokens.append(token)
+                    if on_token:
+                        on_token(token)
+                if chunk.get('done'):
+                    update_stats(stats, chunk)
+
+        stats.total_seconds = time.perf_counter() - start
+        return ''.join(tokens), stats
+
+    def iter_generate_body(
+        self,
+        model: str,
+        prompt: str | Iterable[str],
+        stats: GenerationStats,
+        options: dict | None = None,
+    ) -> Iterator[bytes]:
+        body = {'model': model, 'stream': True, 'keep_alive': self.keep_alive}
+        if options:
+            body['options'] = options
+        yield json.dumps(body)[:-1].encode() + b', "prompt": "'
+        yield from iter_json_string(prompt, stats)
+        yield b'"}'
+
+    def preload(self, model: str, options: dict | None = None) -> None:
+        """Load the model into memory without generating, keeping it for `keep_alive`"""
+        body = {'model': model, 'keep_alive': self.keep_alive}
+        if options:
+            body['options'] = options
+        response = self.session.post(
+            f'{self.base_url}/api/generate',
+            json=body,
+            timeout=(CONNECT_TIMEOUT, READ_TIMEOUT),
+        )
+        raise_for_ollama_error(response)
+
+    def unload(self, model: str) -> None:
+        """Evict the model from memory now rather than after `keep_alive`"""
+        response = self.session.post(
+            f'{self.base_url}/api/generate',
+            json={'model': model, 'keep_alive': 0},
+            timeout=(CONNECT_TIMEOUT, READ_TIMEOUT),
+        )
+        raise_for_ollama_error(response)
+
+    def list_models(self) -> list[str]:
+        """Names of the models installed locally"""
+        response = self.session.get(
+            f'{self.base_url}/api/tags',
+            timeout=(CONNECT_TIMEOUT, 30),
+        )
+        raise_for_ollama_error(response)
+        return [model['name'] for model in response.json().get('models', [])]
+
+    def get_context_length(self, model: str) -> int | None:
+        return get_context_length(self.show(model))
+
+    def get_kv_cache_bytes_per_token(self, model: str) -> int | None:
+        return get_kv_cache_bytes_per_token(self.show(model))
+
+    def show(self, model: str) -> dict:
+        """Model details, including `model_info` with its context length and shape"""
+        response = self.session.post(
+            f'{self.base_url}/api/show',
+            json={'model': model},
+            timeout=(CONNECT_TIMEOUT, 30),
+        )
+        raise_for_ollama_error(response)
+        return response.json()
+
+
+class OllamaError(LLMError):
+    pass
+
+
+def raise_for_ollama_error(response: requests.Response) -> None:
+    """Raise Ollama's own message from the `{"error": ...}` body of a failed request"""
+    if response.ok:
+        return
+    try:
+        message = response.json().get('error')
+    except ValueError:
+        message = None
+    if not message:
+        response.raise_for_status()
+    raise OllamaError(message)
+
+
+def update_stats(stats: GenerationStats, final_chunk: dict) -> None:
+    """Fill in server-side timings from the final `done` chunk (nanoseconds)"""
+    if 'load_duration' in final_chunk:
+        stats.load_seconds = final_chunk['load_duration'] / 1e9
+    stats.eval_count = final_chunk.get('eval_count', 0)
+    eval_duration = final_chunk.get('eval_duration')
+    if stats.eval_count and eval_duration:
+        stats.tokens_per_second = stats.eval_count / (eval_duration / 1e9)
+
+
+def get_context_length(details: dict) -> int | None:
+    """Trained context length from `/api/show`, keyed by architecture"""
+    for key, value in details.get('model_info', {}).items():
+        if key.endswith('.context_length'):
+            return value
+    return None
+
+
+def get_kv_cache_bytes_per_token(details: dict) -> int | None:
+    """Bytes of fp16 KV cache each context token takes, from the model's shape in
+    `/api/show`, if it reports one
+    """
+    info = details.get('model_info', {})
+    arch = info.get('general.architecture')
+    try:
+        layers = info[f'{arch}.block_count']
+        heads = info[f'{arch}.attention.head_count']
+        kv_heads = info.get(f'{arch}.attention.head_count_kv', heads)
+        head_dim = (
+            info.get(f'{arch}.attention.key_length')
+            or info[f'{arch}.embedding_length'] // heads
+        )
+    except (KeyError, TypeError, ZeroDivisionError):
+        return None
+    if isinstance(kv_heads, list):
+        # Some architectures vary it per layer
+        kv_heads = max(kv_heads)
+    # A key and a value per layer and KV head, two bytes per element
+    return layers * kv_heads * head_dim * 2 * 2
+
+
+def get_ollama_url() -> str:
+    """Honor `OLLAMA_HOST` like the ollama CLI does, e.g. `0.0.0.0:11434`"""
+    host = os.environ.get('OLLAMA_HOST')
+    if not host:
+        return OLLAMA_URL
+    return host if '://' in host else f'http://{host}'
+
+
+@cache
+def get_ollama_client() -> OllamaClient:
+    return OllamaClient(keep_alive=get_ollama_keep_alive())
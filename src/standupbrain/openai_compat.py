@@ -0,0 +1,158 @@
+import json
+import logging
+import time
+from collections.abc import Callable, Iterable, Iterator
+
+import requests
+
+from standupbrain.backends import (
+    READ_TIMEOUT,
+    RETRIES,
+    GenerationStats,
+    LLMError,
+    iter_json_string,
+)
+from standupbrain.shared import CONNECT_TIMEOUT, make_session
+
+log = logging.getLogger(__name__)
+
+# Default ports of `vllm serve` and llama.cpp's `llama-server`
+OPENAI_COMPATIBLE_URL = 'http://127.0.0.1:8000'
+LLAMA_CPP_URL = 'http://127.0.0.1:8080'
+
+
+class OpenAICompatibleClient:
+    """Client for OpenAI-compatible local servers such as vLLM, via chat completions"""
+
+    def __init__(
+        self,
+        base_url: str | None = None,
+        api_key: str | None = None,
+    ) -> None:
+        base_url = (base_url or OPENAI_COMPATIBLE_URL).rstrip('/')
+        self.base_url = base_url.removesuffix('/v1')
+        self.session = make_session(RETRIES, pool_maxsize=4)
+        if api_key:
+            self.session.headers['Authorization'] = f'Bearer {api_key}'
+
+    def generate(
+        self,
+        model: str,
+        prompt: str | Iterable[str],
+        on_token: Callable[[str], None] | None = None,
+        options: dict | None = None,  # noqa: ARG002
+    ) -> tuple[str, GenerationStats]:
+        """Stream a completion, calling `on_token` with each piece as it arrives
+
+        `options` are Ollama model options; these servers fix the context size
+        and other load-time settings when they start, so they are ignored.
+        """
+        stats = GenerationStats()
+        tokens = []
+        start = time.perf_counter()
+        with self.session.post(
+            f'{self.base_url}/v1/chat/completions',
+            data=self.iter_chat_body(model, prompt, stats),
+            headers={'Content-Type': 'application/json'},
+            stream=True,
+            timeout=(CONNECT_TIMEOUT, READ_TIMEOUT),
+        ) as response:
+            response.raise_for_status()
+            for chunk in iter_sse_chunks(response):
+                token = ''.join(
+                    (choice.get('delta') or {}).get('content') or ''
+                    for choice in chunk.get('choices', [])
+                )
+                if token:
+                    if stats.time_to_first_token is None:
+                        stats.time_to_first_token = time.perf_counter() - start
+                    tokens.append(token)
+                    if on_token:
+                        on_token(token)
+                update_stats(stats, chunk)
+
+        stats.total_seconds = time.perf_counter() - start
+        if stats.tokens_per_second is None and stats.eval_count:
+            generating = stats.total_seconds - (stats.time_to_first_token or 0)
+            if generating > 0:
+                stats.tokens_per_second = stats.eval_count / generating
+        return ''.join(tokens), stats
+
+    def iter_chat_body(
+        self,
+        model: str,
+        prompt: str | Iterable[str],
+        stats: GenerationStats,
+    ) -> Iterator[bytes]:
+        body = {
+            'model': model,
+            'stream': True,
+            'stream_options': {'include_usage': True},
+        }
+        yield json.dumps(body)[:-1].encode() + b', "messages": [{"role": "user", '
+        yield b'"content": "'
+        yield from iter_json_string(prompt, stats)
+        yield b'"}]}'
+
+    def preload(self, model: str, options: dict | None = None) -> None:
+        """Nothing to do, these servers load their model when they start"""
+
+    def get_context_length(self, model: str) -> int | None:
+        """Context length from `/v1/models`, which vLLM reports as `max_model_len`"""
+        response = self.session.get(
+            f'{self.base_url}/v1/models',
+            timeout=(CONNECT_TIMEOUT, 30),
+        )
+        response.raise_for_status()
+        for entry in response.json().get('data', []):
+            if entry.get('id') == model:
+                return entry.get('max_model_len')
+        return None
+
+
+class LlamaCppClient(OpenAICompatibleClient):
+    """Client for llama.cpp's `llama-server`, which serves a single model"""
+
+    def __init__(
+        self,
+        base_url: str | None = None,
+        api_key: str | None = None,
+    ) -> None:
+        super().__init__(base_url or LLAMA_CPP_URL, api_key)
+
+    def get_context_length(self, model: str) -> int | None:  # noqa: ARG002
+        """Per-slot context size from `/props`, whatever model name was asked for"""
+        response = self.session.get(
+            f'{self.base_url}/props',
+            timeout=(CONNECT_TIMEOUT, 30),
+        )
+        response.raise_for_status()
+        props = response.json()
+        settings = props.get('default_generation_settings', {})
+        return settings.get('n_ctx') or props.get('n_ctx')
+
+
+def iter_sse_chunks(response: requests.Response) -> Iterator[dict]:
+    """Decode the `data:` events of a server-sent event stream until `[DONE]`"""
+    for line in response.iter_lines():
+        if not line.startswith(b'data:'):
+            continue
+        data = line.removeprefix(b'data:').strip()
+        if data == b'[DONE]':
+            return
+        chunk = json.loads(data)
+        if 'error' in chunk:
+            error = chunk['error']
+            message = error.get('message', error) if isinstance(error, dict) else error
+            raise LLMError(message)
+        yield chunk
+
+
+def update_stats(stats: GenerationStats, chunk: dict) -> None:
+    """Token counts from `usage`, and llama.cpp's own `timings` when present"""
+    usage = chunk.get('usage') or {}
+    if usage.get('completion_tokens'):
+        stats.eval_count = usage['completion_tokens']
+    timings = chunk.get('timings') or {}
+    if timings.get('predicted_per_second'):
+        stats.tokens_per_second = timings['predicted_per_second']
@@ -0,0 +1,182 @@
+import json
+import logging
+import re
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from standupbrain.shared import get_cache_dir, get_repo_roots, get_repo_scan_depth
+
+log = logging.getLogger(__name__)
+
+INDEX_VERSION = 2
+SKIPPED_DIRS = {'node_modules', '__pycache__', 'venv'}
+REMOTE_URL_PATTERN = re.compile(r'[:/](?P<owner>[^/:]+)/(?P<name>[^/]+?)(?:\.git)?/?$')
+
+
+@dataclass
+class RepoIndex:
+    """Local git checkouts keyed by the `owner/name` of their origin remote
+
+    `mtimes` records the directories scanned for checkouts and each checkout's
+    git config and `.gitmodules`, so a clone, removal, remote or submodule change
+    under the roots invalidates it. Working trees aren't walked or recorded, so
+    editing files in a checkout leaves the index fresh.
+    """
+
+    roots: list[str]
+    depth: int
+    repos: dict[str, list[str]] = field(default_factory=dict)
+    unkeyed: dict[str, list[str]] = field(default_factory=dict)
+    mtimes: dict[str, float] = field(default_factory=dict)
+    version: int = INDEX_VERSION
+
+    def lookup(self, full_name: str) -> list[Path]:
+        """Checkouts of a GitHub repo, falling back to origin-less dirs by name"""
+        paths = self.repos.get(full_name.lower())
+        if paths is None:
+            paths = self.unkeyed.get(full_name.rpartition('/')[2], [])
+        return [Path(path) for path in paths]
+
+    def is_stale(self, roots: list[Path], depth: int) -> bool:
+        if self.version != INDEX_VERSION or self.depth != depth:
+            return True
+        if self.roots != [str(root) for root in roots]:
+            return True
+        for path, mtime in self.mtimes.items():
+            try:
+                if Path(path).stat().st_mtime != mtime:
+                    return True
+            except FileNotFoundError:
+                return True
+        return False
+
+
+def get_repo_index() -> RepoIndex:
+    """Load the cached repo index, rebuilding it if anything on disk changed"""
+    roots = get_repo_roots()
+    depth = get_repo_scan_depth()
+    index_path = get_cache_dir() / 'repo_index.json'
+
+    index = load_repo_index(index_path)
+    if index and not index.is_stale(roots, depth):
+        log.debug('Using cached repo index with %d repos', len(index.repos))
+        return index
+
+    start = time.perf_counter()
+    index = build_repo_index(roots, depth)
+    log.debug(
+        'Built repo index with %d repos in %.3fs',
+        len(index.repos) + len(index.unkeyed),
+        time.perf_counter() - start,
+    )
+    index_path.write_text(json.dumps(asdict(index)))
+    return index
+
+
+def load_repo_index(index_path: Path) -> RepoIndex | None:
+    try:
+        return RepoIndex(**json.loads(index_path.read_text()))
+    except (FileNotFoundError, json.JSONDecodeError, TypeError):
+        return None
+
+
+def build_repo_index(roots: list[Path], depth: int) -> RepoIndex:
+    index = RepoIndex(roots=[str(root) for root in roots], depth=depth)
+    for root in roots:
+        scan_dir(index, root, depth)
+    return index
+
+
+def scan_dir(index: RepoIndex, directory: Path, depth: int) -> None:
+    try:
+        mtime = directory.stat().st_mtime
+        entries = list(directory.iterdir())
+    except (FileNotFoundError, NotADirectoryError, PermissionError):
+        log.debug('Skipping unreadable directory %s', directory)
+        return
+
+    if any(entry.name == '.git' for entry in entries):
+        add_repo(index, directory)
+        return
+    index.mtimes[str(directory)] = mtime
+
+    if depth <= 0:
+        return
+    for entry in entries:
+        if entry.name.startswith('.') or entry.name in SKIPPED_DIRS:
+            continue
+        if entry.is_dir() and not entry.is_symlink():
+            scan_dir(index, entry, depth - 1)
+
+
+def add_repo(index: RepoIndex, repo: Path) -> None:
+    config_path = get_git_config_path(repo)
+    remote_url = None
+    if config_path:
+        index.mtimes[str(config_path)] = config_path.stat().st_mtime
+        remote_url = read_origin_url(config_path)
+
+    full_name = parse_remote_full_name(remote_url) if remote_url else None
+    if full_name:
+        index.repos.setdefault(full_name, []).append(str(repo))
+    else:
+        index.unkeyed.setdefault(repo.name, []).append(str(repo))
+    add_submodules(index, repo)
+
+
+def add_submodules(index: RepoIndex, repo: Path) -> None:
+    """Index the checked out submodules listed in the repo's `.gitmodules`"""
+    gitmodules = repo / '.gitmodules'
+    try:
+        index.mtimes[str(gitmodules)] = gitmodules.stat().st_mtime
+        paths = read_submodule_paths(gitmodules)
+    except FileNotFoundError:
+        return
+    for path in paths:
+        submodule = repo / path
+        if (submodule / '.git').exists():
+            add_repo(index, submodule)
+
+
+def get_git_config_path(repo: Path) -> Path | None:
+    """Find the config for a checkout, following `.git` files of worktrees"""
+    git_path = repo / '.git'
+    if git_path.is_file():
+        gitdir = git_path.read_text().removeprefix('gitdir:').strip()
+        git_path = (repo / gitdir).resolve()
+        commondir = git_path / 'commondir'
+        if commondir.exists():
+            git_path = (git_path / commondir.read_text().strip()).resolve()
+    config_path = git_path / 'config'
+    return config_path if config_path.exists() else None
+
+
+def read_origin_url(config_path: Path) -> str | None:
+    in_origin = False
+    for raw_line in config_path.read_text(errors='replace').splitlines():
+        line = raw_line.strip()
+        if line.startswith('['):
+            in_origin = line.replace(' ', '') == '[remote"origin"]'
+        elif in_origin and line.startswith('url'):
+            key, _, value = line.partition('=')
+            if key.strip() == 'url':
+                return value.strip()
+    return None
+
+
+def read_submodule_paths(gitmodules: Path) -> list[str]:
+    paths = []
+    for raw_line in gitmodules.read_text(errors='replace').splitlines():
+        key, _, value = raw_line.strip().partition('=')
+        if key.strip() == 'path':
+            paths.append(value.strip())
+    return paths
+
+
+def parse_remote_full_name(remote_url: str) -> str | None:
+    """`git@github.com:owner/name.git` and friends -> `owner/name`"""
+    match = REMOTE_URL_PATTERN.search(remote_url)
+    if not match:
+        return None
+    return f'{match["owner"]}/{match["name"]}'.lower()
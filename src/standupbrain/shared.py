@@ -1,7 +1,58 @@
 import datetime
 import json
+import os
+from collections.abc import Collection
 from pathlib import Path
 
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Model setting that picks an installed model per prompt
+AUTO_MODEL = 'auto'
+DEFAULT_LLM_BACKEND = 'ollama'
+DEFAULT_OLLAMA_KEEP_ALIVE = '10m'
+DEFAULT_REPO_SCAN_DEPTH = 3
+# Ollama only allocates a small context unless asked; cap what we request so
+# models trained on 128K tokens don't try to allocate it all
+DEFAULT_OLLAMA_NUM_CTX = 8192
+DEFAULT_SUMMARY_CACHE_MAX_BYTES = 5_000_000
+DEFAULT_JIRA_MAX_ISSUES = 1000
+CONNECT_TIMEOUT = 5
+RETRY_BACKOFF_SECONDS = 0.5
+
+
+def make_session(
+    retries: int,
+    status_forcelist: Collection[int] = (502, 503, 504),
+    allowed_methods: Collection[str] = ('GET',),
+    *,
+    respect_retry_after: bool = False,
+    pool_maxsize: int = 10,
+) -> requests.Session:
+    """Pooled keep-alive session that retries with exponential backoff
+
+    Failed connections are safe to retry for any request since nothing was sent;
+    read errors and `status_forcelist` responses only for `allowed_methods`.
+    """
+    retry = Retry(
+        total=retries,
+        status_forcelist=status_forcelist,
+        allowed_methods=frozenset(allowed_methods),
+        backoff_factor=RETRY_BACKOFF_SECONDS,
+        respect_retry_after_header=respect_retry_after,
+        raise_on_status=False,
+    )
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=pool_maxsize,
+        max_retries=retry,
+    )
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
 
 def get_config_path() -> Path:
     config_dir = Path.home() / '.config' / 'standupbrain'
@@ -9,6 +60,13 @@ def get_config_path() -> Path:
     return config_dir / 'credentials.json'
 
 
+def get_cache_dir() -> Path:
+    cache_home = os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache'
+    cache_dir = Path(cache_home) / 'standupbrain'
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    return cache_dir
+
+
 def get_ollama_model() -> dict | None:
     config_path = get_config_path()
     if not config_path.exists():
@@ -17,9 +75,98 @@ def get_ollama_model() -> dict | None:
     return data.get('ollama_model', 'llama3.2:3b')
 
 
+def get_llm_backend_name() -> str:
+    """Which inference server to use (config `llm_backend`)"""
+    config_path = get_config_path()
+    if not config_path.exists():
+        return DEFAULT_LLM_BACKEND
+    data = json.loads(config_path.read_text())
+    return data.get('llm_backend', DEFAULT_LLM_BACKEND)
+
+
+def get_llm_model() -> str | None:
+    """Model to prompt (config `llm_model`), else the Ollama model"""
+    config_path = get_config_path()
+    if config_path.exists():
+        model = json.loads(config_path.read_text()).get('llm_model')
+        if model:
+            return model
+    return get_ollama_model()
+
+
+def get_llm_server_settings() -> tuple[str | None, str | None]:
+    """Config `llm_base_url` and `llm_api_key`, for servers not on their default port"""
+    config_path = get_config_path()
+    if not config_path.exists():
+        return None, None
+    data = json.loads(config_path.read_text())
+    return data.get('llm_base_url'), data.get('llm_api_key')
+
+
+def get_ollama_keep_alive() -> str:
+    """How long Ollama keeps the model loaded after a request"""
+    config_path = get_config_path()
+    if not config_path.exists():
+        return DEFAULT_OLLAMA_KEEP_ALIVE
+    data = json.loads(config_path.read_text())
+    return data.get('ollama_keep_alive', DEFAULT_OLLAMA_KEEP_ALIVE)
+
+
+def get_ollama_num_ctx() -> int | None:
+    """Context window to request from Ollama (config `ollama_num_ctx`), if set"""
+    config_path = get_config_path()
+    if not config_path.exists():
+        return None
+    return json.loads(config_path.read_text()).get('ollama_num_ctx')
+
+
+def get_summary_cache_max_bytes() -> int:
+    """Size bound for cached LLM summaries on disk"""
+    config_path = get_config_path()
+    if not config_path.exists():
+        return DEFAULT_SUMMARY_CACHE_MAX_BYTES
+    data = json.loads(config_path.read_text())
+    return data.get('summary_cache_max_bytes', DEFAULT_SUMMARY_CACHE_MAX_BYTES)
+
+
+def get_jira_max_issues() -> int:
+    """Most Jira issues to page through for one recall"""
+    config_path = get_config_path()
+    if not config_path.exists():
+        return DEFAULT_JIRA_MAX_ISSUES
+    data = json.loads(config_path.read_text())
+    return data.get('jira_max_issues', DEFAULT_JIRA_MAX_ISSUES)
+
+
+def get_repo_roots() -> list[Path]:
+    """Directories to search for local checkouts (config `repo_roots`)"""
+    config_path = get_config_path()
+    roots = ['~/projects']
+    if config_path.exists():
+        roots = json.loads(config_path.read_text()).get('repo_roots', roots)
+    return [Path(root).expanduser() for root in roots]
+
+
+def get_repo_scan_depth() -> int:
+    """How many directory levels below each root to look for checkouts"""
+    config_path = get_config_path()
+    if not config_path.exists():
+        return DEFAULT_REPO_SCAN_DEPTH
+    data = json.loads(config_path.read_text())
+    return data.get('repo_scan_depth', DEFAULT_REPO_SCAN_DEPTH)
+
+
 def get_previous_workday() -> datetime:
     """Get date of prior workday (weekends considered non workdays)"""
     today = datetime.datetime.now()
     if today.weekday() == 0:
         return today - datetime.timedelta(days=3)
     return today - datetime.timedelta(days=1)
+
+
+def get_days_between(start: datetime, end: datetime) -> list[datetime]:
+    """Every day from `start` to `end`, inclusive"""
+    return [
+        start + datetime.timedelta(days=offset)
+        for offset in range((end.date() - start.date()).days + 1)
+    ]
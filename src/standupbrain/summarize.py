@@ -0,0 +1,248 @@
+import logging
+from collections.abc import Callable, Iterable, Iterator
+
+from standupbrain.commits import RepoCommits
+from standupbrain.llm import (
+    COMBINED_PROMPT,
+    MERGE_PROMPT,
+    PARTIAL_PROMPT,
+    PROMPT,
+    create_combined_summary_llm_prompt,
+    create_merged_summary_llm_prompt,
+    create_partial_summary_llm_prompt,
+    get_context_window,
+    iter_standup_summary_llm_prompt,
+    prompt_local_llm,
+)
+from standupbrain.model_select import choose_model
+from standupbrain.shared import AUTO_MODEL, get_llm_model
+from standupbrain.summary_cache import get_summary_cache, make_summary_key
+
+log = logging.getLogger(__name__)
+
+# Rough average for English prose and code across common tokenizers
+CHARS_PER_TOKEN = 4
+# Context left free for the model's reply and the prompt's section headings
+RESPONSE_TOKENS = 1024
+PROMPT_OVERHEAD_TOKENS = 64
+MIN_CHUNK_TOKENS = 256
+
+
+def estimate_tokens(text: str) -> int:
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def get_chunk_budget(num_ctx: int) -> int:
+    """Tokens of activity that fit in one prompt alongside instructions and reply"""
+    instructions = max(PROMPT, PARTIAL_PROMPT, MERGE_PROMPT, key=len)
+    budget = (
+        num_ctx
+        - RESPONSE_TOKENS
+        - PROMPT_OVERHEAD_TOKENS
+        - estimate_tokens(instructions)
+    )
+    return max(budget, MIN_CHUNK_TOKENS)
+
+
+def summarize_activity(
+    jira_summary: str,
+    commits: list[RepoCommits],
+    on_token: Callable[[str], None] | None = None,
+    *,
+    use_cache: bool = True,
+) -> str:
+    """Summarize a day's activity, map-reducing over context-sized chunks when it
+    would not fit in the model's context in one prompt
+    """
+    units = iter_activity_units(jira_summary, commits)
+    overhead = RESPONSE_TOKENS + PROMPT_OVERHEAD_TOKENS + estimate_tokens(PROMPT)
+    needed_tokens = sum(map(estimate_tokens, units)) + overhead
+    model, num_ctx = resolve_model(get_llm_model(), needed_tokens)
+    return get_cached_summary(
+        model,
+        num_ctx,
+        (PROMPT, PARTIAL_PROMPT, MERGE_PROMPT),
+        lambda: iter_standup_summary_llm_prompt(jira_summary, commits),
+        lambda: map_reduce_activity(
+            jira_summary,
+            commits,
+            model=model,
+            num_ctx=num_ctx,
+            on_token=on_token,
+        ),
+        on_token=on_token,
+        use_cache=use_cache,
+    )
+
+
+def summarize_period(
+    day_summaries: dict[str, str],
+    on_token: Callable[[str], None] | None = None,
+    *,
+    use_cache: bool = True,
+) -> str:
+    """Combine daily summaries into one recap of the whole period"""
+    prompt = create_combined_summary_llm_prompt(day_summaries)
+    needed_tokens = estimate_tokens(prompt) + RESPONSE_TOKENS
+    model, num_ctx = resolve_model(get_llm_model(), needed_tokens)
+    return get_cached_summary(
+        model,
+        num_ctx,
+        (COMBINED_PROMPT,),
+        lambda: [prompt],
+        lambda: prompt_local_llm(
+            prompt,
+            on_token=on_token,
+            model=model,
+            num_ctx=num_ctx,
+        ),
+        on_token=on_token,
+        use_cache=use_cache,
+    )
+
+
+def resolve_model(model: str, needed_tokens: int) -> tuple[str, int]:
+    """The configured model and its context window, or for `auto` the best
+    installed model for the prompt and the context to give it
+    """
+    if model == AUTO_MODEL:
+        return choose_model(needed_tokens)
+    return model, get_context_window(model)
+
+
+def get_cached_summary(
+    model: str,
+    num_ctx: int,
+    templates: Iterable[str],
+    content: Callable[[], Iterable[str]],
+    summarize: Callable[[], str],
+    *,
+    on_token: Callable[[str], None] | None,
+    use_cache: bool,
+) -> str:
+    """Return the cached summary for this model, context window, templates and
+    content, else generate it with `summarize` and cache the result
+    """
+    if not use_cache:
+        return summarize()
+
+    summary_cache = get_summary_cache()
+    key = make_summary_key(model, num_ctx, templates, content())
+    summary = summary_cache.get(key)
+    if summary is not None:
+        log.debug('Using cached summary %s', key[:12])
+        if on_token:
+            on_token(summary)
+        return summary
+
+    summary = summarize()
+    summary_cache.put(key, summary)
+    return summary
+
+
+def map_reduce_activity(
+    jira_summary: str,
+    commits: list[RepoCommits],
+    *,
+    model: str,
+    num_ctx: int,
+    on_token: Callable[[str], None] | None = None,
+) -> str:
+    units = list(iter_activity_units(jira_summary, commits))
+    total = sum(map(estimate_tokens, units))
+    budget = get_chunk_budget(num_ctx)
+    if total <= budget:
+        prompt = iter_standup_summary_llm_prompt(jira_summary, commits)
+        return prompt_local_llm(
+            prompt,
+            on_token=on_token,
+            model=model,
+            num_ctx=num_ctx,
+        )
+
+    chunks = pack_chunks(units, budget)
+    log.info(
+        'Activity is ~%s tokens, over the %s token budget of %s; '
+        'summarizing it in %s parts',
+        total,
+        budget,
+        model,
+        len(chunks),
+    )
+    notes = summarize_chunks(chunks, model, num_ctx)
+    return merge_partial_summaries(notes, budget, model, num_ctx, on_token)
+
+
+def summarize_chunks(chunks: list[str], model: str, num_ctx: int) -> list[str]:
+    notes = []
+    for idx, chunk in enumerate(chunks, 1):
+        log.debug('Summarizing part %s of %s', idx, len(chunks))
+        prompt = create_partial_summary_llm_prompt(chunk)
+        notes.append(prompt_local_llm(prompt, model=model, num_ctx=num_ctx))
+    return notes
+
+
+def merge_partial_summaries(
+    notes: list[str],
+    budget: int,
+    model: str,
+    num_ctx: int,
+    on_token: Callable[[str], None] | None = None,
+) -> str:
+    """Reduce partial summaries into one, condensing groups of them first while
+    they are still too long for a single prompt
+    """
+    while len(notes) > 1 and sum(map(estimate_tokens, notes)) > budget:
+        groups = pack_chunks(notes, budget)
+        if len(groups) >= len(notes):
+            log.debug('Partial summaries cannot be condensed further')
+            break
+        notes = summarize_chunks(groups, model, num_ctx)
+    prompt = create_merged_summary_llm_prompt(notes)
+    return prompt_local_llm(prompt, on_token=on_token, model=model, num_ctx=num_ctx)
+
+
+def iter_activity_units(
+    jira_summary: str,
+    commits: list[RepoCommits],
+) -> Iterator[str]:
+    """Split activity into the smallest pieces that stand alone: Jira issues and
+    individual commits, each labelled with where it came from
+    """
+    if jira_summary:
+        for issue in jira_summary.split('\n\n'):
+            yield f'Jira issue:\n{issue}'
+    for repo_commits in commits:
+        for commit in repo_commits.commits:
+            yield f'Repo: {repo_commits.repo}\n{commit.render()}'
+        if repo_commits.truncated:
+            yield (
+                f'Repo: {repo_commits.repo}\n'
+                '[git log output truncated, later commits omitted]'
+            )
+
+
+def pack_chunks(units: Iterable[str], budget: int) -> list[str]:
+    """Greedily pack units into chunks of at most `budget` tokens, in order
+
+    A unit larger than the budget on its own is split into budget-sized slices.
+    """
+    chunks = []
+    current: list[str] = []
+    size = 0
+    for unit in units:
+        for piece in split_to_budget(unit, budget):
+            tokens = estimate_tokens(piece)
+            if current and size + tokens > budget:
+                chunks.append('\n\n'.join(current))
+                current, size = [], 0
+            current.append(piece)
+            size += tokens
+    if current:
+        chunks.append('\n\n'.join(current))
+    return chunks
+
+
+def split_to_budget(text: str, budget: int) -> list[str]:
+    max_chars = budget * CHARS_PER_TOKEN
+    return [text[idx : idx + max_chars] for idx in range(0, len(text), max_chars)]
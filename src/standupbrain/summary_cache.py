@@ -0,0 +1,85 @@
+import hashlib
+import logging
+import os
+from collections.abc import Iterable
+from functools import cache
+from pathlib import Path
+
+from standupbrain.shared import get_cache_dir, get_summary_cache_max_bytes
+
+log = logging.getLogger(__name__)
+
+
+class SummaryCache:
+    """LLM summaries on disk, keyed by content hash and evicted least recently used
+
+    Each entry is a file whose mtime is bumped on every hit, so the oldest
+    mtimes are evicted first once the directory grows past `max_bytes`.
+    """
+
+    def __init__(self, cache_dir: Path, max_bytes: int) -> None:
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def get(self, key: str) -> str | None:
+        path = self.get_path(key)
+        try:
+            summary = path.read_text()
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return summary
+
+    def put(self, key: str, summary: str) -> None:
+        path = self.get_path(key)
+        tmp_path = path.with_suffix('.tmp')
+        tmp_path.write_text(summary)
+        tmp_path.chmod(0o600)
+        tmp_path.replace(path)
+        self.evict()
+
+    def evict(self) -> None:
+        entries = []
+        for path in self.cache_dir.glob('*.txt'):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            log.debug('Evicting cached summary %s', path.name)
+            path.unlink(missing_ok=True)
+            total -= size
+
+    def get_path(self, key: str) -> Path:
+        return self.cache_dir / f'{key}.txt'
+
+
+def make_summary_key(
+    model: str,
+    num_ctx: int,
+    templates: Iterable[str],
+    content: Iterable[str],
+) -> str:
+    """Hash of the model, its context window, every prompt template that may be
+    used and the whitespace-normalized content
+
+    The context window decides whether activity is map-reduced, so it is part of
+    the key. Content is hashed chunk by chunk so large prompts are never joined
+    in memory.
+    """
+    digest = hashlib.sha256()
+    for part in (model, str(num_ctx), *templates):
+        digest.update(part.encode() + b'\0')
+    for chunk in content:
+        digest.update(' '.join(chunk.split()).encode() + b' ')
+    return digest.hexdigest()
+
+
+@cache
+def get_summary_cache() -> SummaryCache:
+    return SummaryCache(get_cache_dir() / 'summaries', get_summary_cache_max_bytes())
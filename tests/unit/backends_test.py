@@ -0,0 +1,53 @@
+import json
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from standupbrain.llm import get_llm_backend
+from standupbrain.ollama import OllamaClient
+from standupbrain.openai_compat import LlamaCppClient, OpenAICompatibleClient
+
+
+@pytest.mark.parametrize(
+    ('config', 'expected_type', 'expected_url'),
+    [
+        ({}, OllamaClient, 'http://127.0.0.1:11434'),
+        ({'llm_backend': 'openai'}, OpenAICompatibleClient, 'http://127.0.0.1:8000'),
+        (
+            {'llm_backend': 'llamacpp', 'llm_base_url': 'http://gpu-box:9000/'},
+            LlamaCppClient,
+            'http://gpu-box:9000',
+        ),
+    ],
+)
+def test_get_llm_backend_from_config(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    config: dict,
+    expected_type: type,
+    expected_url: str,
+) -> None:
+    monkeypatch.delenv('OLLAMA_HOST', raising=False)
+    config_path = tmp_path / 'credentials.json'
+    config_path.write_text(json.dumps(config))
+    get_llm_backend.cache_clear()
+
+    with patch('standupbrain.shared.get_config_path', return_value=config_path):
+        backend = get_llm_backend()
+    get_llm_backend.cache_clear()
+
+    assert type(backend) is expected_type
+    assert backend.base_url == expected_url
+
+
+def test_get_llm_backend_rejects_unknown(tmp_path: Path) -> None:
+    config_path = tmp_path / 'credentials.json'
+    config_path.write_text(json.dumps({'llm_backend': 'tgi'}))
+    get_llm_backend.cache_clear()
+
+    with (
+        patch('standupbrain.shared.get_config_path', return_value=config_path),
+        pytest.raises(ValueError, match='tgi'),
+    ):
+        get_llm_backend()
@@ -0,0 +1,91 @@
+import json
+from pathlib import Path
+from unittest.mock import patch
+
+from click.testing import CliRunner
+from conftest import FakeRequest, FakeResponse, FakeServer
+
+from standupbrain.bench import BENCH_SIZES, get_ollama_peak_rss, make_bench_prompt
+from standupbrain.cli import main
+from standupbrain.ollama import OllamaClient
+
+
+def fake_generate(request: FakeRequest) -> FakeResponse:
+    body = request.json()
+    if 'prompt' not in body:
+        return FakeResponse(body={'model': body['model'], 'done': True})
+    final = {
+        'response': '',
+        'done': True,
+        'load_duration': 1_500_000_000,
+        'eval_count': 40,
+        'eval_duration': 2_000_000_000,
+    }
+    return FakeResponse(
+        chunks=[
+            json.dumps({'response': '- Did things', 'done': False}).encode() + b'\n',
+            json.dumps(final).encode() + b'\n',
+        ],
+    )
+
+
+def test_bench_reports_json_per_model_and_size(fake_server: FakeServer) -> None:
+    models = [{'name': 'llama3.2:3b'}, {'name': 'qwen2.5:3b'}]
+    fake_server.route('GET', '/api/tags', FakeResponse(body={'models': models}))
+    fake_server.route('POST', '/api/generate', fake_generate)
+    client = OllamaClient(base_url=fake_server.url)
+
+    with patch('standupbrain.cli.get_ollama_client', return_value=client):
+        result = CliRunner().invoke(main, ['bench', '--json'], catch_exceptions=False)
+
+    assert result.exit_code == 0
+    report = json.loads(result.output)
+    results = report['results']
+    assert [(row['model'], row['size']) for row in results] == [
+        (model, size) for model in ('llama3.2:3b', 'qwen2.5:3b') for size in BENCH_SIZES
+    ]
+    assert results[0]['load_seconds'] == 1.5  # noqa: PLR2004
+    assert results[0]['tokens_per_second'] == 20  # noqa: PLR2004
+    assert results[0]['time_to_first_token'] is not None
+    assert report['machine']['cpu_count']
+    unloads = [
+        request.json()
+        for request in fake_server.requests
+        if request.path == '/api/generate' and 'prompt' not in request.json()
+    ]
+    assert unloads[0] == {'model': 'llama3.2:3b', 'keep_alive': 0}
+
+
+def test_bench_table_for_selected_model(fake_server: FakeServer) -> None:
+    fake_server.route('POST', '/api/generate', fake_generate)
+    client = OllamaClient(base_url=fake_server.url)
+
+    with patch('standupbrain.cli.get_ollama_client', return_value=client):
+        result = CliRunner().invoke(
+            main,
+            ['bench', '-m', 'mistral:7b', '--size', 'small'],
+            catch_exceptions=False,
+        )
+
+    assert result.exit_code == 0
+    lines = result.output.splitlines()
+    assert lines[0].startswith('model')
+    assert lines[1].split()[:3] == ['mistral:7b', 'small', '1.50']
+
+
+def test_make_bench_prompt_sizes_grow() -> None:
+    sizes = [len(make_bench_prompt(size)) for size in BENCH_SIZES]
+
+    assert sizes == sorted(sizes)
+    assert 'BILL-412' in make_bench_prompt('small')
+
+
+def test_get_ollama_peak_rss(tmp_path: Path) -> None:
+    for pid, name, hwm in (('10', 'ollama', '2048'), ('11', 'python', '999999')):
+        (tmp_path / pid).mkdir()
+        (tmp_path / pid / 'status').write_text(
+            f'Name:\t{name}\nVmHWM:\t    {hwm} kB\nVmRSS:\t     1 kB\n',
+        )
+
+    assert get_ollama_peak_rss(tmp_path) == 2048 * 1024
+    assert get_ollama_peak_rss(tmp_path / 'missing') is None
@@ -1,4 +1,5 @@
-from collections.abc import Generator
+import logging
+from collections.abc import Callable, Generator
 from datetime import datetime
 from unittest.mock import Mock, patch
 
@@ -6,6 +7,12 @@ import pytest
 from click.testing import CliRunner
 
 from standupbrain.cli import main
+from standupbrain.commits import Commit, RepoCommits
+from standupbrain.llm import (
+    create_combined_summary_llm_prompt,
+    create_standup_summary_llm_prompt,
+)
+from standupbrain.ollama import OllamaError
 
 
 @pytest.fixture
@@ -15,27 +22,59 @@ def runner() -> CliRunner:
 
 @pytest.fixture
 def mock_dependencies() -> Generator:
+    mock_llm = Mock()
     with (
         patch('standupbrain.cli.get_git_commits') as mock_commits,
-        patch('standupbrain.cli.make_jira_activity_summary') as mock_jira,
-        patch('standupbrain.cli.prompt_local_llm') as mock_llm,
-        patch('standupbrain.cli.get_remote_gh_username') as mock_username,
+        patch('standupbrain.cli.make_jira_activity_summaries') as mock_jira,
+        patch('standupbrain.cli.summarize_activity') as mock_summarize,
+        patch('standupbrain.cli.summarize_period') as mock_summarize_period,
+        patch('standupbrain.cli.require_remote_gh_username') as mock_username,
         patch('standupbrain.cli.get_local_git_email') as mock_email,
         patch('standupbrain.cli.get_previous_workday') as mock_prev_day,
         patch('standupbrain.cli.ensure_gh_authenticated') as mock_auth,
+        patch('standupbrain.cli.warm_up_local_llm') as mock_warm_up,
     ):
         mock_username.return_value = Mock(stdout='test-user\n')
         mock_email.return_value = Mock(stdout='test-email@test.com\n')
         mock_auth.return_value = True
         mock_prev_day.return_value = datetime(2024, 1, 15)
+
+        def stream_llm(_prompt: str, on_token: Callable | None = None) -> object:
+            result = mock_llm.return_value
+            if on_token:
+                on_token(result)
+            return result
+
+        def summarize(
+            jira_summary: str,
+            commits: list[RepoCommits],
+            on_token: Callable | None = None,
+            **_: object,
+        ) -> object:
+            prompt = create_standup_summary_llm_prompt(jira_summary, commits)
+            return mock_llm(prompt, on_token=on_token)
+
+        def summarize_period(
+            day_summaries: dict[str, str],
+            on_token: Callable | None = None,
+            **_: object,
+        ) -> object:
+            prompt = create_combined_summary_llm_prompt(day_summaries)
+            return mock_llm(prompt, on_token=on_token)
+
+        mock_llm.side_effect = stream_llm
+        mock_summarize.side_effect = summarize
+        mock_summarize_period.side_effect = summarize_period
         yield {
             'commits': mock_commits,
             'jira': mock_jira,
             'llm': mock_llm,
+            'summarize': mock_summarize,
             'username': mock_username,
             'email': mock_email,
             'prev_day': mock_prev_day,
             'mock_auth': mock_auth,
+            'warm_up': mock_warm_up,
         }
 
 
@@ -53,9 +92,9 @@ def test_recall_with_date(
     expected_date_used: datetime | None,
 ) -> None:
     mock_dependencies['commits'].return_value = [
-        {'repo': 'test-repo', 'output': 'commit message here'},
+        RepoCommits('test-repo', [Commit('abc123', 'commit message here')]),
     ]
-    mock_dependencies['jira'].return_value = 'jira summary'
+    mock_dependencies['jira'].return_value = {'2024-01-15': 'jira summary'}
     mock_dependencies['llm'].return_value = 'standup output'
 
     args = ['recall']
@@ -66,30 +105,228 @@ def test_recall_with_date(
 
     assert result.exit_code == 0
     assert 'standup output' in result.output
+    mock_dependencies['warm_up'].assert_called_once()
     if expected_date_used:
         mock_dependencies['commits'].assert_called_once()
         actual_date = mock_dependencies['commits'].call_args[0][0]
         assert actual_date == expected_date_used
 
 
-def test_recall_dry_run(runner: CliRunner, mock_dependencies: dict) -> None:
+def test_recall_dry_run(
+    runner: CliRunner,
+    mock_dependencies: dict,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
     mock_dependencies['commits'].return_value = [
-        {'repo': 'test-repo', 'output': 'commit message here'},
+        RepoCommits('test-repo', [Commit('abc123', 'commit message here')]),
     ]
-    mock_dependencies['jira'].return_value = 'jira summary'
+    mock_dependencies['jira'].return_value = {'2024-01-15': 'jira summary'}
 
-    result = runner.invoke(main, ['recall', '--dry-run'])
+    with caplog.at_level(logging.DEBUG):
+        result = runner.invoke(main, ['recall', '--dry-run'])
 
     assert result.exit_code == 0
     assert 'not prompting LLM' in result.output
+    assert 'Unchunked prompt size:' in caplog.text
     mock_dependencies['llm'].assert_not_called()
+    mock_dependencies['warm_up'].assert_not_called()
 
 
 def test_recall_no_data(runner: CliRunner, mock_dependencies: dict) -> None:
     mock_dependencies['commits'].return_value = []
-    mock_dependencies['jira'].return_value = ''
+    mock_dependencies['jira'].return_value = {'2024-01-15': ''}
 
     result = runner.invoke(main, ['recall'])
 
     assert result.exit_code == 0
     assert 'No commits or Jira' in result.output
+
+
+@pytest.mark.parametrize('failing_source', ['commits', 'jira'])
+def test_recall_isolates_source_failures(
+    runner: CliRunner,
+    mock_dependencies: dict,
+    failing_source: str,
+) -> None:
+    mock_dependencies['commits'].return_value = [
+        RepoCommits('test-repo', [Commit('abc123', 'commit message here')]),
+    ]
+    mock_dependencies['jira'].return_value = {'2024-01-15': 'jira summary'}
+    mock_dependencies[failing_source].side_effect = RuntimeError('boom')
+    mock_dependencies['llm'].return_value = 'standup output'
+
+    result = runner.invoke(main, ['recall'], catch_exceptions=False)
+
+    assert result.exit_code == 0
+    assert 'continuing without it: boom' in result.output
+    assert 'standup output' in result.output
+
+
+def test_recall_reports_llm_errors(
+    runner: CliRunner,
+    mock_dependencies: dict,
+) -> None:
+    mock_dependencies['commits'].return_value = [
+        RepoCommits('test-repo', [Commit('abc123', 'commit message here')]),
+    ]
+    mock_dependencies['summarize'].side_effect = OllamaError(
+        'model "llama3.2:3b" not found, try pulling it first',
+    )
+
+    result = runner.invoke(main, ['recall'], catch_exceptions=False)
+
+    assert result.exit_code == 1
+    assert 'Could not summarize activity: model "llama3.2:3b" not found' in (
+        result.output
+    )
+
+
+def test_recall_range(runner: CliRunner, mock_dependencies: dict) -> None:
+    mock_dependencies['commits'].return_value = [
+        RepoCommits(
+            'test-repo',
+            [
+                Commit('abc123', 'monday work', date='2024-01-15'),
+                Commit('def456', 'wednesday work', date='2024-01-17'),
+            ],
+        ),
+    ]
+    mock_dependencies['jira'].return_value = {
+        '2024-01-15': '',
+        '2024-01-16': 'jira summary',
+        '2024-01-17': '',
+    }
+    responses = iter(['mon', 'tue', 'wed', 'combined'])
+
+    def stream_llm(_prompt: str, on_token: Callable) -> str:
+        response = next(responses)
+        on_token(response)
+        return response
+
+    mock_dependencies['llm'].side_effect = stream_llm
+
+    result = runner.invoke(
+        main,
+        ['recall', '--since', '2024-01-15', '--until', '2024-01-17'],
+        catch_exceptions=False,
+    )
+
+    assert result.exit_code == 0
+    mock_dependencies['commits'].assert_called_once()
+    assert mock_dependencies['commits'].call_args[1]['until'] == datetime(2024, 1, 17)
+    mock_dependencies['jira'].assert_called_once_with(
+        datetime(2024, 1, 15),
+        datetime(2024, 1, 17),
+    )
+    prompts = [''.join(call[0][0]) for call in mock_dependencies['llm'].call_args_list]
+    assert 'monday work' in prompts[0]
+    assert 'wednesday work' not in prompts[0]
+    assert 'jira summary' in prompts[1]
+    assert 'wednesday work' in prompts[2]
+    assert '2024-01-16:\ntue' in prompts[3]
+    assert '2024-01-15 to 2024-01-17:\ncombined' in result.output
+
+
+@pytest.mark.parametrize(
+    'args',
+    [
+        ['--date', '2024-01-15', '--since', '2024-01-10'],
+        ['--until', '2024-01-15'],
+        ['--since', '2024-01-15', '--until', '2024-01-10'],
+    ],
+)
+def test_recall_range_invalid_options(
+    runner: CliRunner,
+    mock_dependencies: dict,
+    args: list[str],
+) -> None:
+    result = runner.invoke(main, ['recall', *args])
+
+    assert result.exit_code == 2  # noqa: PLR2004
+    mock_dependencies['commits'].assert_not_called()
+
+
+@pytest.mark.parametrize(('args', 'use_cache'), [([], True), (['--no-cache'], False)])
+def test_recall_no_cache(
+    runner: CliRunner,
+    mock_dependencies: dict,
+    args: list[str],
+    use_cache: bool,
+) -> None:
+    mock_dependencies['commits'].return_value = [
+        RepoCommits('test-repo', [Commit('abc123', 'commit message here')]),
+    ]
+    mock_dependencies['jira'].return_value = {}
+
+    result = runner.invoke(main, ['recall', *args], catch_exceptions=False)
+
+    assert result.exit_code == 0
+    assert mock_dependencies['summarize'].call_args[1]['use_cache'] is use_cache
+
+
+def test_recall_team(runner: CliRunner, mock_dependencies: dict) -> None:
+    commits = [RepoCommits('org/repo', [Commit('abc123', 'ann work')])]
+    mock_dependencies['llm'].return_value = 'ann summary'
+
+    with patch(
+        'standupbrain.cli.get_team_git_commits',
+        return_value={'ann@co.com': commits, 'bob@co.com': []},
+    ) as mock_team:
+        result = runner.invoke(
+            main,
+            ['recall-team', '-m', 'ann@co.com=ann', '-m', 'bob@co.com=bob'],
+            catch_exceptions=False,
+        )
+
+    assert result.exit_code == 0
+    mock_team.assert_called_once_with(
+        datetime(2024, 1, 15),
+        [('ann@co.com', 'ann'), ('bob@co.com', 'bob')],
+        max_workers=None,
+    )
+    assert result.output.index('ann (ann@co.com):\nann summary') < result.output.index(
+        'bob (bob@co.com):\nNo commits found for 2024-01-15',
+    )
+    mock_dependencies['summarize'].assert_called_once()
+
+
+def test_recall_team_isolates_member_failures(
+    runner: CliRunner,
+    mock_dependencies: dict,
+) -> None:
+    ann = [RepoCommits('org/repo', [Commit('abc123', 'ann work')])]
+    bob = [RepoCommits('org/repo', [Commit('def456', 'bob work')])]
+
+    def llm(prompt: str, *_args: object, **_kwargs: object) -> str:
+        if 'ann work' in prompt:
+            msg = 'model timed out'
+            raise TimeoutError(msg)
+        return 'bob summary'
+
+    mock_dependencies['llm'].side_effect = llm
+
+    with patch(
+        'standupbrain.cli.get_team_git_commits',
+        return_value={'ann@co.com': ann, 'bob@co.com': bob},
+    ):
+        result = runner.invoke(
+            main,
+            ['recall-team', '-m', 'ann@co.com=ann', '-m', 'bob@co.com=bob'],
+            catch_exceptions=False,
+        )
+
+    assert result.exit_code == 0
+    assert 'ann (ann@co.com):\n⚠ Could not summarize activity for ann' in (
+        result.output
+    )
+    assert 'bob (bob@co.com):\nbob summary' in result.output
+
+
+def test_recall_team_rejects_malformed_member(
+    runner: CliRunner,
+    mock_dependencies: dict,  # noqa: ARG001
+) -> None:
+    result = runner.invoke(main, ['recall-team', '-m', 'ann@co.com'])
+
+    assert result.exit_code == 2  # noqa: PLR2004
+    assert 'EMAIL=USERNAME' in result.output
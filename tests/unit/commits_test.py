@@ -0,0 +1,119 @@
+import pytest
+
+from standupbrain.commits import (
+    Commit,
+    DiffLimits,
+    RepoCommits,
+    parse_git_log,
+    split_commits_by_day,
+)
+
+PATCH = """\
+diff --git a/src/app.py b/src/app.py
+index 1111111..2222222 100644
+--- a/src/app.py
++++ b/src/app.py
+@@ -1,3 +1,4 @@ def main():
+ import os
+-print('old')
++print('new')
++print('more')
+diff --git a/uv.lock b/uv.lock
+index 3333333..4444444 100644
+--- a/uv.lock
++++ b/uv.lock
+@@ -1,2 +1,2 @@
+-version = 1
++version = 2
+diff --git a/logo.png b/logo.png
+new file mode 100644
+index 0000000..5555555
+Binary files /dev/null and b/logo.png differ
+"""
+
+GIT_OUTPUT = (
+    '\x1eabc123\x1f2024-01-15\x1fAdd feature\x1fLonger body | with pipes\n\x1f\n'
+    + PATCH
+    + '\x1edef456\x1f2024-01-16\x1fEmpty commit\x1f\x1f\n'
+)
+
+
+def test_parse_git_log() -> None:
+    commits = parse_git_log(GIT_OUTPUT, DiffLimits())
+
+    assert [commit.hash for commit in commits] == ['abc123', 'def456']
+    first = commits[0]
+    assert first.subject == 'Add feature'
+    assert first.body == 'Longer body | with pipes'
+    app, lock, logo = first.files
+    assert (app.path, app.additions, app.deletions) == ('src/app.py', 2, 1)
+    assert app.hunks.startswith('@@ -1,3 +1,4 @@ def main():')
+    assert (lock.additions, lock.deletions, lock.excluded, lock.hunks) == (
+        1,
+        1,
+        True,
+        '',
+    )
+    assert logo.binary
+    assert commits[1].files == []
+
+
+def test_render_marks_omitted_diffs() -> None:
+    rendered = parse_git_log(GIT_OUTPUT, DiffLimits())[0].render()
+
+    assert 'commit abc123: Add feature' in rendered
+    assert "+print('new')" in rendered
+    assert 'uv.lock (+1 -1) [generated, diff omitted]' in rendered
+    assert 'version = 2' not in rendered
+    assert 'logo.png (+0 -0) [binary]' in rendered
+
+
+@pytest.mark.parametrize(
+    ('limits', 'file_truncated', 'commit_truncated'),
+    [
+        (DiffLimits(max_file_bytes=40), True, False),
+        (DiffLimits(max_commit_bytes=10), False, True),
+    ],
+)
+def test_parse_git_log_byte_caps(
+    limits: DiffLimits,
+    file_truncated: bool,
+    commit_truncated: bool,
+) -> None:
+    commit = parse_git_log(GIT_OUTPUT, limits)[0]
+    app = commit.files[0]
+
+    assert app.truncated is file_truncated
+    assert commit.truncated is commit_truncated
+    assert len(app.hunks) <= min(limits.max_file_bytes, limits.max_commit_bytes)
+    assert (app.additions, app.deletions) == (2, 1)
+
+
+def test_split_commits_by_day() -> None:
+    commits = [
+        RepoCommits(
+            'repo1',
+            [
+                Commit('a', 'one', date='2024-01-16'),
+                Commit('b', 'two', date='2024-01-15'),
+            ],
+        ),
+        RepoCommits('repo2', [Commit('c', 'three', date='2024-01-16')]),
+    ]
+
+    by_day = split_commits_by_day(commits)
+
+    assert list(by_day) == ['2024-01-15', '2024-01-16']
+    assert [repo.repo for repo in by_day['2024-01-16']] == ['repo1', 'repo2']
+    assert [commit.hash for commit in by_day['2024-01-15'][0].commits] == ['b']
+
+
+def test_repo_commits_iter_render_matches_render() -> None:
+    repo_commits = RepoCommits(
+        'repo1',
+        parse_git_log(GIT_OUTPUT, DiffLimits()),
+        truncated=True,
+    )
+
+    assert ''.join(repo_commits.iter_render()) == repo_commits.render()
+    assert repo_commits.render().endswith('later commits omitted]')
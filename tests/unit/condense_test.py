@@ -0,0 +1,116 @@
+from standupbrain.commits import (
+    Commit,
+    DiffLimits,
+    FileDiff,
+    RepoCommits,
+    parse_git_log,
+)
+from standupbrain.condense import LARGE_HUNK_LINES, condense_commits, condense_file
+
+
+def make_file(hunks: str, **kwargs: object) -> FileDiff:
+    lines = hunks.split('\n')
+    return FileDiff(
+        path='src/app.py',
+        additions=sum(line.startswith('+') for line in lines),
+        deletions=sum(line.startswith('-') for line in lines),
+        hunks=hunks,
+        **kwargs,
+    )
+
+
+def test_condense_drops_context_and_line_numbers() -> None:
+    file = make_file(
+        '@@ -10,7 +10,7 @@ def main():\n'
+        '     setup()\n'
+        "-    print('old')\n"
+        "+    print('new')\n"
+        '     teardown()\n'
+        '\\ No newline at end of file',
+    )
+
+    condense_file(file)
+
+    assert file.hunks == "@@ def main():\n-    print('old')\n+    print('new')"
+    assert not file.note
+
+
+def test_condense_notes_whitespace_only_changes() -> None:
+    file = make_file('@@ -1,2 +1,2 @@\n-if x:\n-  return 1\n+if x:\n+    return 1')
+
+    condense_file(file)
+
+    assert file.note == 'whitespace-only changes'
+    assert not file.hunks
+
+
+def test_condense_notes_import_reshuffles() -> None:
+    reordered = make_file('@@ -1,2 +1,2 @@\n-import sys\n import json\n+import sys')
+    added = make_file('@@ -1,1 +1,2 @@\n import os\n+from pathlib import Path')
+
+    condense_file(reordered)
+    condense_file(added)
+
+    assert reordered.note == 'imports reordered'
+    assert added.note == 'import changes only (+1 -0)'
+
+
+def test_condense_keeps_truncated_diffs_unlabelled() -> None:
+    file = make_file('@@ -1 +1 @@\n-import sys\n+import os', truncated=True)
+
+    condense_file(file)
+
+    assert not file.note
+    assert file.hunks == '@@\n-import sys\n+import os'
+
+
+def test_condense_summarizes_large_hunks_by_definition() -> None:
+    body = [f'+    value_{idx} = compute({idx})' for idx in range(LARGE_HUNK_LINES)]
+    file = make_file(
+        '\n'.join(
+            [
+                '@@ -40,3 +40,45 @@ class Invoice:',
+                '+    def total(self):',
+                *body,
+                '-    pass',
+                '@@ -90 +132 @@ def refund():',
+                '+    log(amount)',
+            ],
+        ),
+    )
+
+    condense_file(file)
+
+    assert file.hunks == (
+        '@@ class Invoice: [+41 -1 lines touching Invoice, total]\n'
+        '@@ def refund():\n'
+        '+    log(amount)'
+    )
+
+
+def test_condense_notes_pure_renames() -> None:
+    output = (
+        '\x1eabc123\x1f2024-01-15\x1fMove module\x1f\x1f\n'
+        'diff --git a/old/util.py b/new/util.py\n'
+        'similarity index 100%\n'
+        'rename from old/util.py\n'
+        'rename to new/util.py\n'
+    )
+    commits = [RepoCommits('org/repo', parse_git_log(output, DiffLimits()))]
+
+    condense_commits(commits)
+
+    assert commits[0].commits[0].render() == (
+        'commit abc123: Move module\n'
+        'old/util.py -> new/util.py (+0 -0) [renamed, no content changes]'
+    )
+
+
+def test_condense_commits_shrinks_prompt() -> None:
+    file = make_file('@@ -1,5 +1,5 @@\n a\n b\n-c\n+C\n d\n e')
+    commits = [RepoCommits('org/repo', [Commit('abc123', 'Change', files=[file])])]
+    before = len(commits[0].render())
+
+    condense_commits(commits)
+
+    assert len(commits[0].render()) < before
@@ -1,8 +1,154 @@
+import json
 import random
+import threading
+from collections.abc import Callable, Generator
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
 
 import pytest
 
+from standupbrain import github
+
 skip_90_percent_for_slower_tests = pytest.mark.skipif(
     random.random() > 0.1,  # noqa: PLR2004
     reason='runs 10 percent of the time',
 )
+
+
+@dataclass
+class FakeRequest:
+    method: str
+    path: str
+    query: dict[str, list[str]]
+    headers: dict[str, str]
+    body: bytes
+
+    def json(self) -> dict:
+        return json.loads(self.body)
+
+
+@dataclass
+class FakeResponse:
+    status: int = 200
+    body: bytes | str | dict | list | None = None
+    headers: dict[str, str] = field(default_factory=dict)
+    chunks: list[bytes] | None = None
+
+
+@dataclass
+class FakeServer:
+    """Local HTTP stand-in for GitHub/Ollama/Jira, routes keyed by (method, path)"""
+
+    url: str
+    routes: dict[tuple[str, str], Callable[[FakeRequest], FakeResponse]]
+    requests: list[FakeRequest]
+
+    def route(
+        self,
+        method: str,
+        path: str,
+        response: FakeResponse | Callable[[FakeRequest], FakeResponse],
+    ) -> None:
+        self.routes[method, path] = (
+            response if callable(response) else lambda _request: response
+        )
+
+
+class FakeHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *_: object) -> None:
+        pass
+
+    def handle_any(self) -> None:
+        parts = urlsplit(self.path)
+        body = self.read_body()
+        request = FakeRequest(
+            method=self.command,
+            path=parts.path,
+            query=parse_qs(parts.query),
+            headers=dict(self.headers),
+            body=body,
+        )
+        self.server.fake.requests.append(request)
+        handler = self.server.fake.routes.get((self.command, parts.path))
+        response = handler(request) if handler else FakeResponse(status=404)
+        self.send_fake_response(response)
+
+    def read_body(self) -> bytes:
+        if self.headers.get('Transfer-Encoding') == 'chunked':
+            body = b''
+            while size := int(self.rfile.readline().strip(), 16):
+                body += self.rfile.read(size)
+                self.rfile.readline()
+            self.rfile.readline()
+            return body
+        return self.rfile.read(int(self.headers.get('Content-Length') or 0))
+
+    def send_fake_response(self, response: FakeResponse) -> None:
+        self.send_response(response.status)
+        for key, value in response.headers.items():
+            self.send_header(key, value)
+
+        if response.chunks is not None:
+            self.send_header('Transfer-Encoding', 'chunked')
+            self.end_headers()
+            for chunk in response.chunks:
+                self.wfile.write(f'{len(chunk):x}\r\n'.encode() + chunk + b'\r\n')
+                self.wfile.flush()
+            self.wfile.write(b'0\r\n\r\n')
+            return
+
+        body = response.body
+        if isinstance(body, dict | list):
+            body = json.dumps(body)
+        if isinstance(body, str):
+            body = body.encode()
+        body = body or b''
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = do_POST = do_PUT = do_DELETE = handle_any  # noqa: N815
+
+
+def make_repo(path: Path, remote_url: str | None = None) -> None:
+    """A bare-bones checkout at `path`, with an `origin` remote if given"""
+    (path / '.git').mkdir(parents=True)
+    if remote_url:
+        (path / '.git' / 'config').write_text(
+            '[core]\n\tbare = false\n'
+            f'[remote "upstream"]\n\turl = git@github.com:other/{path.name}.git\n'
+            f'[remote "origin"]\n\turl = {remote_url}\n',
+        )
+
+
+@pytest.fixture
+def fake_server() -> Generator[FakeServer]:
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FakeHandler)
+    server.daemon_threads = True
+    server.fake = FakeServer(
+        url=f'http://127.0.0.1:{server.server_port}',
+        routes={},
+        requests=[],
+    )
+    thread = threading.Thread(
+        target=server.serve_forever,
+        kwargs={'poll_interval': 0.01},
+        daemon=True,
+    )
+    thread.start()
+    yield server.fake
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture(autouse=True)
+def no_github_token(monkeypatch: pytest.MonkeyPatch) -> Generator[None]:
+    """Keep unit tests off the real GitHub API unless a test opts in"""
+    monkeypatch.setattr(github, 'get_gh_token', lambda: None)
+    github.get_github_client.cache_clear()
+    yield
+    github.get_github_client.cache_clear()
@@ -8,6 +8,7 @@ import pytest
 from standupbrain.git_init import (
     get_git_credentials,
     init_git,
+    require_remote_gh_username,
 )
 
 
@@ -148,3 +149,16 @@ def test_init_git_preserves_other_config(
     assert config['api_token'] == 'secret'
     assert config['git_email'] == 'user@example.com'
     assert config['gh_username'] == 'gh-user'
+
+
+@pytest.mark.parametrize(('username', 'exits'), [('gh-user', False), (None, True)])
+def test_require_remote_gh_username(username: str | None, exits: bool) -> None:
+    with patch(
+        'standupbrain.git_init.get_remote_gh_username',
+        return_value=username,
+    ):
+        if exits:
+            with pytest.raises(SystemExit):
+                require_remote_gh_username()
+        else:
+            assert require_remote_gh_username() == username
@@ -1,10 +1,25 @@
+import io
+import json
+import sys
+import time
 from datetime import datetime
 from pathlib import Path
 from unittest.mock import Mock, patch
 
 import pytest
+from conftest import make_repo
 
-from standupbrain.git import get_affected_repos, get_git_commits, get_git_commits_local
+from standupbrain.commits import Commit, DiffLimits, RepoCommits
+from standupbrain.git import (
+    get_affected_repos,
+    get_git_commits,
+    get_git_commits_local,
+    get_team_git_commits,
+    run_git_log,
+    run_git_log_by_author,
+    stream_git_log,
+)
+from standupbrain.repo_index import RepoIndex, build_repo_index
 
 
 @pytest.mark.parametrize(
@@ -14,7 +29,7 @@ from standupbrain.git import get_affected_repos, get_git_commits, get_git_commit
             '2024-01-15',
             'testuser',
             '[{"type":"PushEvent","created_at":"2024-01-15T10:00:00Z","repo":{"name":"org/repo1"}},{"type":"PullRequestEvent","created_at":"2024-01-15T11:00:00Z","repo":{"name":"org/repo2"}}]',
-            {'repo1', 'repo2'},
+            {'org/repo1', 'org/repo2'},
         ),
         (
             '2024-01-15',
@@ -45,11 +60,35 @@ def test_get_affected_repos(
     assert result == expected_repos
 
 
+def test_get_affected_repos_range() -> None:
+    events = [
+        {
+            'type': 'PushEvent',
+            'created_at': f'2024-01-{day}T10:00:00Z',
+            'repo': {'name': f'org/repo{day}'},
+        }
+        for day in (17, 16, 15, 14)
+    ]
+
+    with patch('subprocess.run', return_value=Mock(stdout=json.dumps(events))):
+        result = get_affected_repos('2024-01-15', 'testuser', until_str='2024-01-16')
+
+    assert result == {'org/repo15', 'org/repo16'}
+
+
+GIT_OUTPUT = '\x1eabc123\x1f2024-01-15\x1fcommit msg\x1fbody\x1f\n'
+
+
+def fake_process(output: str) -> Mock:
+    return Mock(stdin=Mock(), stdout=io.BytesIO(output.encode()))
+
+
 @pytest.mark.parametrize(
     ('affected_repos', 'date_str', 'username', 'git_output', 'expected_count'),
     [
-        ({'repo1'}, '2024-01-15', 'testuser', 'abc123|commit msg|body\n', 1),
-        ({'repo1', 'repo2'}, '2024-01-15', 'testuser', '', 0),
+        ({'org/repo1'}, '2024-01-15', 'testuser', GIT_OUTPUT, 1),
+        ({'org/repo1', 'org/repo2'}, '2024-01-15', 'testuser', '', 0),
+        ({'org/excluded'}, '2024-01-15', 'testuser', GIT_OUTPUT, 0),
     ],
 )
 def test_get_git_commits_local(
@@ -60,23 +99,57 @@ def test_get_git_commits_local(
     expected_count: int,
     tmp_path: Path,
 ) -> None:
-    (tmp_path / 'repo1' / '.git').mkdir(parents=True)
-    (tmp_path / 'repo2' / '.git').mkdir(parents=True)
+    make_repo(tmp_path / 'repo1', 'git@github.com:org/repo1.git')
+    make_repo(tmp_path / 'nested' / 'repo2', 'https://github.com/org/repo2')
     (tmp_path / 'excluded').mkdir()
+    repo_index = build_repo_index([tmp_path], depth=2)
 
-    mock_result = Mock()
-    mock_result.stdout = git_output
+    hashes = Mock(stdout='abc123\n' if git_output else '')
 
     with (
-        patch('subprocess.run', return_value=mock_result),
-        patch('pathlib.Path.home', return_value=tmp_path.parent),
-        patch.object(Path, 'iterdir', return_value=tmp_path.iterdir()),
+        patch('subprocess.run', return_value=hashes),
+        patch('subprocess.Popen', return_value=fake_process(git_output)),
     ):
-        result = get_git_commits_local(affected_repos, date_str, username)
+        result = get_git_commits_local(
+            affected_repos,
+            date_str,
+            username,
+            repo_index=repo_index,
+        )
 
     assert len(result) == expected_count
 
 
+def test_get_git_commits_local_preserves_repo_order(tmp_path: Path) -> None:
+    for name in ('zeta', 'alpha', 'mid'):
+        make_repo(tmp_path / name, f'git@github.com:org/{name}.git')
+    repo_index = build_repo_index([tmp_path], depth=1)
+
+    def fake_run_git_log(
+        repo: Path,
+        *_: object,
+        **__: object,
+    ) -> tuple[list[Commit], bool]:
+        time.sleep(0.05 if repo.name == 'alpha' else 0)
+        return [Commit(repo.name, f'output for {repo.name}')], False
+
+    with patch('standupbrain.git.run_git_log', side_effect=fake_run_git_log):
+        result = get_git_commits_local(
+            {'org/zeta', 'org/alpha', 'org/mid'},
+            '2024-01-15',
+            'test@test.com',
+            max_workers=3,
+            repo_index=repo_index,
+        )
+
+    assert [repo_commits.repo for repo_commits in result] == [
+        'org/alpha',
+        'org/mid',
+        'org/zeta',
+    ]
+    assert result[0].commits[0].subject == 'output for alpha'
+
+
 @pytest.mark.parametrize(
     ('date', 'username', 'email', 'affected_repos', 'commits', 'expected_count'),
     [
@@ -84,8 +157,8 @@ def test_get_git_commits_local(
             datetime(2024, 1, 15),
             'testuser',
             'test@test.com',
-            {'repo1'},
-            [{'repo': 'repo1', 'output': 'commit data'}],
+            {'org/repo1'},
+            [RepoCommits('org/repo1', [Commit('abc123', 'commit data')])],
             1,
         ),
         (datetime(2024, 1, 15), 'testuser', 'test@test.com', set(), [], 0),
@@ -99,6 +172,7 @@ def test_get_git_commits(
     commits: list[dict],
     expected_count: int,
 ) -> None:
+    repo_index = RepoIndex(roots=[], depth=0)
     with (
         patch(
             'standupbrain.git.get_affected_repos',
@@ -108,9 +182,189 @@ def test_get_git_commits(
             'standupbrain.git.get_git_commits_local',
             return_value=commits,
         ) as mock_local,
+        patch('standupbrain.git.get_repo_index', return_value=repo_index),
     ):
         result = get_git_commits(date, username, email)
 
-    mock_repos.assert_called_once_with('2024-01-15', username)
-    mock_local.assert_called_once_with(affected_repos, '2024-01-15', email)
+    mock_repos.assert_called_once_with(
+        '2024-01-15',
+        username,
+        until_str='2024-01-15',
+    )
+    mock_local.assert_called_once_with(
+        affected_repos,
+        '2024-01-15',
+        email,
+        max_workers=None,
+        repo_index=repo_index,
+        until_str='2024-01-15',
+    )
     assert len(result) == expected_count
+
+
+def test_get_affected_repos_stops_paging_past_target_date() -> None:
+    def event(created_at: str, repo: str) -> dict:
+        return {
+            'type': 'PushEvent',
+            'created_at': created_at,
+            'repo': {'name': f'org/{repo}'},
+        }
+
+    first_page = [event('2024-01-16T10:00:00Z', 'newer')] * 99 + [
+        event('2024-01-15T09:00:00Z', 'repo1'),
+    ]
+    second_page = [event('2024-01-15T08:00:00Z', 'repo2')] * 99 + [
+        event('2024-01-14T08:00:00Z', 'older'),
+    ]
+    pages = [Mock(stdout=json.dumps(first_page)), Mock(stdout=json.dumps(second_page))]
+
+    with patch('subprocess.run', side_effect=pages) as mock_run:
+        result = get_affected_repos('2024-01-15', 'testuser')
+
+    assert result == {'org/repo1', 'org/repo2'}
+    assert mock_run.call_count == len(pages)
+
+
+@pytest.mark.parametrize(
+    ('hashes', 'expected_subjects'),
+    [
+        ('', []),
+        ('abc123\ndef456\n', ['commit msg']),
+    ],
+)
+def test_run_git_log_skips_patch_for_empty_repos(
+    tmp_path: Path,
+    hashes: str,
+    expected_subjects: list[str],
+) -> None:
+    process = fake_process(GIT_OUTPUT)
+
+    with (
+        patch('subprocess.run', return_value=Mock(stdout=hashes)) as mock_run,
+        patch('subprocess.Popen', return_value=process) as mock_popen,
+    ):
+        commits, truncated = run_git_log(
+            tmp_path,
+            '2024-01-15',
+            'test@test.com',
+            DiffLimits(),
+        )
+
+    assert [commit.subject for commit in commits] == expected_subjects
+    assert not truncated
+    assert '--patch' not in mock_run.call_args[0][0]
+    assert mock_popen.called is bool(hashes)
+    if hashes:
+        process.stdin.write.assert_called_once_with(b'abc123\ndef456\n')
+
+
+def test_stream_git_log_enforces_repo_byte_ceiling() -> None:
+    script = (
+        'import sys; sys.stdin.read(); '
+        "print('\\x1eabc123\\x1f2024-01-15\\x1fhuge\\x1f\\x1f'); "
+        "print('diff --git a/a.js b/a.js'); print('@@ -0,0 +1 @@'); "
+        "[print('+' + 'x' * 100, flush=True) for _ in range(100000)]"
+    )
+
+    commits, truncated = stream_git_log(
+        [sys.executable, '-c', script],
+        ['abc123'],
+        DiffLimits(max_repo_bytes=50_000),
+    )
+
+    assert truncated
+    assert commits[0].subject == 'huge'
+    assert commits[0].files[0].truncated
+    assert commits[0].files[0].additions < 1000  # noqa: PLR2004
+
+
+def test_run_git_log_by_author_scans_once_and_splits(tmp_path: Path) -> None:
+    hashes = 'aaa111 ann@co.com\nbbb222 Bob@Co.com\n'
+    output = (
+        '\x1eaaa111\x1f2024-01-15\x1fAnn change\x1f\x1f\n'
+        '\x1ebbb222\x1f2024-01-15\x1fBob change\x1f\x1f\n'
+    )
+
+    with (
+        patch('subprocess.run', return_value=Mock(stdout=hashes)) as mock_run,
+        patch('subprocess.Popen', return_value=fake_process(output)) as mock_popen,
+    ):
+        by_author, truncated = run_git_log_by_author(
+            tmp_path,
+            '2024-01-15',
+            ['ann@co.com', 'bob@co.com', 'cat@co.com'],
+            DiffLimits(),
+        )
+
+    assert {
+        email: [c.subject for c in commits] for email, commits in by_author.items()
+    } == {
+        'ann@co.com': ['Ann change'],
+        'bob@co.com': ['Bob change'],
+        'cat@co.com': [],
+    }
+    assert not truncated
+    command = mock_run.call_args[0][0]
+    assert '--author=ann@co.com' in command
+    assert '--author=cat@co.com' in command
+    mock_run.assert_called_once()
+    mock_popen.assert_called_once()
+
+
+def test_run_git_log_by_author_matches_email_exactly(tmp_path: Path) -> None:
+    # `--author=bob@co.com` also matches jbob@co.com, which must not count as Bob's
+    hashes = 'aaa111 jbob@co.com\nbbb222 bob@co.com\n'
+    output = (
+        '\x1eaaa111\x1f2024-01-15\x1fJ. Bob change\x1f\x1f\n'
+        '\x1ebbb222\x1f2024-01-15\x1fBob change\x1f\x1f\n'
+    )
+
+    with (
+        patch('subprocess.run', return_value=Mock(stdout=hashes)),
+        patch('subprocess.Popen', return_value=fake_process(output)),
+    ):
+        by_author, _ = run_git_log_by_author(
+            tmp_path,
+            '2024-01-15',
+            ['bob@co.com', 'jbob@co.com'],
+            DiffLimits(),
+        )
+
+    assert {
+        email: [c.subject for c in commits] for email, commits in by_author.items()
+    } == {
+        'bob@co.com': ['Bob change'],
+        'jbob@co.com': ['J. Bob change'],
+    }
+
+
+def test_get_team_git_commits_fetches_events_per_member() -> None:
+    repo_index = RepoIndex(roots=[], depth=0)
+    events = {'ann': {'org/repo1'}, 'bob': {'org/repo1', 'org/repo2'}}
+    by_author = {'ann@co.com': [], 'bob@co.com': []}
+
+    with (
+        patch(
+            'standupbrain.git.get_affected_repos',
+            side_effect=lambda _date, username, **_: events[username],
+        ),
+        patch(
+            'standupbrain.git.get_team_git_commits_local',
+            return_value=by_author,
+        ) as mock_local,
+        patch('standupbrain.git.get_repo_index', return_value=repo_index),
+    ):
+        result = get_team_git_commits(
+            datetime(2024, 1, 15),
+            [('ann@co.com', 'ann'), ('bob@co.com', 'bob')],
+        )
+
+    assert result == by_author
+    mock_local.assert_called_once_with(
+        {'org/repo1', 'org/repo2'},
+        '2024-01-15',
+        ['ann@co.com', 'bob@co.com'],
+        max_workers=None,
+        repo_index=repo_index,
+        until_str='2024-01-15',
+    )
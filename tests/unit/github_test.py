@@ -0,0 +1,142 @@
+import json
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pytest
+from conftest import FakeRequest, FakeResponse, FakeServer
+
+from standupbrain.git import iter_event_pages
+from standupbrain.github import GitHubClient, get_gh_token
+
+
+def test_get_authenticated_username(fake_server: FakeServer) -> None:
+    fake_server.route('GET', '/user', FakeResponse(body={'login': 'testuser'}))
+    client = GitHubClient('secret-token', base_url=fake_server.url)
+
+    assert client.get_authenticated_username() == 'testuser'
+    headers = fake_server.requests[0].headers
+    assert headers['Authorization'] == 'Bearer secret-token'
+    assert 'gzip' in headers['Accept-Encoding']
+
+
+@pytest.mark.parametrize(('status', 'expected'), [(200, True), (401, False)])
+def test_is_authenticated(fake_server: FakeServer, status: int, expected: bool) -> None:
+    fake_server.route('GET', '/user', FakeResponse(status=status, body={}))
+    client = GitHubClient('secret-token', base_url=fake_server.url)
+
+    assert client.is_authenticated() is expected
+
+
+def test_get_user_events(fake_server: FakeServer) -> None:
+    def events(request: FakeRequest) -> FakeResponse:
+        return FakeResponse(body=[{'page': request.query['page'][0]}])
+
+    fake_server.route('GET', '/users/testuser/events', events)
+    client = GitHubClient('secret-token', base_url=fake_server.url)
+
+    assert client.get_user_events('testuser', 2, 100) == [{'page': '2'}]
+    assert fake_server.requests[0].query['per_page'] == ['100']
+
+
+def test_iter_event_pages_falls_back_to_gh(fake_server: FakeServer) -> None:
+    fake_server.route('GET', '/users/testuser/events', FakeResponse(status=500))
+    client = GitHubClient('secret-token', base_url=fake_server.url)
+    gh_result = Mock(stdout=json.dumps([{'from': 'gh'}]))
+
+    with (
+        patch('standupbrain.git.get_github_client', return_value=client),
+        patch('subprocess.run', return_value=gh_result) as mock_run,
+    ):
+        pages = list(iter_event_pages('testuser'))
+
+    assert pages == [[{'from': 'gh'}]]
+    assert mock_run.call_args[0][0][:2] == ['gh', 'api']
+
+
+@pytest.mark.parametrize(
+    ('config', 'env', 'gh_stdout', 'expected'),
+    [
+        (
+            {'gh_token': 'from-config'},
+            {'GH_TOKEN': 'from-env'},
+            'from-gh',
+            'from-config',
+        ),
+        ({}, {'GITHUB_TOKEN': 'from-env'}, 'from-gh', 'from-env'),
+        ({}, {}, 'from-gh\n', 'from-gh'),
+        ({}, {}, '', None),
+    ],
+)
+def test_get_gh_token(
+    *,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    config: dict,
+    env: dict,
+    gh_stdout: str,
+    expected: str | None,
+) -> None:
+    config_path = tmp_path / 'credentials.json'
+    config_path.write_text(json.dumps(config))
+    monkeypatch.delenv('GH_TOKEN', raising=False)
+    monkeypatch.delenv('GITHUB_TOKEN', raising=False)
+    for key, value in env.items():
+        monkeypatch.setenv(key, value)
+
+    with (
+        patch('standupbrain.github.get_config_path', return_value=config_path),
+        patch('subprocess.run', return_value=Mock(stdout=gh_stdout)),
+    ):
+        assert get_gh_token() == expected
+
+
+def test_get_user_events_conditional_request(
+    fake_server: FakeServer,
+    tmp_path: Path,
+) -> None:
+    def events(request: FakeRequest) -> FakeResponse:
+        if request.headers.get('If-None-Match') == '"v1"':
+            return FakeResponse(status=304)
+        return FakeResponse(body=[{'id': '1'}], headers={'ETag': '"v1"'})
+
+    fake_server.route('GET', '/users/testuser/events', events)
+    client = GitHubClient('secret-token', base_url=fake_server.url, cache_dir=tmp_path)
+
+    first = client.get_user_events('testuser', 1, 100)
+    second = client.get_user_events('testuser', 1, 100)
+
+    assert first == second == [{'id': '1'}]
+    assert 'If-None-Match' not in fake_server.requests[0].headers
+    assert fake_server.requests[1].headers['If-None-Match'] == '"v1"'
+
+
+def test_get_user_events_honors_poll_interval(
+    fake_server: FakeServer,
+    tmp_path: Path,
+) -> None:
+    fake_server.route(
+        'GET',
+        '/users/testuser/events',
+        FakeResponse(body=[{'id': '1'}], headers={'X-Poll-Interval': '60'}),
+    )
+    client = GitHubClient('secret-token', base_url=fake_server.url, cache_dir=tmp_path)
+
+    client.get_user_events('testuser', 1, 100)
+    assert client.get_user_events('testuser', 1, 100) == [{'id': '1'}]
+    assert len(fake_server.requests) == 1
+
+
+def test_get_user_events_cache_is_per_token(
+    fake_server: FakeServer,
+    tmp_path: Path,
+) -> None:
+    fake_server.route(
+        'GET',
+        '/users/testuser/events',
+        FakeResponse(body=[], headers={'X-Poll-Interval': '60'}),
+    )
+    for token in ('token-a', 'token-b'):
+        client = GitHubClient(token, base_url=fake_server.url, cache_dir=tmp_path)
+        client.get_user_events('testuser', 1, 100)
+
+    assert len(fake_server.requests) == 2  # noqa: PLR2004
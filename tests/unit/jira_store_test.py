@@ -0,0 +1,114 @@
+from datetime import UTC, datetime
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+from standupbrain.jira_store import JiraStore, SyncState, get_local_date
+
+
+def make_issue(key: str, comments: list[tuple[str, str]], status: str = 'Done') -> dict:
+    return {
+        'key': key,
+        'fields': {
+            'summary': f'Summary of {key}',
+            'status': {'name': status},
+            'description': {'content': [{'type': 'text', 'text': 'Details'}]},
+            'comment': {
+                'comments': [
+                    {
+                        'id': comment_id,
+                        'created': created,
+                        'body': {'content': [{'type': 'text', 'text': comment_id}]},
+                    }
+                    for comment_id, created in comments
+                ],
+            },
+        },
+        'changelog': {
+            'histories': [
+                {
+                    'id': f'{key}-history',
+                    'created': '2025-11-26T09:00:00.000-0500',
+                    'items': [
+                        {'field': 'status', 'fromString': 'To Do', 'toString': status},
+                    ],
+                },
+            ],
+        },
+    }
+
+
+def test_jira_store_groups_activity_by_day(tmp_path: Path) -> None:
+    store = JiraStore(tmp_path / 'jira.sqlite3')
+    store.put_issues(
+        [
+            make_issue('TEST-1', [('c1', '2025-11-25T10:00:00.000-0500')]),
+            make_issue('TEST-2', [('c2', '2025-11-24T10:00:00.000-0500')]),
+        ],
+        'me@example.com',
+        ZoneInfo('America/New_York'),
+    )
+
+    issues = store.get_issues_active_on('me@example.com', '2025-11-25')
+
+    assert [issue['key'] for issue in issues] == ['TEST-1']
+    assert issues[0]['fields']['description'] == {
+        'content': [{'type': 'text', 'text': 'Details'}],
+    }
+    assert [c['id'] for c in issues[0]['fields']['comment']['comments']] == ['c1']
+    assert issues[0]['changelog']['histories'] == []
+
+    transitioned = store.get_issues_active_on('me@example.com', '2025-11-26')
+    assert [issue['key'] for issue in transitioned] == ['TEST-1', 'TEST-2']
+    assert transitioned[0]['fields']['comment']['comments'] == []
+    assert transitioned[0]['changelog']['histories'][0]['items'] == [
+        {'field': 'status', 'fromString': 'To Do', 'toString': 'Done'},
+    ]
+    assert store.get_issues_active_on('someone@example.com', '2025-11-25') == []
+
+
+def test_jira_store_update_keeps_earlier_comments(tmp_path: Path) -> None:
+    store = JiraStore(tmp_path / 'jira.sqlite3')
+    store.put_issues(
+        [make_issue('TEST-1', [('c1', '2025-11-25T10:00:00.000-0500')])],
+        'me@example.com',
+        None,
+    )
+    store.put_issues(
+        [
+            make_issue(
+                'TEST-1',
+                [('c2', '2025-11-25T11:00:00.000-0500')],
+                status='In Review',
+            ),
+        ],
+        'me@example.com',
+        None,
+    )
+
+    (issue,) = store.get_issues_active_on('me@example.com', '2025-11-25')
+
+    assert issue['fields']['status'] == {'name': 'In Review'}
+    assert [c['id'] for c in issue['fields']['comment']['comments']] == ['c1', 'c2']
+
+
+def test_jira_store_sync_state_round_trip(tmp_path: Path) -> None:
+    store = JiraStore(tmp_path / 'jira.sqlite3')
+    state = SyncState(
+        covered_from='2025-11-20',
+        last_sync=datetime(2025, 11, 27, 15, 30, tzinfo=UTC),
+        timezone='Europe/Berlin',
+    )
+
+    assert store.get_sync_state('me@example.com') is None
+    store.set_sync_state('me@example.com', state)
+
+    assert JiraStore(tmp_path / 'jira.sqlite3').get_sync_state('me@example.com') == (
+        state
+    )
+
+
+def test_get_local_date_converts_to_timezone() -> None:
+    timestamp = '2025-11-25T22:00:00.000-0500'
+
+    assert get_local_date(timestamp, None) == '2025-11-25'
+    assert get_local_date(timestamp, ZoneInfo('Europe/Berlin')) == '2025-11-26'
@@ -1,8 +1,24 @@
-from datetime import datetime
+from collections.abc import Generator
+from datetime import UTC, datetime
+from pathlib import Path
+from zoneinfo import ZoneInfo
 
 import pytest
+import requests
+from conftest import FakeRequest, FakeResponse, FakeServer
 
-from standupbrain.jira import extract_text_from_adf, format_activity_for_llm
+from standupbrain import jira
+from standupbrain.jira import (
+    JiraClient,
+    complete_comment_threads,
+    extract_text_from_adf,
+    format_activity_for_llm,
+    get_issue_comments,
+    iter_jira_issue_pages,
+    make_activity_jql,
+    make_jira_activity_summaries,
+)
+from standupbrain.jira_store import JiraStore, SyncState
 
 
 @pytest.mark.parametrize(
@@ -105,3 +121,382 @@ def test_format_activity_for_llm_filters_by_date() -> None:
     }
     result = format_activity_for_llm(data, datetime(2025, 11, 26))
     assert result == ''
+
+
+def make_issue(key: str, created: str) -> dict:
+    return {
+        'key': key,
+        'fields': {
+            'summary': f'Summary of {key}',
+            'status': {'name': 'In Progress'},
+            'comment': {
+                'comments': [
+                    {
+                        'id': f'{key}-{created}',
+                        'created': f'{created}T10:00:00.000-0500',
+                        'body': {'content': [{'type': 'text', 'text': 'On it'}]},
+                    },
+                ],
+            },
+        },
+    }
+
+
+@pytest.fixture
+def jira_server(
+    fake_server: FakeServer,
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> Generator[FakeServer]:
+    """The fake server standing in for Jira, for a user in New York"""
+    store = JiraStore(tmp_path / 'jira.sqlite3')
+    monkeypatch.setattr(jira, 'get_jira_store', lambda: store)
+    fake_server.route(
+        'GET',
+        '/rest/api/3/myself',
+        FakeResponse(200, {'accountId': 'abc', 'timeZone': 'America/New_York'}),
+    )
+    monkeypatch.setattr(
+        jira,
+        'get_jira_credentials',
+        lambda: (fake_server.url, 'me@example.com', 'token'),
+    )
+    jira.get_jira_client.cache_clear()
+    jira.get_jira_myself.cache_clear()
+    yield fake_server
+    jira.get_jira_client.cache_clear()
+    jira.get_jira_myself.cache_clear()
+
+
+@pytest.fixture
+def jira_pages(jira_server: FakeServer) -> list[dict]:
+    """Three pages of two issues each, chained by nextPageToken"""
+    pages = [
+        {
+            'issues': [
+                make_issue(f'TEST-{idx * 2 + 1}', '2025-11-25'),
+                make_issue(f'TEST-{idx * 2 + 2}', '2025-11-26'),
+            ],
+            'nextPageToken': f'page-{idx + 1}',
+            'isLast': False,
+        }
+        for idx in range(3)
+    ]
+    del pages[-1]['nextPageToken']
+    pages[-1]['isLast'] = True
+
+    def search(request: FakeRequest) -> FakeResponse:
+        token = request.query.get('nextPageToken', ['page-0'])[0]
+        return FakeResponse(200, pages[int(token.removeprefix('page-'))])
+
+    jira_server.route('GET', '/rest/api/3/search/jql', search)
+    return pages
+
+
+def test_iter_jira_issue_pages_follows_next_page_token(
+    fake_server: FakeServer,
+    jira_pages: list[dict],
+) -> None:
+    pages = list(iter_jira_issue_pages('assignee = currentUser()', 100))
+
+    assert pages == [(page['issues'], False) for page in jira_pages]
+    tokens = [request.query.get('nextPageToken') for request in fake_server.requests]
+    assert tokens == [None, ['page-1'], ['page-2']]
+
+
+def test_iter_jira_issue_pages_stops_at_max_issues(
+    fake_server: FakeServer,
+    jira_pages: list[dict],  # noqa: ARG001
+) -> None:
+    pages = list(iter_jira_issue_pages('assignee = currentUser()', 3))
+
+    assert [issue['key'] for page, _ in pages for issue in page] == [
+        'TEST-1',
+        'TEST-2',
+        'TEST-3',
+    ]
+    assert [capped for _, capped in pages] == [False, True]
+    assert len(fake_server.requests) == 2  # noqa: PLR2004
+
+
+def test_make_jira_activity_summaries_formats_every_page(
+    jira_pages: list[dict],  # noqa: ARG001
+) -> None:
+    summaries = make_jira_activity_summaries(
+        datetime(2025, 11, 25),
+        datetime(2025, 11, 26),
+    )
+
+    assert '[TEST-5]' in summaries['2025-11-25']
+    assert '[TEST-2]' not in summaries['2025-11-25']
+    assert summaries['2025-11-26'].count('Summary of') == 3  # noqa: PLR2004
+
+
+def test_make_jira_activity_summaries_first_sync_fetches_since_start(
+    fake_server: FakeServer,
+    jira_pages: list[dict],  # noqa: ARG001
+) -> None:
+    make_jira_activity_summaries(datetime(2025, 11, 25), datetime(2025, 11, 26))
+
+    search = next(
+        request
+        for request in fake_server.requests
+        if request.path == '/rest/api/3/search/jql'
+    )
+    assert search.query['fields'] == ['summary,status,description,comment']
+    assert search.query['expand'] == ['changelog']
+    assert search.query['jql'] == [
+        'assignee = currentUser() AND updated >= "2025-11-25"',
+    ]
+
+
+def test_make_jira_activity_summaries_reads_store_after_recent_sync(
+    fake_server: FakeServer,
+    jira_pages: list[dict],  # noqa: ARG001
+) -> None:
+    first = make_jira_activity_summaries(datetime(2025, 11, 25), datetime(2025, 11, 26))
+    fake_server.requests.clear()
+
+    again = make_jira_activity_summaries(datetime(2025, 11, 26), datetime(2025, 11, 26))
+
+    assert again == {'2025-11-26': first['2025-11-26']}
+    assert fake_server.requests == []
+
+
+def test_make_jira_activity_summaries_syncs_delta_and_backfill(
+    fake_server: FakeServer,
+    jira_pages: list[dict],  # noqa: ARG001
+) -> None:
+    store = jira.get_jira_store()
+    store.set_sync_state(
+        'me@example.com',
+        SyncState(
+            covered_from='2025-11-26',
+            last_sync=datetime(2025, 11, 27, 15, 30, tzinfo=UTC),
+            timezone='America/New_York',
+        ),
+    )
+
+    summaries = make_jira_activity_summaries(
+        datetime(2025, 11, 25),
+        datetime(2025, 11, 26),
+    )
+
+    jqls = [
+        request.query['jql'][0]
+        for request in fake_server.requests
+        if request.path == '/rest/api/3/search/jql'
+        and 'nextPageToken' not in request.query
+    ]
+    assert jqls == [
+        make_activity_jql(datetime(2025, 11, 25), datetime(2025, 11, 25), 'abc'),
+        'assignee = currentUser() AND updated >= "2025-11-27 10:29"',
+    ]
+    assert '[TEST-5]' in summaries['2025-11-25']
+    state = store.get_sync_state('me@example.com')
+    assert state.covered_from == '2025-11-25'
+    assert state.last_sync > datetime(2025, 11, 27, 15, 30, tzinfo=UTC)
+
+
+def test_make_activity_jql_bounds_window() -> None:
+    jql = make_activity_jql(datetime(2025, 11, 25), datetime(2025, 11, 26), 'abc')
+    assert jql == (
+        'assignee = currentUser() AND updated >= "2025-11-25" AND '
+        '(updated < "2025-11-27" OR '
+        'issue in updatedBy("abc", "2025-11-25", "2025-11-27"))'
+    )
+
+
+def test_make_activity_jql_without_account_id() -> None:
+    jql = make_activity_jql(datetime(2025, 11, 25), datetime(2025, 11, 25), None)
+    assert jql.endswith('updated >= "2025-11-25" AND updated < "2025-11-26"')
+
+
+def test_format_activity_for_llm_uses_timezone() -> None:
+    data = {'issues': [make_issue('TEST-1', '2025-11-25')]}
+    # 10:00 -0500 is already the next day in Tokyo
+    tokyo = ZoneInfo('Asia/Tokyo')
+    assert format_activity_for_llm(data, datetime(2025, 11, 25), tokyo) == ''
+    assert '[TEST-1]' in format_activity_for_llm(data, datetime(2025, 11, 26), tokyo)
+
+
+def test_jira_client_retries_after_rate_limit(fake_server: FakeServer) -> None:
+    responses = iter(
+        [
+            FakeResponse(429, {}, headers={'Retry-After': '0'}),
+            FakeResponse(200, {'accountId': 'abc'}),
+        ],
+    )
+    fake_server.route('GET', '/rest/api/3/myself', lambda _request: next(responses))
+    client = JiraClient(fake_server.url, 'me@example.com', 'token')
+
+    assert client.get('/rest/api/3/myself').json() == {'accountId': 'abc'}
+    assert len(fake_server.requests) == 2  # noqa: PLR2004
+    assert client.request_count == 1
+    assert fake_server.requests[0].headers['Authorization'].startswith('Basic ')
+    assert 'gzip' in fake_server.requests[0].headers['Accept-Encoding']
+
+
+def test_jira_client_raises_after_retries(fake_server: FakeServer) -> None:
+    fake_server.route('GET', '/rest/api/3/myself', FakeResponse(503, {}))
+    client = JiraClient(fake_server.url, 'me@example.com', 'token')
+    client.session.get_adapter(fake_server.url).max_retries.backoff_factor = 0
+
+    with pytest.raises(requests.HTTPError):
+        client.get('/rest/api/3/myself')
+    assert len(fake_server.requests) == jira.JIRA_RETRIES + 1
+
+
+def make_comment(created: str, text: str) -> dict:
+    return {
+        'created': f'{created}T10:00:00.000-0500',
+        'body': {'content': [{'type': 'text', 'text': text}]},
+    }
+
+
+def route_comment_pages(server: FakeServer, key: str, comments: list[dict]) -> None:
+    """Serve `comments` (newest first) two per page"""
+
+    def comment_page(request: FakeRequest) -> FakeResponse:
+        assert request.query['orderBy'] == ['-created']
+        start_at = int(request.query['startAt'][0])
+        page = comments[start_at : start_at + 2]
+        return FakeResponse(200, {'comments': page, 'total': len(comments)})
+
+    server.route('GET', f'/rest/api/3/issue/{key}/comment', comment_page)
+
+
+def test_get_issue_comments_stops_before_start(jira_server: FakeServer) -> None:
+    comments = [
+        make_comment('2025-11-27', 'after'),
+        make_comment('2025-11-26', 'second'),
+        make_comment('2025-11-25', 'first'),
+        make_comment('2025-11-24', 'before'),
+        make_comment('2025-11-20', 'long before'),
+        make_comment('2025-11-19', 'never fetched'),
+    ]
+    route_comment_pages(jira_server, 'TEST-1', comments)
+
+    result = get_issue_comments(
+        'TEST-1',
+        datetime(2025, 11, 25),
+        datetime(2025, 11, 26),
+        None,
+    )
+
+    assert result == [comments[2], comments[1]]
+    assert len(jira_server.requests) == 2  # noqa: PLR2004
+
+
+def test_complete_comment_threads_fetches_truncated_threads(
+    jira_server: FakeServer,
+) -> None:
+    truncated = make_issue('TEST-1', '2025-11-01')
+    truncated['fields']['comment'].update(total=3, maxResults=1)
+    complete = make_issue('TEST-2', '2025-11-25')
+    complete['fields']['comment'].update(total=1, maxResults=1)
+    route_comment_pages(
+        jira_server,
+        'TEST-1',
+        [
+            make_comment('2025-11-25', 'Late reply'),
+            make_comment('2025-11-02', 'Old'),
+            make_comment('2025-11-01', 'Older'),
+        ],
+    )
+
+    assert complete_comment_threads(
+        [truncated, complete],
+        datetime(2025, 11, 25),
+        datetime(2025, 11, 25),
+        None,
+    )
+
+    result = format_activity_for_llm(
+        {'issues': [truncated, complete]},
+        datetime(2025, 11, 25),
+    )
+    assert 'Late reply' in result
+    assert '[TEST-2]' in result
+    paths = {request.path for request in jira_server.requests}
+    assert paths == {'/rest/api/3/issue/TEST-1/comment'}
+
+
+def test_complete_comment_threads_keeps_thread_on_error(
+    jira_server: FakeServer,
+) -> None:
+    issue = make_issue('TEST-1', '2025-11-25')
+    issue['fields']['comment'].update(total=5, maxResults=1)
+    jira_server.route('GET', '/rest/api/3/issue/TEST-1/comment', FakeResponse(404, {}))
+
+    complete = complete_comment_threads(
+        [issue],
+        datetime(2025, 11, 25),
+        datetime(2025, 11, 25),
+        None,
+    )
+
+    assert not complete
+    assert len(issue['fields']['comment']['comments']) == 1
+
+
+def test_sync_jira_store_keeps_state_when_capped(
+    jira_pages: list[dict],  # noqa: ARG001
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(jira, 'get_jira_max_issues', lambda: 3)
+    store = jira.get_jira_store()
+
+    summaries = make_jira_activity_summaries(
+        datetime(2025, 11, 25),
+        datetime(2025, 11, 25),
+    )
+
+    assert '[TEST-3]' in summaries['2025-11-25']
+    assert store.get_sync_state('me@example.com') is None
+
+
+def test_sync_jira_store_keeps_state_when_comments_fail(
+    jira_pages: list[dict],
+    jira_server: FakeServer,
+) -> None:
+    jira_pages[0]['issues'][0]['fields']['comment'].update(total=5, maxResults=1)
+    jira_server.route(
+        'GET',
+        '/rest/api/3/issue/TEST-1/comment',
+        FakeResponse(404, {}),
+    )
+    store = jira.get_jira_store()
+    previous = SyncState(
+        covered_from='2025-11-25',
+        last_sync=datetime(2025, 11, 27, 15, 30, tzinfo=UTC),
+        timezone='America/New_York',
+    )
+    store.set_sync_state('me@example.com', previous)
+
+    make_jira_activity_summaries(datetime(2025, 11, 25), datetime(2025, 11, 25))
+
+    assert store.get_sync_state('me@example.com') == previous
+
+
+def test_format_activity_for_llm_includes_status_changes() -> None:
+    issue = make_issue('TEST-1', '2025-11-24')
+    issue['changelog'] = {
+        'histories': [
+            {
+                'id': '1',
+                'created': '2025-11-25T16:00:00.000-0500',
+                'items': [
+                    {'field': 'assignee', 'fromString': None, 'toString': 'Me'},
+                    {'field': 'status', 'fromString': 'To Do', 'toString': 'Done'},
+                ],
+            },
+        ],
+    }
+
+    result = format_activity_for_llm({'issues': [issue]}, datetime(2025, 11, 25))
+
+    assert result == (
+        '[TEST-1] Summary of TEST-1\nStatus: In Progress\n'
+        'Status changes:\n  - To Do -> Done'
+    )
@@ -5,6 +5,7 @@ import pytest
 
 from standupbrain.llm_init import (
     check_ollama_installed,
+    get_installed_model_sizes,
     install_ollama,
     pull_model,
 )
@@ -71,3 +72,18 @@ def test_install_ollama_linux_curl_failure() -> None:
 def test_pull_model(side_effect: Exception | None, expected: bool) -> None:
     with patch('standupbrain.llm_init.subprocess.run', side_effect=side_effect):
         assert pull_model('llama2') is expected
+
+
+def test_get_installed_model_sizes() -> None:
+    stdout = (
+        'NAME              ID              SIZE      MODIFIED\n'
+        'llama3.2:3b       a80c4f17acd5    2.0 GB    3 weeks ago\n'
+        'tinyllama:1.1b    2644915ede35    637 MB    2 days ago\n'
+    )
+    with patch(
+        'subprocess.run',
+        return_value=subprocess.CompletedProcess([], 0, stdout),
+    ):
+        sizes = get_installed_model_sizes()
+
+    assert sizes == {'llama3.2:3b': 2_000_000_000, 'tinyllama:1.1b': 637_000_000}
@@ -0,0 +1,124 @@
+from collections.abc import Generator
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from standupbrain.model_select import (
+    MEMORY_OVERHEAD,
+    choose_model,
+    get_available_memory,
+)
+
+GB = 10**9
+SIZES = {'llama3.1:70b': 40 * GB, 'llama3.2:3b': 2 * GB, 'qwen2.5:7b': 5 * GB}
+LENGTHS = {'llama3.1:70b': 131072, 'llama3.2:3b': 4096, 'qwen2.5:7b': 32768}
+KV_BYTES_PER_TOKEN = 128 * 1024
+
+
+@pytest.fixture
+def installed() -> Generator:
+    with (
+        patch('standupbrain.model_select.get_llm_backend_name', return_value='ollama'),
+        patch(
+            'standupbrain.model_select.get_installed_model_sizes',
+            return_value=SIZES,
+        ),
+        patch(
+            'standupbrain.model_select.get_model_context_length',
+            side_effect=LENGTHS.get,
+        ),
+        patch(
+            'standupbrain.model_select.get_model_kv_cache_bytes_per_token',
+            return_value=KV_BYTES_PER_TOKEN,
+        ),
+        patch('standupbrain.model_select.get_ollama_num_ctx', return_value=None),
+    ):
+        yield
+
+
+@pytest.mark.parametrize(
+    ('needed_tokens', 'available', 'expected'),
+    [
+        (2_000, 64 * GB, ('llama3.2:3b', 4096)),
+        (6_000, 64 * GB, ('qwen2.5:7b', 8192)),
+        (20_000, 64 * GB, ('qwen2.5:7b', 20_000)),
+        (50_000, 64 * GB, ('llama3.1:70b', 50_000)),
+        (200_000, 64 * GB, ('llama3.1:70b', 122070)),
+        (50_000, 50 * GB, ('qwen2.5:7b', 32768)),
+        (50_000, 16 * GB, ('qwen2.5:7b', 32768)),
+        (6_000, 3 * GB, ('llama3.2:3b', 4096)),
+        (6_000, None, ('qwen2.5:7b', 8192)),
+        (2_000, 1 * GB, ('llama3.2:3b', 4096)),
+    ],
+)
+def test_choose_model(
+    installed: None,  # noqa: ARG001
+    needed_tokens: int,
+    available: int | None,
+    expected: tuple[str, int],
+) -> None:
+    with patch(
+        'standupbrain.model_select.get_available_memory',
+        return_value=available,
+    ):
+        assert choose_model(needed_tokens) == expected
+
+
+def test_choose_model_uses_configured_num_ctx(
+    installed: None,  # noqa: ARG001
+) -> None:
+    with (
+        patch('standupbrain.model_select.get_available_memory', return_value=None),
+        patch('standupbrain.model_select.get_ollama_num_ctx', return_value=16384),
+    ):
+        assert choose_model(50_000) == ('llama3.1:70b', 16384)
+
+
+def test_choose_model_caps_context_at_free_memory() -> None:
+    available = 8 * GB
+    per_token = 112 * 1024
+    with (
+        patch('standupbrain.model_select.get_llm_backend_name', return_value='ollama'),
+        patch(
+            'standupbrain.model_select.get_installed_model_sizes',
+            return_value={'llama3.2:3b': 2 * GB},
+        ),
+        patch(
+            'standupbrain.model_select.get_model_context_length',
+            return_value=131072,
+        ),
+        patch(
+            'standupbrain.model_select.get_model_kv_cache_bytes_per_token',
+            return_value=per_token,
+        ),
+        patch('standupbrain.model_select.get_ollama_num_ctx', return_value=None),
+        patch(
+            'standupbrain.model_select.get_available_memory',
+            return_value=available,
+        ),
+    ):
+        model, num_ctx = choose_model(100_000)
+
+    assert model == 'llama3.2:3b'
+    assert num_ctx < 100_000  # noqa: PLR2004
+    assert 2 * GB * MEMORY_OVERHEAD + num_ctx * per_token <= available
+
+
+def test_choose_model_requires_ollama() -> None:
+    with (
+        patch('standupbrain.model_select.get_llm_backend_name', return_value='openai'),
+        pytest.raises(ValueError, match='ollama backend'),
+    ):
+        choose_model(1_000)
+
+
+def test_get_available_memory(tmp_path: Path) -> None:
+    meminfo = tmp_path / 'meminfo'
+    meminfo.write_text(
+        'MemTotal:       16303472 kB\nMemFree:         1024000 kB\n'
+        'MemAvailable:    8000000 kB\n',
+    )
+
+    assert get_available_memory(meminfo) == 8_000_000 * 1024
+    assert get_available_memory(tmp_path / 'missing') is None
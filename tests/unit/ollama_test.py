@@ -0,0 +1,185 @@
+import json
+
+import pytest
+import requests
+from conftest import FakeResponse, FakeServer
+
+from standupbrain.ollama import (
+    OllamaClient,
+    OllamaError,
+    get_context_length,
+    get_kv_cache_bytes_per_token,
+    get_ollama_url,
+)
+
+
+def ndjson(*chunks: dict) -> list[bytes]:
+    return [json.dumps(chunk).encode() + b'\n' for chunk in chunks]
+
+
+def test_generate_streams_tokens(fake_server: FakeServer) -> None:
+    fake_server.route(
+        'POST',
+        '/api/generate',
+        FakeResponse(
+            chunks=ndjson(
+                {'response': 'Fixed ', 'done': False},
+                {'response': 'the bug', 'done': False},
+                {
+                    'response': '',
+                    'done': True,
+                    'load_duration': 2_000_000_000,
+                    'eval_count': 20,
+                    'eval_duration': 500_000_000,
+                },
+            ),
+        ),
+    )
+    client = OllamaClient(base_url=fake_server.url, keep_alive='30m')
+    tokens = []
+
+    text, stats = client.generate('llama3.2:3b', 'prompt', on_token=tokens.append)
+
+    assert text == 'Fixed the bug'
+    assert tokens == ['Fixed ', 'the bug']
+    assert stats.time_to_first_token is not None
+    assert stats.load_seconds == 2  # noqa: PLR2004
+    assert stats.tokens_per_second == 40  # noqa: PLR2004
+    request = fake_server.requests[0].json()
+    assert request == {
+        'model': 'llama3.2:3b',
+        'prompt': 'prompt',
+        'stream': True,
+        'keep_alive': '30m',
+    }
+
+
+def test_generate_raises_on_stream_error(fake_server: FakeServer) -> None:
+    fake_server.route(
+        'POST',
+        '/api/generate',
+        FakeResponse(chunks=ndjson({'error': 'model not found'})),
+    )
+    client = OllamaClient(base_url=fake_server.url)
+
+    with pytest.raises(OllamaError, match='model not found'):
+        client.generate('missing', 'prompt')
+
+
+@pytest.mark.parametrize(
+    ('host', 'expected'),
+    [
+        (None, 'http://127.0.0.1:11434'),
+        ('0.0.0.0:11434', 'http://0.0.0.0:11434'),
+        ('https://ollama.internal', 'https://ollama.internal'),
+    ],
+)
+def test_get_ollama_url(
+    monkeypatch: pytest.MonkeyPatch,
+    host: str | None,
+    expected: str,
+) -> None:
+    monkeypatch.delenv('OLLAMA_HOST', raising=False)
+    if host:
+        monkeypatch.setenv('OLLAMA_HOST', host)
+    assert get_ollama_url() == expected
+
+
+def test_generate_streams_chunked_prompt_body(fake_server: FakeServer) -> None:
+    fake_server.route(
+        'POST',
+        '/api/generate',
+        FakeResponse(chunks=ndjson({'response': 'ok', 'done': True})),
+    )
+    client = OllamaClient(base_url=fake_server.url)
+    chunks = ['Repo: "app"\n', 'diff with \\ and ünïcode\t', '', 'x' * 200_000]
+
+    _, stats = client.generate('llama3.2:3b', iter(chunks))
+
+    request = fake_server.requests[0]
+    assert request.headers['Transfer-Encoding'] == 'chunked'
+    assert request.json()['prompt'] == ''.join(chunks)
+    assert stats.prompt_chars == len(''.join(chunks))
+
+
+def test_generate_sends_options(fake_server: FakeServer) -> None:
+    fake_server.route(
+        'POST',
+        '/api/generate',
+        FakeResponse(chunks=ndjson({'response': 'ok', 'done': True})),
+    )
+    client = OllamaClient(base_url=fake_server.url)
+
+    client.generate('llama3.2:3b', 'prompt', options={'num_ctx': 8192})
+
+    assert fake_server.requests[0].json()['options'] == {'num_ctx': 8192}
+
+
+def test_show_context_length(fake_server: FakeServer) -> None:
+    fake_server.route(
+        'POST',
+        '/api/show',
+        FakeResponse(
+            body={
+                'model_info': {
+                    'general.architecture': 'llama',
+                    'llama.context_length': 131072,
+                },
+            },
+        ),
+    )
+    client = OllamaClient(base_url=fake_server.url)
+
+    details = client.show('llama3.2:3b')
+
+    assert get_context_length(details) == 131072  # noqa: PLR2004
+    assert fake_server.requests[0].json() == {'model': 'llama3.2:3b'}
+    assert get_context_length({}) is None
+
+
+def test_generate_raises_ollama_error_message(fake_server: FakeServer) -> None:
+    fake_server.route(
+        'POST',
+        '/api/generate',
+        FakeResponse(status=404, body={'error': 'model "missing" not found'}),
+    )
+    client = OllamaClient(base_url=fake_server.url)
+
+    with pytest.raises(OllamaError, match='model "missing" not found'):
+        client.generate('missing', 'prompt')
+
+
+def test_show_raises_http_error_without_message(fake_server: FakeServer) -> None:
+    fake_server.route('POST', '/api/show', FakeResponse(status=500))
+    client = OllamaClient(base_url=fake_server.url)
+
+    with pytest.raises(requests.HTTPError):
+        client.show('llama3.2:3b')
+
+
+def test_get_kv_cache_bytes_per_token() -> None:
+    details = {
+        'model_info': {
+            'general.architecture': 'llama',
+            'llama.block_count': 28,
+            'llama.attention.head_count': 24,
+            'llama.attention.head_count_kv': 8,
+            'llama.embedding_length': 3072,
+        },
+    }
+
+    assert get_kv_cache_bytes_per_token(details) == 28 * 8 * 128 * 2 * 2
+    assert get_kv_cache_bytes_per_token({}) is None
+
+
+def test_preload_loads_model_without_prompt(fake_server: FakeServer) -> None:
+    fake_server.route('POST', '/api/generate', FakeResponse(body={'done': True}))
+    client = OllamaClient(base_url=fake_server.url, keep_alive='30m')
+
+    client.preload('llama3.2:3b', options={'num_ctx': 8192})
+
+    assert fake_server.requests[0].json() == {
+        'model': 'llama3.2:3b',
+        'keep_alive': '30m',
+        'options': {'num_ctx': 8192},
+    }
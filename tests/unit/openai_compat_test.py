@@ -0,0 +1,112 @@
+import json
+
+import pytest
+from conftest import FakeRequest, FakeResponse, FakeServer
+
+from standupbrain.backends import LLMError
+from standupbrain.openai_compat import LlamaCppClient, OpenAICompatibleClient
+from standupbrain.shared import make_session
+
+
+def sse(*chunks: dict) -> list[bytes]:
+    return [f'data: {json.dumps(chunk)}\n\n'.encode() for chunk in chunks] + [
+        b'data: [DONE]\n\n',
+    ]
+
+
+def delta(content: str) -> dict:
+    return {'choices': [{'index': 0, 'delta': {'content': content}}]}
+
+
+def test_generate_streams_chat_completion(fake_server: FakeServer) -> None:
+    fake_server.route(
+        'POST',
+        '/v1/chat/completions',
+        FakeResponse(
+            chunks=sse(
+                delta('Fixed '),
+                delta('the bug'),
+                {'choices': [], 'usage': {'completion_tokens': 2}},
+            ),
+        ),
+    )
+    client = OpenAICompatibleClient(base_url=f'{fake_server.url}/v1', api_key='key')
+    tokens = []
+
+    text, stats = client.generate(
+        'qwen2.5:7b',
+        iter(['Summarize ', '"this"']),
+        on_token=tokens.append,
+        options={'num_ctx': 8192},
+    )
+
+    assert text == 'Fixed the bug'
+    assert tokens == ['Fixed ', 'the bug']
+    assert stats.eval_count == 2  # noqa: PLR2004
+    assert stats.prompt_chars == len('Summarize "this"')
+    request = fake_server.requests[0]
+    assert request.headers['Authorization'] == 'Bearer key'
+    assert request.json() == {
+        'model': 'qwen2.5:7b',
+        'stream': True,
+        'stream_options': {'include_usage': True},
+        'messages': [{'role': 'user', 'content': 'Summarize "this"'}],
+    }
+
+
+def test_generate_raises_on_stream_error(fake_server: FakeServer) -> None:
+    fake_server.route(
+        'POST',
+        '/v1/chat/completions',
+        FakeResponse(chunks=sse({'error': {'message': 'context length exceeded'}})),
+    )
+    client = OpenAICompatibleClient(base_url=fake_server.url)
+
+    with pytest.raises(LLMError, match='context length exceeded'):
+        client.generate('model', 'prompt')
+
+
+def test_context_length_from_vllm_models(fake_server: FakeServer) -> None:
+    models = [
+        {'id': 'other', 'max_model_len': 4096},
+        {'id': 'qwen', 'max_model_len': 32768},
+    ]
+    fake_server.route('GET', '/v1/models', FakeResponse(body={'data': models}))
+    client = OpenAICompatibleClient(base_url=fake_server.url)
+
+    assert client.get_context_length('qwen') == 32768  # noqa: PLR2004
+    assert client.get_context_length('missing') is None
+
+
+def test_llama_cpp_context_length_and_timings(fake_server: FakeServer) -> None:
+    fake_server.route(
+        'GET',
+        '/props',
+        FakeResponse(body={'default_generation_settings': {'n_ctx': 16384}}),
+    )
+    timings = {'choices': [], 'timings': {'predicted_per_second': 42.5}}
+    fake_server.route(
+        'POST',
+        '/v1/chat/completions',
+        FakeResponse(chunks=sse(delta('ok'), timings)),
+    )
+    client = LlamaCppClient(base_url=fake_server.url)
+
+    _, stats = client.generate('any', 'prompt')
+
+    assert client.get_context_length('any') == 16384  # noqa: PLR2004
+    assert stats.tokens_per_second == 42.5  # noqa: PLR2004
+
+
+def test_session_retries_unavailable_server(fake_server: FakeServer) -> None:
+    responses = iter([FakeResponse(status=503), FakeResponse(body={'ok': True})])
+
+    def flaky(_request: FakeRequest) -> FakeResponse:
+        return next(responses)
+
+    fake_server.route('GET', '/props', flaky)
+
+    response = make_session(3).get(f'{fake_server.url}/props')
+
+    assert response.json() == {'ok': True}
+    assert len(fake_server.requests) == 2  # noqa: PLR2004
@@ -0,0 +1,76 @@
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from conftest import make_repo
+
+from standupbrain.repo_index import (
+    build_repo_index,
+    get_repo_index,
+    parse_remote_full_name,
+)
+
+
+@pytest.mark.parametrize(
+    ('remote_url', 'expected'),
+    [
+        ('git@github.com:Org/Repo.git', 'org/repo'),
+        ('https://github.com/org/repo', 'org/repo'),
+        ('https://github.com/org/repo.git/', 'org/repo'),
+        ('ssh://git@github.com/org/repo.git', 'org/repo'),
+        ('not-a-remote', None),
+    ],
+)
+def test_parse_remote_full_name(remote_url: str, expected: str | None) -> None:
+    assert parse_remote_full_name(remote_url) == expected
+
+
+def test_build_repo_index(tmp_path: Path) -> None:
+    first_root, second_root = tmp_path / 'projects', tmp_path / 'work'
+    make_repo(first_root / 'app', 'git@github.com:me/app.git')
+    make_repo(second_root / 'team' / 'app', 'git@github.com:team/app.git')
+    make_repo(second_root / 'team' / 'app' / 'lib', 'git@github.com:x/lib')
+    (second_root / 'team' / 'app' / '.gitmodules').write_text(
+        '[submodule "lib"]\n\tpath = lib\n\turl = git@github.com:x/lib\n',
+    )
+    make_repo(first_root / 'app' / 'vendor' / 'clone', 'git@github.com:x/clone')
+    make_repo(first_root / 'scratch')
+    make_repo(first_root / 'a' / 'b' / 'c' / 'too-deep', 'git@github.com:me/deep')
+
+    index = build_repo_index([first_root, second_root], depth=3)
+
+    assert index.lookup('me/app') == [first_root / 'app']
+    assert index.lookup('Team/App') == [second_root / 'team' / 'app']
+    assert index.lookup('x/lib') == [second_root / 'team' / 'app' / 'lib']
+    assert index.lookup('anyone/scratch') == [first_root / 'scratch']
+    assert index.lookup('me/deep') == []
+    assert index.lookup('x/clone') == []
+
+
+def test_get_repo_index_invalidates_on_mtime(tmp_path: Path) -> None:
+    root = tmp_path / 'projects'
+    make_repo(root / 'app', 'git@github.com:me/app.git')
+
+    with (
+        patch('standupbrain.repo_index.get_repo_roots', return_value=[root]),
+        patch('standupbrain.repo_index.get_repo_scan_depth', return_value=2),
+        patch('standupbrain.repo_index.get_cache_dir', return_value=tmp_path),
+        patch(
+            'standupbrain.repo_index.build_repo_index',
+            wraps=build_repo_index,
+        ) as mock_build,
+    ):
+        assert get_repo_index().lookup('me/app') == [root / 'app']
+        assert get_repo_index().lookup('me/app') == [root / 'app']
+        assert mock_build.call_count == 1
+
+        (root / 'app' / 'src').mkdir()
+        (root / 'app' / 'src' / 'module.py').write_text('')
+        assert get_repo_index().lookup('me/app') == [root / 'app']
+        assert mock_build.call_count == 1
+
+        make_repo(root / 'new', 'git@github.com:me/new.git')
+        os.utime(root, (0, 0))
+        assert get_repo_index().lookup('me/new') == [root / 'new']
+        assert mock_build.call_count == 2  # noqa: PLR2004
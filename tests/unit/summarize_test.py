@@ -0,0 +1,139 @@
+from collections.abc import Generator
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from standupbrain.commits import Commit, RepoCommits
+from standupbrain.llm import MERGE_PROMPT, PARTIAL_PROMPT, PROMPT
+from standupbrain.summarize import (
+    estimate_tokens,
+    get_chunk_budget,
+    pack_chunks,
+    summarize_activity,
+)
+from standupbrain.summary_cache import SummaryCache
+
+
+@pytest.fixture
+def mock_llm(tmp_path: Path) -> Generator:
+    summary_cache = SummaryCache(tmp_path, max_bytes=10_000)
+    with (
+        patch('standupbrain.summarize.get_summary_cache', return_value=summary_cache),
+        patch('standupbrain.summarize.get_llm_model', return_value='small'),
+        patch('standupbrain.summarize.prompt_local_llm') as mock_llm,
+    ):
+        mock_llm.side_effect = lambda prompt, **_: (
+            'merged'
+            if isinstance(prompt, str) and MERGE_PROMPT in prompt
+            else 'partial-note'
+        )
+        yield mock_llm
+
+
+def make_commits(count: int, size: int) -> list[RepoCommits]:
+    return [
+        RepoCommits(
+            'org/repo',
+            [
+                Commit(f'hash{idx}', f'change {idx}', body='x' * size)
+                for idx in range(count)
+            ],
+        ),
+    ]
+
+
+def test_summarize_activity_single_prompt_when_it_fits(mock_llm: object) -> None:
+    tokens = []
+    with patch('standupbrain.summarize.get_context_window', return_value=8192):
+        summarize_activity('[PROJ-1] jira', make_commits(2, 10), on_token=tokens.append)
+
+    mock_llm.assert_called_once()
+    prompt = ''.join(mock_llm.call_args[0][0])
+    assert prompt.startswith(PROMPT)
+    assert 'change 1' in prompt
+    assert mock_llm.call_args[1]['on_token'] == tokens.append
+
+
+def test_summarize_activity_map_reduces_oversized_days(mock_llm: object) -> None:
+    with patch('standupbrain.summarize.get_context_window', return_value=2048):
+        budget = get_chunk_budget(2048)
+        tokens = []
+        result = summarize_activity(
+            '',
+            make_commits(10, budget * 2),
+            on_token=tokens.append,
+        )
+
+    prompts = [call[0][0] for call in mock_llm.call_args_list]
+    partials, merge = prompts[:-1], prompts[-1]
+    assert result == 'merged'
+    assert len(partials) > 1
+    assert all(prompt.startswith(PARTIAL_PROMPT) for prompt in partials)
+    assert all(estimate_tokens(prompt) < 2048 for prompt in prompts)  # noqa: PLR2004
+    assert merge.count('partial-note') == len(partials)
+    assert mock_llm.call_args[1]['on_token'] == tokens.append
+
+
+def test_pack_chunks_respects_budget_and_order() -> None:
+    units = ['a' * 40, 'b' * 40, 'c' * 400]
+
+    chunks = pack_chunks(units, budget=25)
+
+    assert chunks[0] == 'a' * 40 + '\n\n' + 'b' * 40
+    assert ''.join(chunks[1:]) == 'c' * 400
+    assert all(estimate_tokens(chunk) <= 25 for chunk in chunks[1:])  # noqa: PLR2004
+
+
+@pytest.mark.parametrize('use_cache', [True, False])
+def test_summarize_activity_reuses_cached_summary(
+    mock_llm: object,
+    use_cache: bool,
+) -> None:
+    tokens = []
+    with patch('standupbrain.summarize.get_context_window', return_value=8192):
+        first = summarize_activity('jira', make_commits(1, 10), use_cache=use_cache)
+        second = summarize_activity(
+            'jira',
+            make_commits(1, 10),
+            on_token=tokens.append,
+            use_cache=use_cache,
+        )
+
+    assert first == second
+    assert mock_llm.call_count == (1 if use_cache else 2)
+    if use_cache:
+        assert tokens == [first]
+
+
+def test_summarize_activity_auto_chooses_model_per_prompt(mock_llm: object) -> None:
+    with (
+        patch('standupbrain.summarize.get_llm_model', return_value='auto'),
+        patch(
+            'standupbrain.summarize.choose_model',
+            return_value=('qwen2.5:7b', 32768),
+        ) as choose,
+    ):
+        summarize_activity('jira', make_commits(1, 4000), use_cache=False)
+
+    needed_tokens = choose.call_args[0][0]
+    assert 1000 < needed_tokens < 8192  # noqa: PLR2004
+    assert mock_llm.call_args[1]['model'] == 'qwen2.5:7b'
+    assert mock_llm.call_args[1]['num_ctx'] == 32768  # noqa: PLR2004
+
+
+def test_summarize_activity_caches_by_chosen_model(mock_llm: object) -> None:
+    with (
+        patch('standupbrain.summarize.get_llm_model', return_value='auto'),
+        patch(
+            'standupbrain.summarize.choose_model',
+            side_effect=[('small', 8192), ('large', 8192), ('small', 8192)],
+        ),
+    ):
+        for _ in range(3):
+            summarize_activity('jira', make_commits(1, 10))
+
+    assert [call[1]['model'] for call in mock_llm.call_args_list] == [
+        'small',
+        'large',
+    ]
@@ -0,0 +1,46 @@
+import os
+from pathlib import Path
+
+from standupbrain.summary_cache import SummaryCache, make_summary_key
+
+
+def test_summary_cache_round_trip(tmp_path: Path) -> None:
+    summary_cache = SummaryCache(tmp_path / 'summaries', max_bytes=1_000)
+
+    summary_cache.put('abc', '- Fixed the bug')
+
+    assert summary_cache.get('abc') == '- Fixed the bug'
+    assert summary_cache.get('missing') is None
+
+
+def test_summary_cache_evicts_least_recently_used(tmp_path: Path) -> None:
+    summary_cache = SummaryCache(tmp_path, max_bytes=30)
+    for age, key in enumerate(('old', 'used', 'new')):
+        summary_cache.put(key, 'x' * 10)
+        os.utime(summary_cache.get_path(key), (age, age))
+
+    summary_cache.get('old')
+    summary_cache.max_bytes = 25
+    summary_cache.put('newest', 'x' * 10)
+
+    assert summary_cache.get('used') is None
+    assert summary_cache.get('new') is None
+    assert summary_cache.get('old') == 'x' * 10
+    assert summary_cache.get('newest') == 'x' * 10
+
+
+def test_make_summary_key() -> None:
+    def key(
+        content: list[str],
+        model: str = 'llama3.2:3b',
+        num_ctx: int = 8192,
+        templates: tuple[str, ...] = ('prompt', 'partial', 'merge'),
+    ) -> str:
+        return make_summary_key(model, num_ctx, templates, content)
+
+    base = key(['fixed  the\nbug ', 'today'])
+
+    assert base == key(['fixed the bug today'])
+    assert base != key(['fixed the bug today'], model='mistral:7b')
+    assert base != key(['fixed the bug today'], num_ctx=4096)
+    assert base != key(['fixed the bug today'], templates=('prompt', 'other', 'merge'))